@@ -1,16 +1,59 @@
 import os
+import re
+import json
+import hashlib
+import time
+import queue
+import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import zipfile
 from urllib.parse import urljoin, urlparse
+from email.utils import formatdate
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import datetime
+import imgw_magazyn
 
 # --- Konfiguracja ---
 BASE_SAVE_DIR = "pobrane_dane_imgw"
+# Adres serwera IMGW; zmienna środowiskowa pozwala podstawić lokalny serwer testowy
+IMGW_BASE_URL = os.environ.get("IMGW_BASE_URL", "https://danepubliczne.imgw.pl/data").rstrip("/")
 START_YEAR = 2018
 CURRENT_YEAR = datetime.datetime.now().year
 END_YEAR = 2025 # Możesz ustawić sztywno lub użyć CURRENT_YEAR
 
+# Pobieranie równoległe (False = dawny tryb: plik po pliku)
+TRYB_ROWNOLEGLY = True
+MAX_WATKOW = 8 # Liczba wątków pobierających pliki
+MAX_POLACZEN_NA_HOST = 4 # Maksymalna liczba jednoczesnych połączeń do jednego serwera
+LICZBA_PROB = 4 # Ile razy próbować pobrać plik, zanim się poddamy
+OPOZNIENIE_PONOWIENIA_S = 2.0 # Opóźnienie przed 1. ponowieniem, potem podwajane
+
+# Synchronizacja przyrostowa: pobieraj tylko nowe lub zmienione pliki ZIP
+TRYB_SYNCHRONIZACJI = True
+MANIFEST_PATH = os.path.join(BASE_SAVE_DIR, "manifest_pobierania.json")
+# Lata starsze niż bieżący się nie zmieniają - jeśli plik jest w manifeście, nie pytamy serwera
+POMIJAJ_ZAMKNIETE_LATA = True
+
+# Pobieranie z wznawianiem: dane trafiają do pliku .part, a po przerwaniu są dociągane nagłówkiem Range
+ROZMIAR_PAKIETU_B = 256 * 1024 # Rozmiar kawałka czytanego z sieci i zapisywanego na dysk
+
+# Potok pobieranie -> rozpakowywanie (tryb równoległy): pobrane pliki trafiają do ograniczonej
+# kolejki, z której osobne wątki rozpakowują je równolegle z dalszym pobieraniem
+LICZBA_WATKOW_ROZPAKOWUJACYCH = 4
+ROZMIAR_KOLEJKI_ROZPAKOWYWANIA = 32 # Maksymalna liczba paczek czekających na rozpakowanie
+# False - tylko pobieraj archiwa; skrypty 04-10 czytają dane prosto z ZIP-ów (imgw_archiwa.py)
+ROZPAKOWYWANIE_NA_DYSK = True
+
+# Magazyn treści (imgw_magazyn.py): każda unikalna treść zapisana raz w pobrane_dane_imgw/cas/,
+# a extracted_files/ zawiera do niej twarde dowiązania. False = zwykłe extractall
+MAGAZYN_TRESCI = True
+
+# Pamięć podręczna listingów katalogów (URL -> linki do ZIP-ów)
+LISTING_CACHE_PATH = os.path.join(BASE_SAVE_DIR, "cache_listingow.json")
+TTL_LISTINGU_S = 6 * 3600 # Po tym czasie listing bieżącego roku jest sprawdzany warunkowym GET
+TTL_LISTINGU_ZAMKNIETY_ROK_S = 30 * 24 * 3600 # Listingi zamkniętych lat praktycznie się nie zmieniają
+
 # Upewnij się, że END_YEAR nie jest większy niż faktycznie dostępny
 if END_YEAR > CURRENT_YEAR + 1: # Dajemy margines na przyszły rok, jeśli dane są już publikowane
     ACTUAL_END_YEAR = CURRENT_YEAR + 1
@@ -27,50 +70,370 @@ print(f"Pobieranie danych od {START_YEAR} do {ACTUAL_END_YEAR}")
 # Klucz to nazwa folderu, wartość to base_url i typ (dla struktury folderów)
 SOURCES = {
     "ostrzezenia_hydrologiczne": {
-        "url_template": "https://danepubliczne.imgw.pl/data/arch/ost_hydro/{year}/",
+        "url_template": IMGW_BASE_URL + "/arch/ost_hydro/{year}/",
         "type": "ost_hydro" # Tutaj będą tylko pliki .TXT z ostrzeżeniami
     },
     "hydro_dobowe_pomiarowe": { # NOWE ŹRÓDŁO
-        "url_template": "https://danepubliczne.imgw.pl/data/dane_pomiarowo_obserwacyjne/dane_hydrologiczne/dobowe/{year}/",
+        "url_template": IMGW_BASE_URL + "/dane_pomiarowo_obserwacyjne/dane_hydrologiczne/dobowe/{year}/",
         "type": "hydro/dobowe_pomiarowe" # Tutaj będą pliki .zip z danymi codz_...csv
     },
     "meteo_dobowe_opad": {
-        "url_template": "https://danepubliczne.imgw.pl/data/dane_pomiarowo_obserwacyjne/dane_meteorologiczne/dobowe/opad/{year}/",
+        "url_template": IMGW_BASE_URL + "/dane_pomiarowo_obserwacyjne/dane_meteorologiczne/dobowe/opad/{year}/",
         "type": "meteo/dobowe/opad"
     },
     "meteo_dobowe_klimat": {
-        "url_template": "https://danepubliczne.imgw.pl/data/dane_pomiarowo_obserwacyjne/dane_meteorologiczne/dobowe/klimat/{year}/",
+        "url_template": IMGW_BASE_URL + "/dane_pomiarowo_obserwacyjne/dane_meteorologiczne/dobowe/klimat/{year}/",
         "type": "meteo/dobowe/klimat"
     },
     "meteo_dobowe_synop": {
-         "url_template": "https://danepubliczne.imgw.pl/data/dane_pomiarowo_obserwacyjne/dane_meteorologiczne/dobowe/synop/{year}/",
+         "url_template": IMGW_BASE_URL + "/dane_pomiarowo_obserwacyjne/dane_meteorologiczne/dobowe/synop/{year}/",
          "type": "meteo/dobowe/synop"
      }
 }
 
 # ... (reszta skryptu pobierającego: funkcje get_zip_links_from_url, download_and_extract_zip, główna pętla) ...
 
-def get_zip_links_from_url(directory_url):
-    """Pobiera listę linków do plików ZIP z podanego URL katalogu."""
+_http_session = None
+_http_session_lock = threading.Lock()
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+def get_http_session():
+    """Zwraca współdzieloną sesję HTTP z pulą połączeń (jedna na cały skrypt)."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(SOURCES), pool_maxsize=max(MAX_WATKOW, MAX_POLACZEN_NA_HOST))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+    return _http_session
+
+def host_semaphore(url):
+    """Zwraca semafor ograniczający liczbę jednoczesnych połączeń do hosta z URL."""
+    host = urlparse(url).netloc
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(MAX_POLACZEN_NA_HOST)
+        return _host_semaphores[host]
+
+def is_retryable_error(error):
+    """Czy błąd sieci jest przejściowy (warto ponowić)? Błędy 4xx poza 429 nie są."""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, requests.exceptions.RequestException)
+
+class IncompleteDownloadError(requests.exceptions.RequestException):
+    """Pobrany plik jest niepełny lub uszkodzony - warto ponowić (z wznowieniem)."""
+
+def call_with_retries(action, url):
+    """Wywołuje action() w limicie połączeń hosta, ponawiając z wykładniczym opóźnieniem."""
+    for attempt in range(1, LICZBA_PROB + 1):
+        try:
+            with host_semaphore(url):
+                return action()
+        except requests.exceptions.RequestException as e:
+            if attempt == LICZBA_PROB or not is_retryable_error(e):
+                raise
+            delay = OPOZNIENIE_PONOWIENIA_S * (2 ** (attempt - 1))
+            print(f"    Próba {attempt}/{LICZBA_PROB} dla {url} nieudana ({e}), ponowienie za {delay:.0f} s...")
+            time.sleep(delay)
+
+_manifest = {}
+_manifest_lock = threading.Lock()
+
+def load_manifest():
+    """Wczytuje manifest pobranych plików ZIP (URL -> rozmiar, ETag, Last-Modified, SHA-256)."""
+    global _manifest
+    if os.path.exists(MANIFEST_PATH):
+        try:
+            with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+                _manifest = json.load(f)
+            print(f"Wczytano manifest: {len(_manifest)} plików ({MANIFEST_PATH})")
+        except (OSError, ValueError) as e:
+            print(f"Nie udało się wczytać manifestu {MANIFEST_PATH} ({e}) - zaczynamy od pustego.")
+            _manifest = {}
+    return _manifest
+
+def save_manifest():
+    """Zapisuje manifest atomowo (plik tymczasowy + os.replace)."""
+    with _manifest_lock:
+        snapshot = dict(_manifest)
+    os.makedirs(os.path.dirname(MANIFEST_PATH) or ".", exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+def file_sha256(file_path):
+    """Liczy skrót SHA-256 pliku."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def record_manifest_entry(zip_url, local_zip_path, size, sha256, headers):
+    """Zapamiętuje w manifeście stan pobranego pliku ZIP."""
+    with _manifest_lock:
+        _manifest[zip_url] = {
+            "local_path": local_zip_path,
+            "size": size,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "sha256": sha256,
+            "checked_at": datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+
+def conditional_headers(zip_url, local_zip_path):
+    """Nagłówki warunkowego GET na podstawie manifestu lub daty modyfikacji lokalnego pliku.
+
+    Tylko gdy lokalna kopia istnieje (i ma rozmiar z manifestu) - inaczej odpowiedź 304
+    zostawiłaby nas bez pliku.
+    """
+    headers = {}
+    if not os.path.exists(local_zip_path):
+        return headers
+    entry = _manifest.get(zip_url)
+    if entry is None:
+        # Plik pobrany przed wprowadzeniem manifestu - porównujemy z datą modyfikacji
+        headers["If-Modified-Since"] = formatdate(os.path.getmtime(local_zip_path), usegmt=True)
+        return headers
+    if os.path.getsize(local_zip_path) != entry.get("size"):
+        return headers # Lokalna kopia nie odpowiada manifestowi - pełne pobranie
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+def is_unchanged_locally(zip_url, local_zip_path, year):
+    """Czy plik z manifestu leży na dysku i (dla zamkniętych lat) nie wymaga pytania serwera?"""
+    entry = _manifest.get(zip_url)
+    if not entry or not os.path.exists(local_zip_path):
+        return False
+    if os.path.getsize(local_zip_path) != entry.get("size"):
+        return False
+    return POMIJAJ_ZAMKNIETE_LATA and int(year) < CURRENT_YEAR
+
+def needs_extraction(local_zip_path, extract_dir):
+    """Czy archiwum trzeba (jeszcze) rozpakować - np. poprzednie rozpakowanie się nie powiodło?"""
+    return ROZPAKOWYWANIE_NA_DYSK and not members_already_extracted(local_zip_path, extract_dir)
+
+def members_already_extracted(local_zip_path, extract_dir):
+    """Czy wszystkie pliki z archiwum leżą już w extract_dir z poprawnym rozmiarem?"""
+    with zipfile.ZipFile(local_zip_path, 'r') as zip_ref:
+        for info in zip_ref.infolist():
+            target = os.path.join(extract_dir, info.filename)
+            if not info.is_dir() and (not os.path.exists(target) or os.path.getsize(target) != info.file_size):
+                return False
+    return True
+
+def read_part_validator(part_path):
+    """Zwraca ETag/Last-Modified zapisane dla częściowo pobranego pliku (do nagłówka If-Range)."""
+    try:
+        with open(part_path + ".meta", 'r', encoding='utf-8') as f:
+            return json.load(f).get("validator")
+    except (OSError, ValueError):
+        return None
+
+def write_part_validator(part_path, headers):
+    """Zapamiętuje walidator odpowiedzi, aby wznowienie dotyczyło tej samej wersji pliku."""
+    validator = headers.get("ETag") or headers.get("Last-Modified")
+    with open(part_path + ".meta", 'w', encoding='utf-8') as f:
+        json.dump({"validator": validator}, f)
+
+def remove_part_files(part_path):
+    """Usuwa plik częściowy i jego metadane."""
+    for path in (part_path, part_path + ".meta"):
+        if os.path.exists(path):
+            os.remove(path)
+
+def expected_total_size(response):
+    """Całkowity rozmiar pliku z Content-Range (206) lub Content-Length (200), albo None."""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    if response.status_code == 200 and response.headers.get("Content-Length"):
+        return int(response.headers["Content-Length"])
+    return None
+
+def fetch_zip_resumable(session, zip_url, local_zip_path, request_headers):
+    """Pobiera ZIP do pliku .part (wznawiając przez Range), weryfikuje go i podmienia plik docelowy.
+
+    Zwraca (nagłówki, rozmiar, sha256) albo (nagłówki, None, None) dla 304 Not Modified.
+    """
+    part_path = local_zip_path + ".part"
+    headers = dict(request_headers)
+    resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if resume_from > 0:
+        # Dociągamy brakującą część; warunki synchronizacji nie mają tu sensu
+        headers = {"Range": f"bytes={resume_from}-"}
+        validator = read_part_validator(part_path)
+        if validator:
+            headers["If-Range"] = validator
+
+    with session.get(zip_url, stream=True, timeout=60, headers=headers) as zip_response:
+        if zip_response.status_code == 304:
+            return zip_response.headers, None, None
+        if zip_response.status_code == 416:
+            remove_part_files(part_path)
+            raise IncompleteDownloadError(f"Serwer odrzucił zakres dla {zip_url} - pobieranie od nowa")
+        zip_response.raise_for_status()
+
+        if zip_response.status_code == 206:
+            mode = 'ab'
+            print(f"    Wznawianie od {resume_from} B: {os.path.basename(local_zip_path)}")
+        else:
+            # 200 - serwer wysyła cały plik (brak obsługi Range lub plik się zmienił)
+            mode = 'wb'
+            write_part_validator(part_path, zip_response.headers)
+        total_size = expected_total_size(zip_response)
+
+        with open(part_path, mode) as f:
+            for chunk in zip_response.iter_content(chunk_size=ROZMIAR_PAKIETU_B):
+                f.write(chunk)
+        response_headers = zip_response.headers
+
+    size = os.path.getsize(part_path)
+    if total_size is not None and size != total_size:
+        raise IncompleteDownloadError(f"Pobrano {size} z {total_size} B dla {zip_url}")
+
+    try:
+        with zipfile.ZipFile(part_path, 'r') as zip_ref:
+            bad_member = zip_ref.testzip()
+    except zipfile.BadZipFile:
+        bad_member = "(struktura archiwum)"
+    if bad_member is not None:
+        remove_part_files(part_path)
+        raise IncompleteDownloadError(f"Błąd CRC w {zip_url}: {bad_member} - pobieranie od nowa")
+
+    sha256 = file_sha256(part_path)
+    os.replace(part_path, local_zip_path)
+    remove_part_files(part_path)
+    return response_headers, size, sha256
+
+# Linki do .zip wyciągane jednym wyrażeniem regularnym zamiast pełnego parsowania HTML
+ZIP_HREF_PATTERN = re.compile(r"""href\s*=\s*["']?([^"'\s>]+\.zip)["'\s>]""", re.IGNORECASE)
+
+_listing_cache = {}
+_listing_cache_lock = threading.Lock()
+
+def load_listing_cache():
+    """Wczytuje zapisane listingi katalogów (linki, ETag, Last-Modified, czas pobrania)."""
+    global _listing_cache
+    if os.path.exists(LISTING_CACHE_PATH):
+        try:
+            with open(LISTING_CACHE_PATH, 'r', encoding='utf-8') as f:
+                _listing_cache = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Nie udało się wczytać cache listingów {LISTING_CACHE_PATH} ({e}) - zaczynamy od pustego.")
+            _listing_cache = {}
+    return _listing_cache
+
+def save_listing_cache():
+    """Zapisuje cache listingów atomowo."""
+    with _listing_cache_lock:
+        snapshot = dict(_listing_cache)
+    os.makedirs(os.path.dirname(LISTING_CACHE_PATH) or ".", exist_ok=True)
+    tmp_path = LISTING_CACHE_PATH + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, LISTING_CACHE_PATH)
+
+def extract_zip_links(html_bytes, directory_url):
+    """Wyciąga z HTML listingu pełne adresy plików .zip (bez duplikatów, w kolejności wystąpienia)."""
+    html = html_bytes.decode('utf-8', errors='ignore')
+    links = []
+    for href in ZIP_HREF_PATTERN.findall(html):
+        # Tworzenie pełnego URL, jeśli href jest relatywny
+        full_link = urljoin(directory_url, href)
+        if full_link not in links:
+            links.append(full_link)
+    return links
+
+def listing_ttl(year):
+    """TTL wpisu cache: dłuższy dla lat zamkniętych."""
+    if year is not None and int(year) < CURRENT_YEAR:
+        return TTL_LISTINGU_ZAMKNIETY_ROK_S
+    return TTL_LISTINGU_S
+
+def get_zip_links_from_url(directory_url, year=None):
+    """Pobiera listę linków do plików ZIP z podanego URL katalogu (z użyciem cache listingów)."""
+    cached = _listing_cache.get(directory_url)
+    if cached and time.time() - cached.get("fetched_at", 0) < listing_ttl(year):
+        return list(cached["links"])
+
     links = []
+    session = get_http_session()
+    request_headers = {}
+    if cached:
+        # Rewalidacja: serwer odpowie 304, jeśli listing się nie zmienił
+        if cached.get("etag"):
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    def fetch_listing():
+        response = session.get(directory_url, timeout=30, headers=request_headers)
+        if response.status_code != 304:
+            response.raise_for_status() # Rzuci wyjątkiem dla kodów błędów HTTP
+        return response
+
     try:
-        response = requests.get(directory_url, timeout=30)
-        response.raise_for_status() # Rzuci wyjątkiem dla kodów błędów HTTP
-        soup = BeautifulSoup(response.content, 'html.parser')
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-            if href.lower().endswith('.zip'):
-                # Tworzenie pełnego URL, jeśli href jest relatywny
-                full_link = urljoin(directory_url, href)
-                links.append(full_link)
+        response = call_with_retries(fetch_listing, directory_url)
+        if response.status_code == 304:
+            links = list(cached["links"])
+        else:
+            links = extract_zip_links(response.content, directory_url)
+        with _listing_cache_lock:
+            _listing_cache[directory_url] = {
+                "links": links,
+                "etag": response.headers.get("ETag") or (cached or {}).get("etag"),
+                "last_modified": response.headers.get("Last-Modified") or (cached or {}).get("last_modified"),
+                "fetched_at": time.time(),
+            }
         if not links:
             print(f"  Nie znaleziono plików .zip w {directory_url}")
     except requests.exceptions.RequestException as e:
         print(f"  Błąd podczas dostępu do {directory_url}: {e}")
+        if cached:
+            print(f"  Używam zapisanego listingu ({len(cached['links'])} plików).")
+            links = list(cached["links"])
     return links
 
-def download_and_extract_zip(zip_url, save_path_base, year):
-    """Pobiera plik ZIP, zapisuje go i wypakowuje."""
+_stage_stats = {}
+_stage_stats_lock = threading.Lock()
+
+def add_stage_stats(stage, files=0, nbytes=0, busy_s=0.0, wait_s=0.0):
+    """Dolicza pracę etapu potoku: pliki, bajty, czas pracy i czas oczekiwania na kolejkę."""
+    with _stage_stats_lock:
+        stats = _stage_stats.setdefault(stage, {"pliki": 0, "bajty": 0, "praca_s": 0.0, "czekanie_s": 0.0})
+        stats["pliki"] += files
+        stats["bajty"] += nbytes
+        stats["praca_s"] += busy_s
+        stats["czekanie_s"] += wait_s
+
+def print_stage_stats(wall_s):
+    """Wypisuje przepustowość etapów; etap z najmniejszym czasem czekania jest wąskim gardłem."""
+    print(f"\nStatystyki potoku (czas całkowity: {wall_s:.1f} s):")
+    for stage, stats in _stage_stats.items():
+        mb = stats["bajty"] / 1e6
+        if stage == "duplikaty":
+            print(f"  {stage}: {stats['pliki']} plików ({mb:.1f} MB) już było w magazynie treści - nie zapisano ponownie")
+            continue
+        rate = mb / wall_s if wall_s > 0 else 0.0
+        print(f"  {stage}: {stats['pliki']} plików, {mb:.1f} MB, {rate:.2f} MB/s, "
+              f"praca {stats['praca_s']:.1f} s, czekanie na kolejkę {stats['czekanie_s']:.1f} s")
+
+def download_zip(zip_url, save_path_base, year):
+    """Pobiera plik ZIP (z synchronizacją i wznawianiem).
+
+    Zwraca (ścieżka_zip, katalog_rozpakowania) albo None, gdy nie trzeba nic rozpakowywać.
+    """
+    local_zip_path = None
     try:
         # Ścieżka do zapisu pliku ZIP
         parsed_url = urlparse(zip_url)
@@ -81,50 +444,255 @@ def download_and_extract_zip(zip_url, save_path_base, year):
 
         # Ścieżka do wypakowania zawartości
         extract_dir = os.path.join(save_path_base, str(year), "extracted_files")
-        os.makedirs(extract_dir, exist_ok=True)
+        if ROZPAKOWYWANIE_NA_DYSK:
+            os.makedirs(extract_dir, exist_ok=True)
+
+        if TRYB_SYNCHRONIZACJI and is_unchanged_locally(zip_url, local_zip_path, year):
+            # Manifest jest zapisywany przed rozpakowaniem - sprawdzamy, czy rozpakowanie się udało
+            if needs_extraction(local_zip_path, extract_dir):
+                print(f"    Bez zmian (manifest, rok zamknięty), ale brak rozpakowanych plików: {zip_filename}")
+                return local_zip_path, extract_dir
+            print(f"    Bez zmian (manifest, rok zamknięty): {zip_filename}")
+            return None
 
         print(f"    Pobieranie {zip_url} do {local_zip_path}...")
-        zip_response = requests.get(zip_url, stream=True, timeout=60)
-        zip_response.raise_for_status()
+        session = get_http_session()
+        request_headers = conditional_headers(zip_url, local_zip_path) if TRYB_SYNCHRONIZACJI else {}
+        previous_sha256 = _manifest.get(zip_url, {}).get("sha256")
 
-        with open(local_zip_path, 'wb') as f:
-            for chunk in zip_response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Całe pobieranie (nie tylko nagłówki) odbywa się w limicie połączeń hosta;
+        # kolejne próby wznawiają od miejsca, w którym przerwała poprzednia
+        started = time.perf_counter()
+        response_headers, size, sha256 = call_with_retries(
+            lambda: fetch_zip_resumable(session, zip_url, local_zip_path, request_headers), zip_url)
+        if size is None and not os.path.exists(local_zip_path):
+            # 304 bez lokalnej kopii (np. usunięta w trakcie) - pobieramy cały plik bez warunków
+            print(f"    Błąd: 304 Not Modified, ale brak lokalnego pliku {local_zip_path} - pełne pobieranie.")
+            response_headers, size, sha256 = call_with_retries(
+                lambda: fetch_zip_resumable(session, zip_url, local_zip_path, {}), zip_url)
+        add_stage_stats("pobieranie", files=1, nbytes=size or 0, busy_s=time.perf_counter() - started)
+        if size is None:
+            # 304 Not Modified - lokalna kopia jest aktualna
+            if zip_url not in _manifest:
+                record_manifest_entry(zip_url, local_zip_path, os.path.getsize(local_zip_path),
+                                      file_sha256(local_zip_path), response_headers)
+            if needs_extraction(local_zip_path, extract_dir):
+                print(f"    Bez zmian (304 Not Modified), ale brak rozpakowanych plików: {zip_filename}")
+                return local_zip_path, extract_dir
+            print(f"    Bez zmian (304 Not Modified): {zip_filename}")
+            return None
+        record_manifest_entry(zip_url, local_zip_path, size, sha256, response_headers)
         print(f"    Pobrano: {zip_filename}")
 
-        print(f"    Rozpakowywanie {local_zip_path} do {extract_dir}...")
-        with zipfile.ZipFile(local_zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-        print(f"    Rozpakowano: {zip_filename}")
+        if not ROZPAKOWYWANIE_NA_DYSK:
+            return None
+
+        if sha256 == previous_sha256 and members_already_extracted(local_zip_path, extract_dir):
+            print(f"    Treść identyczna jak poprzednio, pomijam rozpakowywanie: {zip_filename}")
+            return None
+        return local_zip_path, extract_dir
 
     except requests.exceptions.RequestException as e:
         print(f"    Błąd pobierania {zip_url}: {e}")
     except zipfile.BadZipFile:
-        print(f"    Błąd: {local_zip_path} nie jest poprawnym plikiem ZIP lub jest uszkodzony.")
+        print(f"    Błąd: plik pobrany z {zip_url} ({local_zip_path}) nie jest poprawnym plikiem ZIP lub jest uszkodzony.")
     except Exception as e:
         print(f"    Wystąpił nieoczekiwany błąd podczas przetwarzania {zip_url}: {e}")
+    return None
 
+def store_member_in_cas(zip_ref, info, local_zip_path, extract_dir):
+    """Zapisuje plik z archiwum w magazynie treści i tworzy do niego widok w extract_dir."""
+    with zip_ref.open(info, 'r') as member_stream:
+        sha256, size, is_new = imgw_magazyn.store_stream(member_stream)
+    view_path = os.path.join(extract_dir, info.filename)
+    imgw_magazyn.link_view(sha256, view_path)
+    imgw_magazyn.record(view_path, sha256)
+    imgw_magazyn.record(local_zip_path + imgw_magazyn.ZIP_MEMBER_SEPARATOR + info.filename, sha256)
+    if not is_new:
+        add_stage_stats("duplikaty", files=1, nbytes=size)
 
-# --- Główna pętla skryptu ---
-if not os.path.exists(BASE_SAVE_DIR):
-    os.makedirs(BASE_SAVE_DIR)
+def extract_zip_members(local_zip_path, extract_dir, member_names=None):
+    """Wypakowuje wskazane pliki z archiwum (domyślnie wszystkie) i dolicza statystyki."""
+    started = time.perf_counter()
+    try:
+        with zipfile.ZipFile(local_zip_path, 'r') as zip_ref:
+            members = zip_ref.infolist() if member_names is None else [zip_ref.getinfo(n) for n in member_names]
+            for info in members:
+                if MAGAZYN_TRESCI and not info.is_dir():
+                    store_member_in_cas(zip_ref, info, local_zip_path, extract_dir)
+                else:
+                    zip_ref.extract(info, extract_dir)
+        add_stage_stats("rozpakowywanie", files=len(members), nbytes=sum(i.file_size for i in members),
+                        busy_s=time.perf_counter() - started)
+    except zipfile.BadZipFile:
+        print(f"    Błąd: {local_zip_path} nie jest poprawnym plikiem ZIP lub jest uszkodzony.")
+    except Exception as e:
+        print(f"    Wystąpił nieoczekiwany błąd podczas rozpakowywania {local_zip_path}: {e}")
+
+def create_member_dirs(local_zip_path, extract_dir):
+    """Zakłada z góry katalogi wszystkich plików archiwum (przed równoległym rozpakowaniem paczek).
+
+    ZipFile.extract tworzy katalogi bez exist_ok - dwa wątki rozpakowujące pliki z tego samego
+    podkatalogu ścigałyby się przy jego zakładaniu. Nazwy są oczyszczane jak w ZipFile._extract_member.
+    """
+    with zipfile.ZipFile(local_zip_path, 'r') as zip_ref:
+        names = [info.filename for info in zip_ref.infolist()]
+    member_dirs = set()
+    for name in names:
+        arcname = name.replace('/', os.path.sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, os.path.sep)
+        parts = [part for part in os.path.splitdrive(arcname)[1].split(os.path.sep)
+                 if part not in ('', os.path.curdir, os.path.pardir)]
+        if len(parts) > 1 or name.endswith('/'):
+            member_dirs.add(os.path.join(extract_dir, *(parts if name.endswith('/') else parts[:-1])))
+    for member_dir in sorted(member_dirs):
+        os.makedirs(member_dir, exist_ok=True)
 
-for source_name, source_info in SOURCES.items():
-    print(f"\nPrzetwarzanie źródła: {source_name} (typ: {source_info['type']})")
-    current_save_path_base = os.path.join(BASE_SAVE_DIR, source_info['type'])
-    os.makedirs(current_save_path_base, exist_ok=True)
+def split_into_batches(local_zip_path, n_batches):
+    """Dzieli pliki archiwum na n_batches paczek o zbliżonym rozmiarze (do równoległego rozpakowania)."""
+    with zipfile.ZipFile(local_zip_path, 'r') as zip_ref:
+        infos = sorted((i for i in zip_ref.infolist() if not i.is_dir()), key=lambda i: i.file_size, reverse=True)
+    batches = [[] for _ in range(max(1, min(n_batches, len(infos))))]
+    batch_sizes = [0] * len(batches)
+    for info in infos:
+        smallest = batch_sizes.index(min(batch_sizes))
+        batches[smallest].append(info.filename)
+        batch_sizes[smallest] += info.file_size
+    return [b for b in batches if b]
 
-    for year in range(START_YEAR, ACTUAL_END_YEAR + 1):
-        print(f"  Rok: {year}")
-        year_directory_url = source_info['url_template'].format(year=year)
+def download_and_extract_zip(zip_url, save_path_base, year):
+    """Pobiera plik ZIP, zapisuje go i wypakowuje."""
+    downloaded = download_zip(zip_url, save_path_base, year)
+    if downloaded is not None:
+        local_zip_path, extract_dir = downloaded
+        print(f"    Rozpakowywanie {local_zip_path} do {extract_dir}...")
+        extract_zip_members(local_zip_path, extract_dir)
+        print(f"    Rozpakowano: {os.path.basename(local_zip_path)}")
 
-        zip_file_urls = get_zip_links_from_url(year_directory_url)
 
+def collect_download_tasks():
+    """Zbiera listę zadań (zip_url, katalog_bazowy, rok) dla wszystkich źródeł i lat."""
+    listing_jobs = []
+    for source_name, source_info in SOURCES.items():
+        current_save_path_base = os.path.join(BASE_SAVE_DIR, source_info['type'])
+        os.makedirs(current_save_path_base, exist_ok=True)
+        for year in range(START_YEAR, ACTUAL_END_YEAR + 1):
+            year_directory_url = source_info['url_template'].format(year=year)
+            listing_jobs.append((source_name, year, year_directory_url, current_save_path_base))
+
+    # Listingi katalogów też pobieramy równolegle - to dziesiątki małych zapytań
+    workers = MAX_WATKOW if TRYB_ROWNOLEGLY else 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        listings = list(executor.map(lambda job: get_zip_links_from_url(job[2], job[1]), listing_jobs))
+    save_listing_cache()
+
+    tasks = []
+    for (source_name, year, _, save_path_base), zip_file_urls in zip(listing_jobs, listings):
         if not zip_file_urls:
             print(f"  Brak plików ZIP do pobrania dla {source_name} w roku {year}.")
             continue
-
+        print(f"  {source_name} {year}: {len(zip_file_urls)} plików ZIP")
         for zip_url in zip_file_urls:
-            download_and_extract_zip(zip_url, current_save_path_base, year)
+            tasks.append((zip_url, save_path_base, year))
+    return tasks
+
+def extraction_worker(extract_queue):
+    """Konsument potoku: rozpakowuje paczki plików z kolejki aż do otrzymania None."""
+    while True:
+        waiting_since = time.perf_counter()
+        job = extract_queue.get()
+        add_stage_stats("rozpakowywanie", wait_s=time.perf_counter() - waiting_since)
+        try:
+            if job is None:
+                return
+            local_zip_path, extract_dir, member_names = job
+            extract_zip_members(local_zip_path, extract_dir, member_names)
+        finally:
+            extract_queue.task_done()
+
+def download_stage(zip_url, save_path_base, year, extract_queue):
+    """Producent potoku: pobiera ZIP i wstawia jego pliki (w paczkach) do kolejki rozpakowywania."""
+    downloaded = download_zip(zip_url, save_path_base, year)
+    if downloaded is None:
+        return
+    local_zip_path, extract_dir = downloaded
+    try:
+        create_member_dirs(local_zip_path, extract_dir)
+        batches = split_into_batches(local_zip_path, LICZBA_WATKOW_ROZPAKOWUJACYCH)
+    except zipfile.BadZipFile:
+        print(f"    Błąd: {local_zip_path} nie jest poprawnym plikiem ZIP lub jest uszkodzony.")
+        return
+    for member_names in batches:
+        waiting_since = time.perf_counter()
+        extract_queue.put((local_zip_path, extract_dir, member_names)) # Blokuje, gdy kolejka jest pełna
+        add_stage_stats("pobieranie", wait_s=time.perf_counter() - waiting_since)
+
+def run_downloads_parallel(tasks):
+    """Potok: pula wątków pobiera ZIP-y (współdzielona sesja HTTP), osobne wątki je rozpakowują."""
+    started = time.perf_counter()
+    extract_queue = queue.Queue(maxsize=ROZMIAR_KOLEJKI_ROZPAKOWYWANIA)
+    extractors = [threading.Thread(target=extraction_worker, args=(extract_queue,), daemon=True)
+                  for _ in range(LICZBA_WATKOW_ROZPAKOWUJACYCH)]
+    for extractor in extractors:
+        extractor.start()
+
+    with ThreadPoolExecutor(max_workers=MAX_WATKOW) as executor:
+        futures = [executor.submit(download_stage, zip_url, save_path_base, year, extract_queue)
+                   for zip_url, save_path_base, year in tasks]
+        for done_count, _ in enumerate(as_completed(futures), start=1):
+            if done_count % 50 == 0 or done_count == len(futures):
+                print(f"  Postęp: {done_count}/{len(futures)} plików ZIP, w kolejce do rozpakowania: {extract_queue.qsize()}")
+                if TRYB_SYNCHRONIZACJI:
+                    save_manifest() # Na wypadek przerwania długiego pobierania
+                if MAGAZYN_TRESCI:
+                    imgw_magazyn.save_index()
+
+    for _ in extractors:
+        extract_queue.put(None)
+    for extractor in extractors:
+        extractor.join()
+    print_stage_stats(time.perf_counter() - started)
+
+
+# --- Główna pętla skryptu ---
+if __name__ == "__main__":
+    if not os.path.exists(BASE_SAVE_DIR):
+        os.makedirs(BASE_SAVE_DIR)
+
+    if TRYB_SYNCHRONIZACJI:
+        load_manifest()
+    load_listing_cache()
+
+    if TRYB_ROWNOLEGLY:
+        print(f"\nTryb równoległy: {MAX_WATKOW} wątków, maks. {MAX_POLACZEN_NA_HOST} połączeń na host")
+        download_tasks = collect_download_tasks()
+        print(f"\nDo pobrania: {len(download_tasks)} plików ZIP")
+        run_downloads_parallel(download_tasks)
+    else:
+        for source_name, source_info in SOURCES.items():
+            print(f"\nPrzetwarzanie źródła: {source_name} (typ: {source_info['type']})")
+            current_save_path_base = os.path.join(BASE_SAVE_DIR, source_info['type'])
+            os.makedirs(current_save_path_base, exist_ok=True)
+
+            for year in range(START_YEAR, ACTUAL_END_YEAR + 1):
+                print(f"  Rok: {year}")
+                year_directory_url = source_info['url_template'].format(year=year)
+
+                zip_file_urls = get_zip_links_from_url(year_directory_url, year)
+
+                if not zip_file_urls:
+                    print(f"  Brak plików ZIP do pobrania dla {source_name} w roku {year}.")
+                    continue
+
+                for zip_url in zip_file_urls:
+                    download_and_extract_zip(zip_url, current_save_path_base, year)
+
+    save_listing_cache()
+    if MAGAZYN_TRESCI:
+        imgw_magazyn.save_index()
+    if TRYB_SYNCHRONIZACJI:
+        save_manifest()
+        print(f"Manifest zapisano do: {MANIFEST_PATH} ({len(_manifest)} plików)")
 
-print("\nZakończono pobieranie i rozpakowywanie wszystkich plików.")
\ No newline at end of file
+    print("\nZakończono pobieranie i rozpakowywanie wszystkich plików.")
\ No newline at end of file
@@ -1,6 +1,15 @@
 import os
+import io
+import json
+import time
+import hashlib
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
-import chardet # Do próby detekcji kodowania
+from imgw_archiwa import list_data_files, read_data_bytes, dataset_type
+from imgw_rozpoznawanie import sniff_file, sniff_content, remember_format, save_format_cache # Wspólne rozpoznawanie formatu (z cache)
+import imgw_magazyn
 
 # --- Konfiguracja ---
 ROOT_DATA_DIR = "pobrane_dane_imgw"
@@ -23,21 +32,35 @@ EXAMPLE_FILES_TO_INSPECT = [
     # "ost_hydro/2022/extracted_files/codz_2022_01.csv" # Zastąp rzeczywistą nazwą
 ]
 
-# Potencjalne kodowania do sprawdzenia
-COMMON_ENCODINGS = ['utf-8', 'cp1250', 'iso-8859-2', 'latin1']
+# "profil" - profil wszystkich plików CSV w korpusie (równolegle), zapis do PROFIL_MANIFEST_PATH
+# "przyklady" - szczegółowa inspekcja plików z EXAMPLE_FILES_TO_INSPECT
+TRYB_ANALIZY = "profil"
+PROFIL_MANIFEST_PATH = "profil_korpusu.json"
+PROFIL_LICZBA_PROCESOW = os.cpu_count() or 4
+PROFIL_ROZMIAR_PROBKI = 50 # Rozmiar próbki wartości (reservoir sampling) na kolumnę i rodzaj produktu
+PROFIL_ZIARNO_LOSOWANIA = 2024 # Stałe ziarno - powtarzalny manifest
 
-def detect_encoding(file_path, sample_size=10000):
-    """Próbuje wykryć kodowanie pliku na podstawie próbki bajtów."""
+# Kolumny (indeksy) daty i kodu stacji w poszczególnych produktach
+# codz: rok hydrologiczny (3), dzień (5), miesiąc kalendarzowy (9) - listopad i grudzień należą do roku poprzedniego
+PROFIL_KOLUMNY_PRODUKTOW = {
+    "k_d": {"rok": 2, "miesiac": 3, "dzien": 4, "stacja": 0},
+    "k_d_t": {"rok": 2, "miesiac": 3, "dzien": 4, "stacja": 0},
+    "o_d": {"rok": 2, "miesiac": 3, "dzien": 4, "stacja": 0},
+    "s_d": {"rok": 2, "miesiac": 3, "dzien": 4, "stacja": 0},
+    "s_d_t": {"rok": 2, "miesiac": 3, "dzien": 4, "stacja": 0},
+    "codz": {"rok": 3, "miesiac": 9, "dzien": 5, "stacja": 0, "rok_hydrologiczny": True},
+}
+
+def detect_format(file_path):
+    """Rozpoznaje kodowanie, separator i liczbę pól pliku (wynik trafia do wspólnego cache)."""
     try:
-        with open(file_path, 'rb') as f:
-            raw_data = f.read(sample_size)
-        result = chardet.detect(raw_data)
-        encoding = result['encoding']
-        confidence = result['confidence']
-        print(f"  Chardet wykrył kodowanie: {encoding} z pewnością: {confidence:.2f}")
-        return encoding if confidence > 0.7 else None # Zwracaj tylko przy wysokiej pewności
+        file_format = sniff_file(file_path)
+        separator = file_format["separator"]
+        num_fields = file_format["fields_by_separator"].get(separator) if separator else None
+        print(f"  Rozpoznane kodowanie: {file_format['encoding']}, separator: {separator!r}, liczba pól: {num_fields}")
+        return file_format
     except Exception as e:
-        print(f"  Błąd podczas detekcji kodowania (chardet) dla {file_path}: {e}")
+        print(f"  Błąd podczas rozpoznawania formatu dla {file_path}: {e}")
         return None
 
 def inspect_csv_file(file_path):
@@ -48,73 +71,191 @@ def inspect_csv_file(file_path):
         print("  BŁĄD: Plik nie istnieje!")
         return
 
-    detected_encoding_by_chardet = detect_encoding(file_path)
-    
-    loaded_successfully = False
-    used_encoding = None
-
-    if detected_encoding_by_chardet:
-        encodings_to_try = [detected_encoding_by_chardet] + [enc for enc in COMMON_ENCODINGS if enc != detected_encoding_by_chardet]
-    else:
-        encodings_to_try = COMMON_ENCODINGS
-
-    # Dodatkowa logika dla plików klimatologicznych
-    if "k_d_" in os.path.basename(file_path).lower():
-        if 'cp1250' not in encodings_to_try:
-            encodings_to_try.insert(0, 'cp1250') # Spróbuj cp1250 jako pierwszy
-        elif encodings_to_try[0] != 'cp1250':
-            encodings_to_try.remove('cp1250')
-            encodings_to_try.insert(0, 'cp1250')
+    file_format = detect_format(file_path)
+    if file_format is None:
+        print("  Nie udało się pomyślnie wczytać pliku.")
+        print("--- Koniec inspekcji ---")
+        return
+    encoding = file_format["encoding"]
+    separator = file_format["separator"] or ','
 
+    try:
+        # Wersja bez nagłówków, bo ich nie ma w plikach
+        df = pd.read_csv(file_path, encoding=encoding, sep=separator, header=None, nrows=10, on_bad_lines='warn', low_memory=False)
+        print(f"  Użyte kodowanie do wczytania: {encoding}, separator: {separator!r} (header=None)")
+        print("  Domyślne nazwy kolumn (nadane przez Pandas, bo header=None):")
+        print(f"    {list(df.columns)}")
+        print("\n  Pierwsze 5 wierszy:")
+        print(df.head().to_string())
 
-    for encoding in encodings_to_try:
         try:
-            # Wersja bez nagłówków, bo ich nie ma w plikach
-            df = pd.read_csv(file_path, encoding=encoding, header=None, nrows=10, on_bad_lines='warn', low_memory=False)
-            print(f"  Użyte kodowanie do wczytania: {encoding} (header=None)")
-            # df.columns = [f"col_{i}" for i in range(df.shape[1])] # Tymczasowe nazwy kolumn
-            print("  Domyślne nazwy kolumn (nadane przez Pandas, bo header=None):")
-            print(f"    {list(df.columns)}")
-            print("\n  Pierwsze 5 wierszy:")
-            print(df.head().to_string())
-            
-            try:
-                df_info = pd.read_csv(file_path, encoding=encoding, header=None, low_memory=False, nrows=1000)
-                # df_info.columns = [f"col_{i}" for i in range(df_info.shape[1])]
-                print("\n  Informacje o typach danych (Pandas):")
-                df_info.info(verbose=True, show_counts=True)
-            except Exception as e_info:
-                print(f"  Nie udało się wczytać pliku dla df.info() z kodowaniem {encoding}: {e_info}")
-                print("  Próba wczytania df.info() z nrows=100:")
-                try:
-                    df_info_small = pd.read_csv(file_path, encoding=encoding, nrows=100, low_memory=False)
-                    print("\n  Informacje o typach danych (Pandas, próbka 100 wierszy):")
-                    df_info_small.info(verbose=True, show_counts=True)
-                except Exception as e_info_small:
-                     print(f"  Nie udało się wczytać pliku dla df_info() (próbka 100 wierszy) z kodowaniem {encoding}: {e_info_small}")
-
-
-            loaded_successfully = True
-            used_encoding = encoding
-            break  # Jeśli się udało, nie próbuj innych kodowań
-        except UnicodeDecodeError:
-            print(f"  Nie udało się wczytać z kodowaniem: {encoding} (UnicodeDecodeError)")
-        except FileNotFoundError:
-            print(f"  BŁĄD: Plik {file_path} nie został znaleziony.")
-            return # Nie ma sensu próbować dalej
-        except pd.errors.EmptyDataError:
-            print(f"  BŁĄD: Plik {file_path} jest pusty.")
-            return
-        except pd.errors.ParserError as pe:
-            print(f"  Błąd parsowania z kodowaniem {encoding} dla {file_path}: {pe}")
-            print(f"  Plik może nie być standardowym CSV lub separator jest inny niż przecinek.")
-        except Exception as e:
-            print(f"  Inny błąd podczas wczytywania {file_path} z kodowaniem {encoding}: {e}")
-
-    if not loaded_successfully:
-        print("  Nie udało się pomyślnie wczytać pliku przy użyciu żadnego ze standardowych kodowań.")
+            df_info = pd.read_csv(file_path, encoding=encoding, sep=separator, header=None, low_memory=False, nrows=1000)
+            print("\n  Informacje o typach danych (Pandas):")
+            df_info.info(verbose=True, show_counts=True)
+        except Exception as e_info:
+            print(f"  Nie udało się wczytać pliku dla df.info() z kodowaniem {encoding}: {e_info}")
+    except FileNotFoundError:
+        print(f"  BŁĄD: Plik {file_path} nie został znaleziony.")
+    except pd.errors.EmptyDataError:
+        print(f"  BŁĄD: Plik {file_path} jest pusty.")
+    except pd.errors.ParserError as pe:
+        print(f"  Błąd parsowania z kodowaniem {encoding} dla {file_path}: {pe}")
+        print(f"  Plik może nie być standardowym CSV lub separator jest inny niż rozpoznany.")
+    except Exception as e:
+        print(f"  Inny błąd podczas wczytywania {file_path} z kodowaniem {encoding}: {e}")
     print("--- Koniec inspekcji ---")
 
+def column_profile(values, rng):
+    """Statystyki jednej kolumny pliku: liczność, braki, wartości liczbowe i losowa próbka."""
+    non_null = values.dropna()
+    numeric = pd.to_numeric(non_null, errors='coerce').dropna()
+    sample_size = min(PROFIL_ROZMIAR_PROBKI, len(non_null))
+    sample = non_null.to_numpy()[rng.choice(len(non_null), sample_size, replace=False)] if sample_size else []
+    return {
+        "non_null": int(len(non_null)),
+        "nulls": int(len(values) - len(non_null)),
+        "numeric": int(len(numeric)),
+        "min": float(numeric.min()) if len(numeric) else None,
+        "max": float(numeric.max()) if len(numeric) else None,
+        "sample": [str(v) for v in sample],
+    }
+
+def file_date_range(df, columns):
+    """Najwcześniejsza i najpóźniejsza data w pliku (ISO) wg kolumn produktu."""
+    if max(columns["rok"], columns["miesiac"], columns["dzien"]) >= df.shape[1]:
+        return None, None
+    year = pd.to_numeric(df[columns["rok"]], errors='coerce')
+    month = pd.to_numeric(df[columns["miesiac"]], errors='coerce')
+    if columns.get("rok_hydrologiczny"):
+        year = year - month.isin([11, 12]).astype(int)
+    dates = pd.to_datetime(pd.DataFrame({"year": year, "month": month,
+                                         "day": pd.to_numeric(df[columns["dzien"]], errors='coerce')}),
+                           errors='coerce').dropna()
+    if dates.empty:
+        return None, None
+    return dates.min().date().isoformat(), dates.max().date().isoformat()
+
+def profile_file(file_ref):
+    """Profil jednego pliku (uruchamiany w procesie roboczym)."""
+    profile = {"plik": file_ref, "produkt": dataset_type(file_ref)}
+    try:
+        raw_bytes = read_data_bytes(file_ref)
+    except Exception as e:
+        profile["blad"] = f"odczyt: {e}"
+        return profile
+    profile["sha256"] = hashlib.sha256(raw_bytes).hexdigest()
+    profile["rozmiar"] = len(raw_bytes)
+    file_format = sniff_content(raw_bytes)
+    try:
+        raw_bytes.decode(file_format["encoding"])
+    except UnicodeDecodeError:
+        file_format = sniff_content(raw_bytes, full_file=True)
+    profile["format"] = file_format
+    separator = file_format["separator"]
+    profile["kodowanie"] = file_format["encoding"]
+    profile["separator"] = separator
+    profile["liczba_pol"] = file_format["fields_by_separator"].get(separator) if separator else 1
+    try:
+        df = pd.read_csv(io.BytesIO(raw_bytes), encoding=file_format["encoding"], sep=separator or ',',
+                         header=None, dtype=str)
+    except pd.errors.EmptyDataError:
+        profile["liczba_wierszy"] = 0
+        return profile
+    except Exception as e:
+        profile["blad"] = f"parsowanie: {e}"
+        return profile
+
+    profile["liczba_wierszy"] = int(len(df))
+    profile["liczba_kolumn"] = int(df.shape[1])
+    columns = PROFIL_KOLUMNY_PRODUKTOW.get(profile["produkt"])
+    if columns is not None:
+        profile["data_od"], profile["data_do"] = file_date_range(df, columns)
+        profile["liczba_stacji"] = int(df[columns["stacja"]].nunique())
+    rng = np.random.default_rng([PROFIL_ZIARNO_LOSOWANIA, int(profile["sha256"][:8], 16)])
+    profile["kolumny"] = [column_profile(df[col], rng) for col in df.columns]
+    return profile
+
+def merge_reservoirs(sample_a, count_a, sample_b, count_b, rng):
+    """Łączy dwie jednostajne próbki (z populacji count_a i count_b) w jedną jednostajną próbkę."""
+    if count_a + count_b == 0:
+        return []
+    sample_size = min(PROFIL_ROZMIAR_PROBKI, count_a + count_b)
+    # Ile elementów próbki pochodzi z pierwszej populacji - rozkład hipergeometryczny
+    from_a = int(rng.hypergeometric(count_a, count_b, sample_size)) if count_a and count_b else (sample_size if count_a else 0)
+    picked_a = [sample_a[i] for i in rng.choice(len(sample_a), from_a, replace=False)] if from_a else []
+    picked_b = [sample_b[i] for i in rng.choice(len(sample_b), sample_size - from_a, replace=False)] if sample_size - from_a else []
+    return picked_a + picked_b
+
+def summarize_profiles(file_profiles):
+    """Podsumowanie per rodzaj produktu: liczby pól, kodowania, zakres dat, statystyki kolumn."""
+    rng = np.random.default_rng(PROFIL_ZIARNO_LOSOWANIA)
+    summary = {}
+    for profile in file_profiles:
+        product = summary.setdefault(profile["produkt"] or "nieznany", {
+            "liczba_plikow": 0, "liczba_wierszy": 0, "liczby_pol": {}, "kodowania": {},
+            "data_od": None, "data_do": None, "bledy": 0, "kolumny": []})
+        product["liczba_plikow"] += 1
+        if "blad" in profile:
+            product["bledy"] += 1
+            continue
+        product["liczba_wierszy"] += profile.get("liczba_wierszy", 0)
+        fields_key = str(profile.get("liczba_pol"))
+        product["liczby_pol"][fields_key] = product["liczby_pol"].get(fields_key, 0) + 1
+        product["kodowania"][profile["kodowanie"]] = product["kodowania"].get(profile["kodowanie"], 0) + 1
+        if profile.get("data_od"):
+            product["data_od"] = min(filter(None, [product["data_od"], profile["data_od"]]))
+            product["data_do"] = max(filter(None, [product["data_do"], profile["data_do"]]))
+        for i, column in enumerate(profile.get("kolumny", [])):
+            if i >= len(product["kolumny"]):
+                product["kolumny"].append({"indeks": i, "non_null": 0, "nulls": 0, "numeric": 0,
+                                           "min": None, "max": None, "sample": []})
+            total = product["kolumny"][i]
+            total["sample"] = merge_reservoirs(total["sample"], total["non_null"],
+                                               column["sample"], column["non_null"], rng)
+            for key in ("non_null", "nulls", "numeric"):
+                total[key] += column[key]
+            if column["min"] is not None:
+                total["min"] = column["min"] if total["min"] is None else min(total["min"], column["min"])
+                total["max"] = column["max"] if total["max"] is None else max(total["max"], column["max"])
+    return summary
+
+def profile_corpus(root_dir):
+    """Profiluje wszystkie pliki CSV korpusu w puli procesów i zapisuje manifest JSON."""
+    start_time = time.perf_counter()
+    file_refs = list_data_files(root_dir, lambda name: name.lower().endswith(".csv"))
+    print(f"Profilowanie {len(file_refs)} plików CSV ({PROFIL_LICZBA_PROCESOW} procesów)...")
+    with ProcessPoolExecutor(max_workers=PROFIL_LICZBA_PROCESOW) as executor:
+        file_profiles = list(executor.map(profile_file, file_refs,
+                                          chunksize=max(1, len(file_refs) // (PROFIL_LICZBA_PROCESOW * 8))))
+
+    # Formaty rozpoznane w procesach roboczych trafiają do wspólnego cache (dla etapów 05-10)
+    for profile in file_profiles:
+        if "sha256" in profile:
+            imgw_magazyn.record(profile["plik"], profile["sha256"])
+            remember_format(profile["sha256"], profile["format"])
+        profile.pop("format", None)
+    save_format_cache()
+
+    summary = summarize_profiles(file_profiles)
+    manifest = {
+        "wygenerowano": datetime.now().isoformat(timespec='seconds'),
+        "katalog": root_dir,
+        "czas_s": round(time.perf_counter() - start_time, 2),
+        "produkty": summary,
+        "pliki": file_profiles,
+    }
+    with open(PROFIL_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    print(f"Zapisano manifest: {PROFIL_MANIFEST_PATH} ({manifest['czas_s']} s)")
+    for product_name, product in sorted(summary.items()):
+        print(f"  {product_name}: {product['liczba_plikow']} plików, {product['liczba_wierszy']} wierszy, "
+              f"pola: {product['liczby_pol']}, kodowania: {product['kodowania']}, "
+              f"daty: {product['data_od']} - {product['data_do']}, błędy: {product['bledy']}")
+        if len(product["liczby_pol"]) > 1:
+            print(f"    UWAGA: różna liczba pól w plikach {product_name} - zmiana schematu?")
+    return manifest
+
 # --- Główna część skryptu ---
 if __name__ == "__main__":
     # Utwórz pełne ścieżki do plików na podstawie ROOT_DATA_DIR
@@ -128,9 +269,12 @@ if __name__ == "__main__":
 
     if not os.path.isdir(ROOT_DATA_DIR):
         print(f"Błąd: Główny katalog danych '{ROOT_DATA_DIR}' nie istnieje.")
+    elif TRYB_ANALIZY == "profil":
+        profile_corpus(ROOT_DATA_DIR)
     else:
         for file_path_to_check in full_paths_to_inspect:
             inspect_csv_file(file_path_to_check)
+        save_format_cache() # Rozpoznane formaty wykorzystają etapy 05-10
 
         print("\nZakończono inspekcję wybranych plików.")
         print("Przejrzyj wyniki powyżej. Zwróć szczególną uwagę na:")
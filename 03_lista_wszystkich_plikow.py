@@ -1,41 +1,43 @@
 import os
+import time
+import sqlite3
+from imgw_katalog import build_catalog, connect, CATALOG_PATH
+from imgw_segmenty import pack_warning_segments
 
 # --- Konfiguracja ---
 ROOT_DATA_DIR = "pobrane_dane_imgw"  # Główny folder z pobranymi danymi
-OUTPUT_FILE_NAME = "lista_plikow_rozpakowanych.txt"
-EXCLUDE_EXTENSIONS = ['.zip'] # Lista rozszerzeń do wykluczenia (można dodać więcej)
+# Katalog plików (SQLite) zastępuje dawną listę lista_plikow_rozpakowanych.txt; ścieżka w imgw_katalog.CATALOG_PATH
+PAKUJ_OSTRZEZENIA = True # Pakuj pliki ostrzeżeń .TXT każdego roku w jeden segment (czytany przez 04)
 
-def find_files_recursive(directory, exclude_ext):
-    """
-    Rekursywnie przeszukuje katalog i zwraca listę ścieżek do plików,
-    wykluczając te z podanymi rozszerzeniami.
-    """
-    found_files = []
-    for root, _, files in os.walk(directory):
-        for filename in files:
-            # Sprawdzamy, czy rozszerzenie pliku nie jest na liście wykluczonych
-            file_ext = os.path.splitext(filename)[1].lower() # Pobieramy rozszerzenie i konwertujemy na małe litery
-            if file_ext not in exclude_ext:
-                full_path = os.path.join(root, filename)
-                found_files.append(full_path)
-    return found_files
+def print_catalog_summary(catalog_path):
+    """Wypisuje podsumowanie katalogu: liczba plików, lata i rozmiar dla każdego produktu."""
+    connection = connect(catalog_path)
+    rows = connection.execute(
+        "SELECT produkt, COUNT(*), MIN(rok), MAX(rok), SUM(rozmiar) "
+        "FROM pliki GROUP BY produkt ORDER BY produkt").fetchall()
+    connection.close()
+    for product, count, year_min, year_max, total_size in rows:
+        print(f"  {product}: {count} plików, lata {year_min}-{year_max}, {total_size / 1024 / 1024:.1f} MB")
 
 # --- Główna część skryptu ---
 if __name__ == "__main__":
     if not os.path.isdir(ROOT_DATA_DIR):
         print(f"Błąd: Katalog '{ROOT_DATA_DIR}' nie istnieje. Uruchom najpierw skrypt pobierający.")
     else:
-        print(f"Przeszukiwanie katalogu: {ROOT_DATA_DIR}...")
-        all_extracted_files = find_files_recursive(ROOT_DATA_DIR, EXCLUDE_EXTENSIONS)
-
-        if not all_extracted_files:
-            print("Nie znaleziono żadnych rozpakowanych plików (poza wykluczonymi rozszerzeniami).")
+        print(f"Budowanie katalogu plików z: {ROOT_DATA_DIR}...")
+        start_time = time.perf_counter()
+        try:
+            stats = build_catalog(ROOT_DATA_DIR, CATALOG_PATH)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Błąd podczas budowania katalogu '{CATALOG_PATH}': {e}")
         else:
-            print(f"Znaleziono {len(all_extracted_files)} plików. Zapisywanie listy do '{OUTPUT_FILE_NAME}'...")
-            try:
-                with open(OUTPUT_FILE_NAME, 'w', encoding='utf-8') as f:
-                    for file_path in all_extracted_files:
-                        f.write(file_path + '\n')
-                print(f"Lista plików została pomyślnie zapisana w '{OUTPUT_FILE_NAME}'.")
-            except IOError as e:
-                print(f"Błąd podczas zapisywania pliku '{OUTPUT_FILE_NAME}': {e}")
\ No newline at end of file
+            if not stats["pliki"]:
+                print("Nie znaleziono żadnych plików danych.")
+            else:
+                print(f"Katalog '{CATALOG_PATH}': {stats['pliki']} plików "
+                      f"(sha256 przeliczono dla {stats['przeliczone']}, usunięto {stats['usuniete']} nieistniejących) "
+                      f"w {time.perf_counter() - start_time:.2f} s.")
+                print_catalog_summary(CATALOG_PATH)
+                if PAKUJ_OSTRZEZENIA:
+                    packed, up_to_date = pack_warning_segments(ROOT_DATA_DIR)
+                    print(f"Segmenty ostrzeżeń: spakowano {packed} lat, aktualne {up_to_date}.")
\ No newline at end of file
@@ -1,111 +1,351 @@
 import os
 import re
 import csv
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from imgw_archiwa import iter_file_contents, read_data_bytes, data_file_name, is_zip_member, split_zip_member
+from imgw_katalog import catalog_files, processed_unchanged, mark_processed, CATALOG_PATH
+from imgw_magazyn import normalize_ref
+from imgw_segmenty import fresh_segment_index, segment_paths, iter_segment_records
+from imgw_przedzialy import build_interval_index, save_interval_index, interval_index_path
+from imgw_obszary import load_station_registry, build_area_matcher, tag_warning_areas, save_warning_areas
 
-def extract_hydro_data(file_path):
-    """Wyciąga kluczowe informacje z pliku hydrologicznego IMGW"""
+# Wzorce pól ostrzeżenia
+FIELD_PATTERNS = {
+    'data': r'Data i godzina wydania:\s*(\d{2}\.\d{2}\.\d{4})\s*-\s*godz\.\s*(\d{2}:\d{2})',
+    'biuro': r'Nazwa biura prognoz hydrologicznych:\s*(.+?)(?:\n|$)',
+    'numer': r'INFORMACJA O NIEBEZPIECZNYM ZJAWISKU Nr\s*([^:\n]+)',
+    'zjawisko': r'Zjawisko:\s*(.+?)(?:\n|$)',
+    'stopien': r'Stopień zagrożenia:\s*(\d+)',
+    'waznosc': r'Ważność:\s*od godz\.\s*(\d{2}:\d{2})\s*dnia\s*(\d{2}\.\d{2}\.\d{4})\s*do godz\.\s*(\d{2}:\d{2})\s*dnia\s*(\d{2}\.\d{2}\.\d{4})',
+    'obszar': r'Obszar:\s*((?s:.+?))(?:\n|Przebieg:)', # (?s:) - kropka obejmuje też znak nowej linii
+    'prawdopodobienstwo': r'Prawdopodobieństwo wystąpienia zjawiska:\s*(\d+)%',
+    'hydrolog': r'Dyżurny synoptyk hydrolog:\s*(.+?)(?:\n|$)',
+}
+# Pojedyncze wzorce - awaryjnie, gdy pole nie znalazło się w przebiegu łączonym
+FIELD_REGEXES = {name: re.compile(pattern) for name, pattern in FIELD_PATTERNS.items()}
+
+# Jeden wzorzec ze wszystkimi polami - tekst pliku jest skanowany tylko raz. Gałęzie są
+# nieprzechwytujące (grupy nazwane na zewnątrz wyłączają w re szybkie wyszukiwanie pierwszego
+# znaku i skan jest ~10x wolniejszy); pole rozpoznajemy po numerze ostatniej dopasowanej grupy.
+WARNING_REGEX = re.compile('|'.join(f'(?:{pattern})' for pattern in FIELD_PATTERNS.values()))
+
+def build_field_group_ranges(field_regexes):
+    """Numer ostatniej grupy gałęzi wzorca łączonego -> (pole, pierwsza grupa, ostatnia grupa)."""
+    ranges = {}
+    first_group = 1
+    for name, regex in field_regexes.items():
+        last_group = first_group + regex.groups - 1
+        ranges[last_group] = (name, first_group, last_group)
+        first_group += regex.groups
+    return ranges
+
+FIELD_GROUP_RANGES = build_field_group_ranges(FIELD_REGEXES)
+
+# True - parsuj tylko pliki nowe lub zmienione od ostatniego uruchomienia (wg sha256 z katalogu 03)
+# i dopisz je do istniejącego CSV; po zmianie parsera uruchom raz z False (pełne przeliczenie)
+TRYB_PRZYROSTOWY = True
+ETAP_OSTRZEZENIA = "04_ostrzezenia_hydro" # Nazwa etapu w tabeli "przetworzone" katalogu
+CZYTAJ_Z_SEGMENTOW = True # Czytaj z segmentów lat (pakowanych przez 03), gdy są aktualne
+
+# Rejestr stacji hydro z powiatami (wynik 13) - nazwy powiatów, rzek i stacji do przypisania pola "obszar"
+REJESTR_STACJI_HYDRO = "stacje_hydro_z_powiatami_przetworzone.csv"
+
+LICZBA_PROCESOW_PARSOWANIA = os.cpu_count() or 4
+ROZMIAR_PARTII_PLIKOW = 500 # Ile plików (odczyt + parsowanie) trafia naraz do procesu roboczego
+
+def find_fields(content):
+    """Grupy każdego pola (pierwsze wystąpienie) albo None, gdy pola brak - jeden skan tekstu."""
+    found = {}
+    for match in WARNING_REGEX.finditer(content):
+        name, first, last = FIELD_GROUP_RANGES[match.lastindex]
+        if name not in found:
+            found[name] = match.group(*range(first, last + 1)) if last > first else (match.group(first),)
+            if len(found) == len(FIELD_REGEXES):
+                break
+    for name, regex in FIELD_REGEXES.items():
+        if name not in found:
+            match = regex.search(content)
+            found[name] = match.groups() if match else None
+    return found
+
+def warning_datetime(date_str, time_str):
+    """Data (dd.mm.rrrr) i godzina (gg:mm) jako 'rrrr-mm-dd gg:mm'; godzina 24:00 to północ dnia następnego."""
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            content = file.read()
-        
-        # Regex patterns dla różnych pól
-        data_pattern = r'Data i godzina wydania:\s*(\d{2}\.\d{2}\.\d{4})\s*-\s*godz\.\s*(\d{2}:\d{2})'
-        biuro_pattern = r'Nazwa biura prognoz hydrologicznych:\s*(.+?)(?:\n|$)'
-        numer_pattern = r'INFORMACJA O NIEBEZPIECZNYM ZJAWISKU Nr\s*([^:\n]+)'
-        zjawisko_pattern = r'Zjawisko:\s*(.+?)(?:\n|$)'
-        stopien_pattern = r'Stopień zagrożenia:\s*(\d+)'
-        waznosc_pattern = r'Ważność:\s*od godz\.\s*(\d{2}:\d{2})\s*dnia\s*(\d{2}\.\d{2}\.\d{4})\s*do godz\.\s*(\d{2}:\d{2})\s*dnia\s*(\d{2}\.\d{2}\.\d{4})'
-        obszar_pattern = r'Obszar:\s*(.+?)(?:\n|Przebieg:)'
-        prawdopodobienstwo_pattern = r'Prawdopodobieństwo wystąpienia zjawiska:\s*(\d+)%'
-        hydrolog_pattern = r'Dyżurny synoptyk hydrolog:\s*(.+?)(?:\n|$)'
-        
-        # Wyciąganie danych
-        data_match = re.search(data_pattern, content)
-        biuro_match = re.search(biuro_pattern, content)
-        numer_match = re.search(numer_pattern, content)
-        zjawisko_match = re.search(zjawisko_pattern, content)
-        stopien_match = re.search(stopien_pattern, content)
-        waznosc_match = re.search(waznosc_pattern, content)
-        obszar_match = re.search(obszar_pattern, content, re.DOTALL)
-        prawdopodobienstwo_match = re.search(prawdopodobienstwo_pattern, content)
-        hydrolog_match = re.search(hydrolog_pattern, content)
+        if time_str == '24:00':
+            moment = datetime.strptime(date_str, '%d.%m.%Y') + timedelta(days=1)
+        else:
+            moment = datetime.strptime(f"{date_str} {time_str}", '%d.%m.%Y %H:%M')
+    except (TypeError, ValueError):
+        return ''
+    return moment.strftime('%Y-%m-%d %H:%M')
+
+def extract_hydro_data(file_path, raw_content=None):
+    """Wyciąga kluczowe informacje z pliku hydrologicznego IMGW (z dysku lub z archiwum ZIP)"""
+    try:
+        if raw_content is None:
+            raw_content = read_data_bytes(file_path)
+        content = raw_content.decode('utf-8', errors='ignore')
+        fields = find_fields(content)
+        data = fields['data']
+        waznosc = fields['waznosc']
         
         return {
-            'nazwa_pliku': os.path.basename(file_path),
-            'data_wydania': data_match.group(1) if data_match else '',
-            'godzina_wydania': data_match.group(2) if data_match else '',
-            'biuro': biuro_match.group(1).strip() if biuro_match else '',
-            'numer_informacji': numer_match.group(1).strip() if numer_match else '',
-            'zjawisko': zjawisko_match.group(1).strip() if zjawisko_match else '',
-            'stopien_zagrozenia': int(stopien_match.group(1)) if stopien_match else '',
-            'waznosc_od_godzina': waznosc_match.group(1) if waznosc_match else '',
-            'waznosc_od_data': waznosc_match.group(2) if waznosc_match else '',
-            'waznosc_do_godzina': waznosc_match.group(3) if waznosc_match else '',
-            'waznosc_do_data': waznosc_match.group(4) if waznosc_match else '',
-            'obszar': obszar_match.group(1).strip().replace('\n', ' ') if obszar_match else '',
-            'prawdopodobienstwo': int(prawdopodobienstwo_match.group(1)) if prawdopodobienstwo_match else '',
-            'hydrolog': hydrolog_match.group(1).strip() if hydrolog_match else ''
+            'nazwa_pliku': data_file_name(file_path),
+            'data_wydania': data[0] if data else '',
+            'godzina_wydania': data[1] if data else '',
+            'biuro': fields['biuro'][0].strip() if fields['biuro'] else '',
+            'numer_informacji': fields['numer'][0].strip() if fields['numer'] else '',
+            'zjawisko': fields['zjawisko'][0].strip() if fields['zjawisko'] else '',
+            'stopien_zagrozenia': int(fields['stopien'][0]) if fields['stopien'] else '',
+            'waznosc_od_godzina': waznosc[0] if waznosc else '',
+            'waznosc_od_data': waznosc[1] if waznosc else '',
+            'waznosc_do_godzina': waznosc[2] if waznosc else '',
+            'waznosc_do_data': waznosc[3] if waznosc else '',
+            'waznosc_od': warning_datetime(waznosc[1], waznosc[0]) if waznosc else '',
+            'waznosc_do': warning_datetime(waznosc[3], waznosc[2]) if waznosc else '',
+            'obszar': fields['obszar'][0].strip().replace('\n', ' ') if fields['obszar'] else '',
+            'prawdopodobienstwo': int(fields['prawdopodobienstwo'][0]) if fields['prawdopodobienstwo'] else '',
+            'hydrolog': fields['hydrolog'][0].strip() if fields['hydrolog'] else ''
         }
     except Exception as e:
         print(f"Błąd podczas przetwarzania pliku {file_path}: {e}")
         return None
 
-def process_hydro_directory(base_path):
-    """Przetwarza wszystkie pliki hydrologiczne w katalogu"""
+def extract_hydro_files(file_refs):
+    """Czyta i przetwarza listę plików - wywoływane w procesie roboczym (każde archiwum otwierane raz).
+
+    Zwraca pary (odwołanie, rekord albo None przy błędzie).
+    """
+    return [(file_ref, extract_hydro_data(file_ref, raw_content)) for file_ref, raw_content in iter_file_contents(file_refs)]
+
+def extract_hydro_segment(task):
+    """Przetwarza partię rekordów segmentu (ścieżka_segmentu, rekordy) - w procesie roboczym; pary jak wyżej."""
+    segment_path, records = task
+    return [(file_ref, extract_hydro_data(file_ref, raw_content))
+            for file_ref, raw_content in iter_segment_records(segment_path, records)]
+
+def warning_files_by_year(base_path):
+    """Pliki ostrzeżeń .TXT z katalogu SQLite (03), pogrupowane wg katalogu roku."""
+    files_by_year = {}
+    for file_ref in catalog_files(base_path, "ost_hydro"):
+        path = split_zip_member(file_ref)[0] if is_zip_member(file_ref) else file_ref
+        year = os.path.relpath(os.path.abspath(path), os.path.abspath(base_path)).split(os.sep)[0]
+        files_by_year.setdefault(year, []).append(file_ref)
+    return files_by_year
+
+def split_into_batches(items, batch_size):
+    """Dzieli listę na kolejne fragmenty po batch_size elementów."""
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+def process_hydro_directory(base_path, max_workers=LICZBA_PROCESOW_PARSOWANIA, skip_refs=frozenset()):
+    """Przetwarza wszystkie pliki hydrologiczne w katalogu (poza skip_refs).
+
+    Zwraca (rekordy, odwołania plików przetworzonych bez błędu).
+    """
     all_data = []
+    succeeded_refs = set()
+    original_refs = {} # Segmenty zwracają odwołania znormalizowane - wracamy do odwołań z katalogu
+    tasks_by_year = {}
+    total_files = 0
+    for year, year_refs in warning_files_by_year(base_path).items():
+        file_refs = [ref for ref in year_refs if ref not in skip_refs]
+        if not file_refs:
+            continue
+        total_files += len(file_refs)
+        original_refs.update((normalize_ref(ref), ref) for ref in file_refs)
+        # Aktualny segment roku (03) - rekordy czytane z jednego pliku przez mmap
+        segment_records = fresh_segment_index(os.path.join(base_path, year), year_refs) if CZYTAJ_Z_SEGMENTOW else None
+        if segment_records is not None:
+            wanted = {normalize_ref(ref) for ref in file_refs}
+            segment_path = segment_paths(os.path.join(base_path, year))[0]
+            records = [record for record in segment_records if record[0] in wanted]
+            tasks_by_year[year] = (extract_hydro_segment, [(segment_path, batch) for batch in split_into_batches(records, ROZMIAR_PARTII_PLIKOW)])
+        else:
+            tasks_by_year[year] = (extract_hydro_files, split_into_batches(file_refs, ROZMIAR_PARTII_PLIKOW))
+    # Przy małej liczbie plików uruchamianie procesów kosztowałoby więcej niż samo parsowanie
+    executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 and total_files > ROZMIAR_PARTII_PLIKOW else None
     
-    # Przejdź przez wszystkie lata
-    for year in os.listdir(base_path):
-        year_path = os.path.join(base_path, year)
-        if os.path.isdir(year_path):
-            extracted_path = os.path.join(year_path, 'extracted_files')
+    try:
+        # Przejdź przez wszystkie lata
+        for year, (worker, batches) in tasks_by_year.items():
+            print(f"Przetwarzanie roku {year}...")
             
-            if os.path.exists(extracted_path):
-                print(f"Przetwarzanie roku {year}...")
-                
-                for filename in os.listdir(extracted_path):
-                    if filename.endswith('.TXT'):
-                        file_path = os.path.join(extracted_path, filename)
-                        data = extract_hydro_data(file_path)
-                        
-                        if data:
-                            data['rok'] = year
-                            all_data.append(data)
+            # Partie plików .TXT (z segmentu albo prosto z archiwów) parsowane w procesach roboczych
+            results = executor.map(worker, batches) if executor else map(worker, batches)
+            for batch_results in results:
+                for file_ref, data in batch_results:
+                    if data:
+                        data['rok'] = year
+                        all_data.append(data)
+                        succeeded_refs.add(original_refs.get(normalize_ref(file_ref), file_ref))
+    finally:
+        if executor:
+            executor.shutdown()
     
-    return all_data
+    return all_data, succeeded_refs
 
-def save_to_csv(data, output_file):
-    """Zapisuje dane do pliku CSV"""
+FIELDNAMES = [
+    'rok', 'nazwa_pliku', 'data_wydania', 'godzina_wydania',
+    'biuro', 'numer_informacji', 'zjawisko', 'stopien_zagrozenia',
+    'waznosc_od_data', 'waznosc_od_godzina', 'waznosc_do_data', 'waznosc_do_godzina',
+    'waznosc_od', 'waznosc_do', # Początek i koniec ważności jako data i czas (rrrr-mm-dd gg:mm)
+    'obszar', 'prawdopodobienstwo', 'hydrolog'
+]
+INT_FIELDS = ['stopien_zagrozenia', 'prawdopodobienstwo']
+
+def record_key(record):
+    """Klucz rekordu przy usuwaniu duplikatów: katalog roku i nazwa pliku ostrzeżenia."""
+    return (str(record['rok']), record['nazwa_pliku'])
+
+def issue_sort_key(record):
+    """Klucz sortowania wg daty i godziny wydania (dd.mm.rrrr); rekordy bez daty na końcu."""
+    parts = record['data_wydania'].split('.') if record['data_wydania'] else []
+    day, month, year = (parts + ['', '', ''])[:3]
+    return (not parts, year, month, day, record['godzina_wydania'], record_key(record))
+
+def csv_header(output_file):
+    """Nagłówek istniejącego CSV (None, gdy pliku brak)."""
+    if not os.path.exists(output_file):
+        return None
+    with open(output_file, 'r', newline='', encoding='utf-8') as csvfile:
+        return next(csv.reader(csvfile), [])
+
+def load_existing_records(output_file):
+    """Wczytuje rekordy z istniejącego CSV (pusta lista, gdy pliku brak)."""
+    if not os.path.exists(output_file):
+        return []
+    with open(output_file, 'r', newline='', encoding='utf-8') as csvfile:
+        records = list(csv.DictReader(csvfile))
+    for record in records:
+        for field in INT_FIELDS:
+            if record[field].isdigit():
+                record[field] = int(record[field])
+    return records
+
+def ref_record_keys(files_by_year):
+    """Odwołanie pliku -> klucz jego rekordu w tabeli (katalog roku, nazwa pliku)."""
+    return {ref: (year, data_file_name(ref)) for year, refs in files_by_year.items() for ref in refs}
+
+def merge_records(existing, new):
+    """Łączy rekordy (nowsza wersja pliku zastępuje starszą), sortuje wg daty wydania.
+
+    Zwraca (rekordy, czy_wystarczy_dopisać) - dopisanie na końcu pliku wystarcza, gdy żaden
+    rekord nie został zastąpiony, istniejący plik jest posortowany, a wszystkie nowe rekordy
+    są wydane nie wcześniej niż ostatni istniejący.
+    """
+    new_keys = {record_key(record) for record in new}
+    kept = [record for record in existing if record_key(record) not in new_keys]
+    new_sorted = sorted(new, key=issue_sort_key)
+    existing_keys = [issue_sort_key(record) for record in existing]
+    append_only = (len(kept) == len(existing) and
+                   all(a <= b for a, b in zip(existing_keys, existing_keys[1:])) and
+                   (not existing or not new_sorted or existing_keys[-1] <= issue_sort_key(new_sorted[0])))
+    if append_only:
+        return existing + new_sorted, True
+    return sorted(kept + new, key=issue_sort_key), False
+
+def save_to_csv(data, output_file, append=False):
+    """Zapisuje dane do pliku CSV (append=True - dopisuje wiersze bez nagłówka)"""
     if not data:
         print("Brak danych do zapisania")
         return
     
-    fieldnames = [
-        'rok', 'nazwa_pliku', 'data_wydania', 'godzina_wydania',
-        'biuro', 'numer_informacji', 'zjawisko', 'stopien_zagrozenia',
-        'waznosc_od_data', 'waznosc_od_godzina', 'waznosc_do_data', 'waznosc_do_godzina',
-        'obszar', 'prawdopodobienstwo', 'hydrolog'
-    ]
+    if append:
+        with open(output_file, 'a', newline='', encoding='utf-8') as csvfile:
+            csv.DictWriter(csvfile, fieldnames=FIELDNAMES).writerows(data)
+        print(f"Dopisano {len(data)} rekordów do pliku {output_file}")
+        return
     
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    # Zapis do pliku tymczasowego i podmiana - przerwany zapis nie psuje poprzedniej wersji
+    tmp_file = output_file + ".tmp"
+    with open(tmp_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
         writer.writeheader()
         writer.writerows(data)
+    os.replace(tmp_file, output_file)
     
     print(f"Zapisano {len(data)} rekordów do pliku {output_file}")
 
+def update_warnings_table(base_path, output_file, incremental=TRYB_PRZYROSTOWY):
+    """Przetwarza ostrzeżenia i zapisuje tabelę; zwraca wszystkie rekordy tabeli.
+
+    W trybie przyrostowym parsowane są tylko pliki, których etap nie przetworzył w obecnej
+    wersji (nazwa i sha256 w katalogu SQLite), a wynik jest dopisywany do istniejącego CSV.
+    """
+    if incremental and not os.path.exists(CATALOG_PATH):
+        print(f"Brak katalogu {CATALOG_PATH} - tryb przyrostowy niedostępny, pełne przetwarzanie.")
+        incremental = False
+    if incremental and not os.path.exists(output_file):
+        incremental = False # Nie ma do czego dopisywać
+    if incremental and csv_header(output_file) != FIELDNAMES:
+        print(f"Plik {output_file} ma inne kolumny niż obecna wersja - pełne przetwarzanie.")
+        incremental = False
+
+    ref_keys = ref_record_keys(warning_files_by_year(base_path))
+    all_refs = list(ref_keys)
+    skip_refs = processed_unchanged(ETAP_OSTRZEZENIA, all_refs) if incremental else set()
+    if incremental:
+        print(f"Tryb przyrostowy: {len(skip_refs)} plików bez zmian, {len(all_refs) - len(skip_refs)} do przetworzenia.")
+    new_data, succeeded_refs = process_hydro_directory(base_path, skip_refs=skip_refs)
+    if len(succeeded_refs) < len(all_refs) - len(skip_refs):
+        print(f"Nie udało się przetworzyć {len(all_refs) - len(skip_refs) - len(succeeded_refs)} plików - zostaną ponowione przy kolejnym uruchomieniu.")
+
+    existing = []
+    dropped = 0
+    if incremental:
+        # Wiersze plików przetwarzanych ponownie (zmienionych, także nieudanych) i plików, których już nie ma
+        unchanged_keys = {ref_keys[ref] for ref in skip_refs}
+        existing = load_existing_records(output_file)
+        kept = [record for record in existing if record_key(record) in unchanged_keys]
+        dropped = len(existing) - len(kept)
+        existing = kept
+    if incremental and not new_data and not dropped:
+        print("Brak nowych ostrzeżeń - plik wynikowy bez zmian.")
+        return existing
+    if dropped:
+        print(f"Usunięto {dropped} rekordów plików zmienionych lub usuniętych.")
+    all_data, append_only = merge_records(existing, new_data)
+    if incremental and append_only and not dropped:
+        save_to_csv(sorted(new_data, key=issue_sort_key), output_file, append=True)
+    else:
+        save_to_csv(all_data, output_file)
+    if os.path.exists(CATALOG_PATH):
+        # Tylko pliki przetworzone bez błędu - nieudane będą ponowione przy kolejnym uruchomieniu
+        mark_processed(ETAP_OSTRZEZENIA, sorted(succeeded_refs))
+    return all_data
+
+def save_warning_interval_index(records, output_file):
+    """Buduje i zapisuje indeks przedziałów ważności dla rekordów tabeli (w kolejności wierszy CSV)."""
+    index = build_interval_index(records)
+    index_path = interval_index_path(output_file)
+    save_interval_index(index, index_path)
+    print(f"Indeks przedziałów ważności: {len(index['wiersze'])} ostrzeżeń w {len(index['biura'])} grupach (biuro, zjawisko) -> {index_path}")
+
+def save_warning_area_tags(records, output_file, registry_path=REJESTR_STACJI_HYDRO):
+    """Przypisuje ostrzeżeniom powiaty i rzeki z pola "obszar" i zapisuje je do <nazwa>_obszary.csv."""
+    if not os.path.exists(registry_path):
+        print(f"Brak rejestru stacji {registry_path} (uruchom 13_czyszczenie_stacji_hydro.py) - pomijam przypisanie powiatów.")
+        return
+    matcher = build_area_matcher(load_station_registry(registry_path))
+    tagged = tag_warning_areas(records, matcher)
+    areas_file = os.path.splitext(output_file)[0] + "_obszary.csv"
+    save_warning_areas(records, tagged, areas_file)
+    with_powiat = sum(1 for powiaty, _ in tagged if powiaty)
+    print(f"Powiaty przypisano {with_powiat} z {len(records)} ostrzeżeń -> {areas_file}")
+
 # Główna część skryptu
 if __name__ == "__main__":
     base_path = r"c:\Users\barte\OneDrive\Pulpit\ModelBigData\pobrane_dane_imgw\ost_hydro"
     output_file = r"c:\Users\barte\OneDrive\Pulpit\ModelBigData\dane_hydrologiczne.csv"
     
     print("Rozpoczynam przetwarzanie plików hydrologicznych...")
-    hydro_data = process_hydro_directory(base_path)
+    hydro_data = update_warnings_table(base_path, output_file)
     
     if hydro_data:
-        save_to_csv(hydro_data, output_file)
-        print(f"Przetworzono łącznie {len(hydro_data)} plików")
+        print(f"Tabela ostrzeżeń zawiera łącznie {len(hydro_data)} rekordów")
+        save_warning_interval_index(hydro_data, output_file)
+        save_warning_area_tags(hydro_data, output_file)
         
         # Pokaż przykładowe statystyki
         zjawiska = {}
@@ -0,0 +1,10 @@
+from imgw_przetwarzanie import run_products
+from imgw_schematy import PRODUCT_SCHEMAS
+
+# Etapy 05-10 w jednym przebiegu po katalogu plików: wszystkie produkty z rejestru imgw_schematy
+# (kolejno codz, k_d, k_d_t, o_d, s_d, s_d_t); wyniki te same co z osobnych skryptów 05-10
+PRODUKTY = list(PRODUCT_SCHEMAS)
+
+# --- Główna część skryptu ---
+if __name__ == "__main__":
+    run_products(PRODUKTY)
\ No newline at end of file
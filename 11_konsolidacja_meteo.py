@@ -1,5 +1,5 @@
-import os
 import pandas as pd
+from imgw_partycje import read_processed, save_processed, processed_exists
 
 # --- Konfiguracja ---
 # Ścieżki do przetworzonych plików CSV
@@ -23,12 +23,13 @@ meteo_files_to_merge = [
 def load_processed_csv(file_path, label_for_log):
     """Wczytuje przetworzony plik CSV."""
     print(f"Wczytywanie: {file_path} ({label_for_log})...")
-    if not os.path.exists(file_path):
+    # Wynik etapu 05-10: magazyn partycji lat (imgw_partycje) albo jednolity CSV
+    if not processed_exists(file_path):
         print(f"  OSTRZEŻENIE: Plik {file_path} nie istnieje. Pomijanie.")
         return None
     try:
         # Ważne: 'Data' musi być sparsowana jako data, KodStacji jako string
-        df = pd.read_csv(file_path, encoding='utf-8-sig', parse_dates=['Data'], dtype={'KodStacji': str})
+        df = read_processed(file_path, parse_dates=['Data'], dtype={'KodStacji': str})
         print(f"  Wczytano {len(df)} wierszy.")
         return df
     except Exception as e:
@@ -106,9 +107,9 @@ if __name__ == "__main__":
         
         print("\nLiczba unikalnych Kodów Stacji:", merged_df['KodStacji'].nunique())
 
-    # Zapis do pliku CSV
+    # Zapis wyniku (magazyn partycji lat)
     try:
-        merged_df.to_csv(OUTPUT_METEO_SKONSOLIDOWANE, index=False, encoding='utf-8-sig')
-        print(f"\nSkonsolidowane dane meteorologiczne zapisano do: {OUTPUT_METEO_SKONSOLIDOWANE}")
+        output_dir = save_processed(merged_df, OUTPUT_METEO_SKONSOLIDOWANE) # Partycje lat (imgw_partycje); jednolity CSV tylko przy eksporcie
+        print(f"\nSkonsolidowane dane meteorologiczne zapisano do: {output_dir}")
     except Exception as e:
         print(f"Błąd podczas zapisywania pliku {OUTPUT_METEO_SKONSOLIDOWANE}: {e}")
\ No newline at end of file
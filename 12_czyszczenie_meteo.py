@@ -1,10 +1,11 @@
-import pandas as pd
 import numpy as np # Do użycia np.nan
+from imgw_partycje import read_processed, save_processed
 
 # --- Konfiguracja ---
 INPUT_METEO_SKONSOLIDOWANE = "dane_meteo_skonsolidowane.csv" # Wynik poprzedniego skryptu
 OUTPUT_METEO_STACJE_OCZYSZCZONE = "dane_meteo_stacje_oczyszczone.csv"
 
+# Kolumny źródłowe wymienione w tej konfiguracji wyznaczają, które pola plików wczytują etapy 06-10 (imgw_projekcja)
 # Definicja finalnych kolumn i hierarchii źródeł (kolumny z sufiksami)
 # Klucz: Nazwa finalnej kolumny
 # Wartość: Lista kolumn źródłowych w kolejności priorytetu (od najważniejszej)
@@ -32,15 +33,18 @@ SYNOP_SD_SPECIFIC_PARAMS = [
 ]
 # Parametry tylko z synop_sdt
 SYNOP_SDT_SPECIFIC_PARAMS = ["CPW_Srednie_hPa", "WODZ_SumaOpaduDzien_mm", "WONO_SumaOpaduNoc_mm"]
+# Źródła nazwy stacji w kolejności priorytetu
+NAZWA_STACJI_ZRODLA = ['NazwaStacji_synopSD', 'NazwaStacji_klimatKD', 'NazwaStacji_opadOD',
+                       'NazwaStacji_klimatKDT', 'NazwaStacji_synopSDT', 'NazwaStacji']
 
 
 if __name__ == "__main__":
     print(f"Wczytywanie skonsolidowanych danych meteorologicznych: {INPUT_METEO_SKONSOLIDOWANE}...")
     try:
-        df_merged = pd.read_csv(INPUT_METEO_SKONSOLIDOWANE, 
-                                parse_dates=['Data'], 
-                                dtype={'KodStacji': str},
-                                low_memory=False) # low_memory=False dla uniknięcia ostrzeżeń o typach
+        df_merged = read_processed(INPUT_METEO_SKONSOLIDOWANE, 
+                                   parse_dates=['Data'], 
+                                   dtype={'KodStacji': str},
+                                   low_memory=False) # low_memory=False dla uniknięcia ostrzeżeń o typach
         print(f"Wczytano {len(df_merged)} wierszy, {len(df_merged.columns)} kolumn.")
     except FileNotFoundError:
         print(f"BŁĄD: Plik {INPUT_METEO_SKONSOLIDOWANE} nie został znaleziony. Uruchom najpierw skrypt konsolidujący.")
@@ -88,10 +92,8 @@ if __name__ == "__main__":
 
     # Wybór jednej kolumny NazwaStacji
     # Priorytet: _synopSD, potem _klimatKD, potem _opadOD, potem _klimatKDT, potem _synopSDT, na końcu bez sufiksu
-    nazwa_stacji_sources = ['NazwaStacji_synopSD', 'NazwaStacji_klimatKD', 'NazwaStacji_opadOD', 
-                            'NazwaStacji_klimatKDT', 'NazwaStacji_synopSDT', 'NazwaStacji']
     df_final_stacje['NazwaStacji_Skonsolidowana'] = np.nan
-    for col_nazwa in nazwa_stacji_sources:
+    for col_nazwa in NAZWA_STACJI_ZRODLA:
         if col_nazwa in df_merged.columns:
             df_final_stacje['NazwaStacji_Skonsolidowana'] = df_final_stacje['NazwaStacji_Skonsolidowana'].combine_first(df_merged[col_nazwa])
     
@@ -108,7 +110,7 @@ if __name__ == "__main__":
     #print(df_final_stacje[[col for col in cols_to_show_final if col in df_final_stacje.columns]].head().to_string())
 
     try:
-        df_final_stacje.to_csv(OUTPUT_METEO_STACJE_OCZYSZCZONE, index=False, encoding='utf-8-sig')
-        print(f"\nOczyszczone dane meteorologiczne (stacje) zapisano do: {OUTPUT_METEO_STACJE_OCZYSZCZONE}")
+        output_dir = save_processed(df_final_stacje, OUTPUT_METEO_STACJE_OCZYSZCZONE)
+        print(f"\nOczyszczone dane meteorologiczne (stacje) zapisano do: {output_dir}")
     except Exception as e:
         print(f"Błąd podczas zapisywania pliku {OUTPUT_METEO_STACJE_OCZYSZCZONE}: {e}")
\ No newline at end of file
@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+from imgw_partycje import read_processed, save_processed
 
 # --- Konfiguracja ---
 INPUT_HYDRO_PRZETWORZONE = "przetworzone_dane_hydrologiczne.csv"
@@ -10,10 +11,11 @@ OUTPUT_HYDRO_STACJE_Z_POWIATAMI_FINAL = "dane_hydro_stacje_z_powiatami_final.csv
 if __name__ == "__main__":
     print(f"Wczytywanie przetworzonych danych hydrologicznych: {INPUT_HYDRO_PRZETWORZONE}...")
     try:
-        df_hydro = pd.read_csv(INPUT_HYDRO_PRZETWORZONE,
-                               parse_dates=['Data'],
-                               dtype={'KodStacji': str},
-                               low_memory=False)
+        # Magazyn partycji lat z 05 (imgw_partycje) albo jednolity CSV
+        df_hydro = read_processed(INPUT_HYDRO_PRZETWORZONE,
+                                  parse_dates=['Data'],
+                                  dtype={'KodStacji': str},
+                                  low_memory=False)
         print(f"Wczytano {len(df_hydro)} wierszy z danych hydrologicznych.")
     except FileNotFoundError:
         print(f"BŁĄD: Plik {INPUT_HYDRO_PRZETWORZONE} nie został znaleziony.")
@@ -145,7 +147,7 @@ if __name__ == "__main__":
     print(df_hydro_z_powiatami.head().to_string())
 
     try:
-        df_hydro_z_powiatami.to_csv(OUTPUT_HYDRO_STACJE_Z_POWIATAMI_FINAL, index=False, encoding='utf-8-sig')
-        print(f"\nDane hydrologiczne stacji z powiatami zapisano do: {OUTPUT_HYDRO_STACJE_Z_POWIATAMI_FINAL}")
+        output_dir = save_processed(df_hydro_z_powiatami, OUTPUT_HYDRO_STACJE_Z_POWIATAMI_FINAL)
+        print(f"\nDane hydrologiczne stacji z powiatami zapisano do: {output_dir}")
     except Exception as e:
         print(f"Błąd podczas zapisywania pliku {OUTPUT_HYDRO_STACJE_Z_POWIATAMI_FINAL}: {e}")
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import pandas as pd
+from imgw_partycje import read_processed, save_processed
 
 # --- Konfiguracja ---
 INPUT_METEO_STACJE_OCZYSZCZONE = "dane_meteo_stacje_oczyszczone.csv"
@@ -14,10 +15,10 @@ OUTPUT_METEO_STACJE_Z_POWIATAMI_FINAL = "dane_meteo_stacje_z_powiatami_final.csv
 if __name__ == "__main__":
     print(f"Wczytywanie oczyszczonych danych meteorologicznych ze stacji: {INPUT_METEO_STACJE_OCZYSZCZONE}...")
     try:
-        df_meteo_oczyszczone = pd.read_csv(INPUT_METEO_STACJE_OCZYSZCZONE,
-                                           parse_dates=['Data'],
-                                           dtype={'KodStacji': str},
-                                           low_memory=False)
+        df_meteo_oczyszczone = read_processed(INPUT_METEO_STACJE_OCZYSZCZONE,
+                                              parse_dates=['Data'],
+                                              dtype={'KodStacji': str},
+                                              low_memory=False)
         print(f"Wczytano {len(df_meteo_oczyszczone)} wierszy z danych oczyszczonych.")
     except FileNotFoundError:
         print(f"BŁĄD: Plik {INPUT_METEO_STACJE_OCZYSZCZONE} nie został znaleziony.")
@@ -112,8 +113,8 @@ if __name__ == "__main__":
     print(df_meteo_final[[col for col in cols_to_show if col in df_meteo_final.columns]].head().to_string())
 
     try:
-        df_meteo_final.to_csv(OUTPUT_METEO_STACJE_Z_POWIATAMI_FINAL, index=False, encoding='utf-8-sig')
-        print(f"\nDane meteorologiczne stacji z przypisanymi powiatami zapisano do: {OUTPUT_METEO_STACJE_Z_POWIATAMI_FINAL}")
+        output_dir = save_processed(df_meteo_final, OUTPUT_METEO_STACJE_Z_POWIATAMI_FINAL)
+        print(f"\nDane meteorologiczne stacji z przypisanymi powiatami zapisano do: {output_dir}")
     except Exception as e:
         print(f"Błąd podczas zapisywania pliku {OUTPUT_METEO_STACJE_Z_POWIATAMI_FINAL}: {e}")
         import traceback
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np # Dla np.nan
 import os
+from imgw_partycje import read_processed, save_processed
 
 # --- Konfiguracja ---
 INPUT_HYDRO_STACJE_Z_POWIATAMI_REDUCED = "dane_hydro_stacje_z_powiatami_redukcja.csv"
@@ -15,10 +16,10 @@ HYDRO_NUMERIC_COLS_TO_AGGREGATE = [
 if __name__ == "__main__":
     print(f"Wczytywanie zredukowanych danych hydrologicznych stacji z powiatami: {INPUT_HYDRO_STACJE_Z_POWIATAMI_REDUCED}...")
     try:
-        df_hydro_stacje = pd.read_csv(INPUT_HYDRO_STACJE_Z_POWIATAMI_REDUCED,
-                                      parse_dates=['Data'],
-                                      dtype={'KodStacji': str, 'Powiat': str, 'NazwaStacji': str},
-                                      low_memory=False)
+        df_hydro_stacje = read_processed(INPUT_HYDRO_STACJE_Z_POWIATAMI_REDUCED,
+                                         parse_dates=['Data'],
+                                         dtype={'KodStacji': str, 'Powiat': str, 'NazwaStacji': str},
+                                         low_memory=False)
         print(f"Wczytano {len(df_hydro_stacje)} wierszy.")
     except FileNotFoundError:
         print(f"BŁĄD: Plik {INPUT_HYDRO_STACJE_Z_POWIATAMI_REDUCED} nie został znaleziony.")
@@ -85,7 +86,7 @@ if __name__ == "__main__":
     print(df_hydro_powiat_dzien.head().to_string())
 
     try:
-        df_hydro_powiat_dzien.to_csv(OUTPUT_HYDRO_POWIAT_DZIEN, index=False, encoding='utf-8-sig')
-        print(f"\nZagregowane dane hydrologiczne (powiat-dzień) zapisano do: {OUTPUT_HYDRO_POWIAT_DZIEN}")
+        output_dir = save_processed(df_hydro_powiat_dzien, OUTPUT_HYDRO_POWIAT_DZIEN)
+        print(f"\nZagregowane dane hydrologiczne (powiat-dzień) zapisano do: {output_dir}")
     except Exception as e:
         print(f"Błąd podczas zapisywania pliku {OUTPUT_HYDRO_POWIAT_DZIEN}: {e}")
\ No newline at end of file
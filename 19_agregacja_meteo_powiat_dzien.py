@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from imgw_partycje import read_processed, save_processed
 
 # --- Konfiguracja ---
 INPUT_METEO_STACJE_Z_POWIATAMI = "dane_meteo_stacje_z_powiatami_final.csv"
@@ -8,10 +9,10 @@ OUTPUT_METEO_POWIAT_DZIEN = "dane_meteo_powiat_dzien.csv"
 if __name__ == "__main__":
     print(f"Wczytywanie danych meteorologicznych stacji z powiatami: {INPUT_METEO_STACJE_Z_POWIATAMI}...")
     try:
-        df_meteo_stacje = pd.read_csv(INPUT_METEO_STACJE_Z_POWIATAMI,
-                                      parse_dates=['Data'],
-                                      dtype={'KodStacji': str, 'Powiat': str},
-                                      low_memory=False)
+        df_meteo_stacje = read_processed(INPUT_METEO_STACJE_Z_POWIATAMI,
+                                         parse_dates=['Data'],
+                                         dtype={'KodStacji': str, 'Powiat': str},
+                                         low_memory=False)
         print(f"Wczytano {len(df_meteo_stacje)} wierszy.")
     except FileNotFoundError:
         print(f"BŁĄD: Plik {INPUT_METEO_STACJE_Z_POWIATAMI} nie został znaleziony.")
@@ -104,7 +105,7 @@ if __name__ == "__main__":
     print(df_meteo_powiat_dzien.head().to_string())
 
     try:
-        df_meteo_powiat_dzien.to_csv(OUTPUT_METEO_POWIAT_DZIEN, index=False, encoding='utf-8-sig')
-        print(f"\nZagregowane dane meteorologiczne (powiat-dzień) zapisano do: {OUTPUT_METEO_POWIAT_DZIEN}")
+        output_dir = save_processed(df_meteo_powiat_dzien, OUTPUT_METEO_POWIAT_DZIEN)
+        print(f"\nZagregowane dane meteorologiczne (powiat-dzień) zapisano do: {output_dir}")
     except Exception as e:
         print(f"Błąd podczas zapisywania pliku {OUTPUT_METEO_POWIAT_DZIEN}: {e}")
\ No newline at end of file
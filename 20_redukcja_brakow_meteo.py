@@ -1,5 +1,5 @@
-import pandas as pd
 import numpy as np
+from imgw_partycje import read_processed, save_processed
 
 # --- Konfiguracja ---
 INPUT_METEO_POWIAT_DZIEN = "dane_meteo_powiat_dzien.csv"
@@ -9,10 +9,10 @@ THRESHOLD_MISSING_PERCENT = 70.0 # Próg procentowy braków do usunięcia kolumn
 if __name__ == "__main__":
     print(f"Wczytywanie zagregowanych danych meteorologicznych: {INPUT_METEO_POWIAT_DZIEN}...")
     try:
-        df_meteo_powiat = pd.read_csv(INPUT_METEO_POWIAT_DZIEN,
-                                      parse_dates=['Data'],
-                                      dtype={'Powiat': str},
-                                      low_memory=False)
+        df_meteo_powiat = read_processed(INPUT_METEO_POWIAT_DZIEN,
+                                         parse_dates=['Data'],
+                                         dtype={'Powiat': str},
+                                         low_memory=False)
         print(f"Wczytano {len(df_meteo_powiat)} wierszy i {len(df_meteo_powiat.columns)} kolumn.")
     except FileNotFoundError:
         print(f"BŁĄD: Plik {INPUT_METEO_POWIAT_DZIEN} nie został znaleziony.")
@@ -55,7 +55,7 @@ if __name__ == "__main__":
     print(df_meteo_powiat_reduced.iloc[:, :min(10, len(df_meteo_powiat_reduced.columns))].head().to_string())
 
     try:
-        df_meteo_powiat_reduced.to_csv(OUTPUT_METEO_POWIAT_DZIEN_REDUCED, index=False, encoding='utf-8-sig')
-        print(f"\nDane meteorologiczne po redukcji kolumn zapisano do: {OUTPUT_METEO_POWIAT_DZIEN_REDUCED}")
+        output_dir = save_processed(df_meteo_powiat_reduced, OUTPUT_METEO_POWIAT_DZIEN_REDUCED)
+        print(f"\nDane meteorologiczne po redukcji kolumn zapisano do: {output_dir}")
     except Exception as e:
         print(f"Błąd podczas zapisywania pliku {OUTPUT_METEO_POWIAT_DZIEN_REDUCED}: {e}")
\ No newline at end of file
@@ -2,6 +2,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from imgw_partycje import read_processed, processed_exists
 
 # --- Konfiguracja ---
 # Lista plików do analizy kompletności danych
@@ -59,22 +60,18 @@ def plot_completeness(df, title, output_image_filename):
 if __name__ == "__main__":
     for title, filename in FILES_TO_ANALYZE.items():
         print(f"\nAnalizowanie pliku: {filename} ({title})")
-        if not os.path.exists(filename):
+        if not processed_exists(filename): # Magazyn partycji lat (imgw_partycje) albo jednolity CSV
             print(f"  BŁĄD: Plik {filename} nie został znaleziony.")
             continue
         
         try:
-            # Założenie o typach kluczowych kolumn dla spójności
-            dtype_spec = {}
-            if "Powiat" in pd.read_csv(filename, nrows=0).columns: # Sprawdź czy kolumna istnieje
-                dtype_spec['Powiat'] = str
-            if "KodStacji" in pd.read_csv(filename, nrows=0).columns:
-                dtype_spec['KodStacji'] = str
+            # Założenie o typach kluczowych kolumn dla spójności (dotyczy odczytu CSV; brakujące kolumny są pomijane)
+            dtype_spec = {'Powiat': str, 'KodStacji': str}
 
-            df_to_analyze = pd.read_csv(filename,
-                                        parse_dates=['Data'],
-                                        dtype=dtype_spec if dtype_spec else None,
-                                        low_memory=False)
+            df_to_analyze = read_processed(filename,
+                                           parse_dates=['Data'],
+                                           dtype=dtype_spec,
+                                           low_memory=False)
             print(f"  Wczytano {len(df_to_analyze)} wierszy.")
             
             # Generowanie unikalnej nazwy pliku dla wykresu
@@ -0,0 +1,28 @@
+import os
+from imgw_partycje import export_csv, partition_dir
+from imgw_schematy import PRODUCT_SCHEMAS
+
+# --- Konfiguracja ---
+# Wyniki etapów zapisywane w magazynie partycji (imgw_partycje) - eksportowane do jednolitych CSV (utf-8-sig)
+ARTEFAKTY_DO_EKSPORTU = [schema["plik_wynikowy"] for schema in PRODUCT_SCHEMAS.values()] + [
+    "dane_meteo_skonsolidowane.csv",             # 11
+    "dane_meteo_stacje_oczyszczone.csv",         # 12
+    "dane_hydro_stacje_z_powiatami_final.csv",   # 16
+    "dane_meteo_stacje_z_powiatami_final.csv",   # 17
+    "dane_hydro_powiat_dzien.csv",               # 18
+    "dane_meteo_powiat_dzien.csv",               # 19
+    "dane_meteo_powiat_dzien_redukcja_brakow.csv" # 20
+]
+
+# --- Główna część skryptu ---
+if __name__ == "__main__":
+    for output_file in ARTEFAKTY_DO_EKSPORTU:
+        directory = partition_dir(output_file)
+        if not os.path.isdir(directory):
+            print(f"Pominięto {output_file}: brak magazynu partycji {directory}.")
+            continue
+        try:
+            rows = export_csv(output_file)
+            print(f"Wyeksportowano {rows} wierszy z {directory} do: {output_file}")
+        except Exception as e:
+            print(f"Błąd podczas eksportu {directory} do {output_file}: {e}")
\ No newline at end of file
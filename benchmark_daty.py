@@ -0,0 +1,75 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from imgw_daty import calendar_dates
+from imgw_katalog import catalog_files
+from imgw_rozpoznawanie import read_csv_sniffed
+
+# --- Konfiguracja ---
+# Katalog danych hydro - mierzony jest pierwszy plik codz_*; gdy brak plików - dane syntetyczne o tej samej postaci
+ROOT_HYDRO_DATA_DIR = os.path.join("pobrane_dane_imgw", "hydro", "dobowe_pomiarowe")
+LICZBA_WIERSZY = 3_000_000 # Ile wierszy danych syntetycznych (lub powieleń pliku) mierzyć
+ZIARNO_LOSOWANIA = 0
+
+def load_date_columns():
+    """Kolumny RokHydrologiczny, MiesiacKalendarzowy, Dzien jako napisy (jak po read_csv z dtype=str w 05)."""
+    hydro_files = catalog_files(ROOT_HYDRO_DATA_DIR, "codz") if os.path.isdir(ROOT_HYDRO_DATA_DIR) else []
+    df = None
+    if hydro_files:
+        df, _ = read_csv_sniffed(hydro_files[0], expected_fields=10, separators=[';', ','],
+                                 usecols=[3, 5, 9], dtype=str) # read_csv_sniffed czyta bez nagłówka
+    if df is not None:
+        df.columns = ["RokHydrologiczny", "Dzien", "MiesiacKalendarzowy"] # Kolejność jak w pliku (kolumny 3, 5, 9)
+        source = f"{hydro_files[0]} powielony"
+    else:
+        rng = np.random.default_rng(ZIARNO_LOSOWANIA)
+        df = pd.DataFrame({
+            "RokHydrologiczny": rng.integers(1951, 2024, LICZBA_WIERSZY).astype(str),
+            "MiesiacKalendarzowy": rng.integers(1, 13, LICZBA_WIERSZY).astype(str),
+            "Dzien": rng.integers(1, 32, LICZBA_WIERSZY).astype(str), # Także nieistniejące dni (31 IV)
+        }).astype(object)
+        source = "dane syntetyczne"
+    if len(df) < LICZBA_WIERSZY:
+        df = pd.concat([df] * -(-LICZBA_WIERSZY // len(df)), ignore_index=True)
+    return df.iloc[:LICZBA_WIERSZY].reset_index(drop=True), source
+
+def determine_calendar_year(row):
+    """Poprzednia wersja z 05 (df.apply wiersz po wierszu)."""
+    try:
+        miesiac_kal = int(row['MiesiacKalendarzowy'])
+        rok_hydro = int(row['RokHydrologiczny'])
+        return rok_hydro - 1 if miesiac_kal in [11, 12] else rok_hydro
+    except (ValueError, TypeError):
+        return pd.NA
+
+def dates_legacy(df):
+    """Poprzednia wersja: rok kalendarzowy przez apply, potem sklejanie napisów i pd.to_datetime."""
+    df = df.copy()
+    df['RokKalendarzowy'] = df.apply(determine_calendar_year, axis=1)
+    valid = df[['RokKalendarzowy', 'MiesiacKalendarzowy', 'Dzien']].notna().all(axis=1)
+    df.loc[valid, "Data"] = pd.to_datetime(
+        df.loc[valid, "RokKalendarzowy"].astype(str) + '-' +
+        df.loc[valid, "MiesiacKalendarzowy"].astype(str) + '-' +
+        df.loc[valid, "Dzien"].astype(str),
+        format='%Y-%m-%d', errors='coerce')
+    df.loc[~valid, "Data"] = pd.NaT
+    return df["Data"]
+
+# --- Główna część skryptu ---
+if __name__ == "__main__":
+    df, source = load_date_columns()
+    print(f"{len(df)} wierszy ({source}):")
+
+    start = time.perf_counter()
+    legacy = dates_legacy(df)
+    legacy_time = time.perf_counter() - start
+    print(f"  apply + sklejanie napisów + pd.to_datetime: {legacy_time:.2f} s")
+
+    start = time.perf_counter()
+    current = calendar_dates(df["RokHydrologiczny"], df["MiesiacKalendarzowy"], df["Dzien"], hydrological_year=True)
+    current_time = time.perf_counter() - start
+    print(f"  imgw_daty.calendar_dates: {current_time:.2f} s ({legacy_time / max(current_time, 1e-9):.0f}x)")
+
+    same = (legacy.isna() == current.isna()).all() and (legacy[legacy.notna()] == current[current.notna()]).all()
+    print(f"  Wyniki identyczne: {same} (NaT: {current.isna().sum()})")
\ No newline at end of file
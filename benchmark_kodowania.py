@@ -0,0 +1,73 @@
+import os
+import time
+import codecs
+from collections import Counter
+from imgw_archiwa import iter_data_file_contents
+from imgw_rozpoznawanie import detect_encoding_bytes
+
+try:
+    import chardet # Tylko do porównania; sam potok go nie potrzebuje
+except ImportError:
+    chardet = None
+
+# --- Konfiguracja ---
+ROOT_DATA_DIR = "pobrane_dane_imgw"
+# Wielkość próbki - tyle samo, ile czytał dawny detect_encoding z chardet w 02
+BENCHMARK_SAMPLE_BYTES = 10000
+# Ile przykładowych rozbieżności wypisać
+MAX_ROZBIEZNOSCI_DO_WYPISANIA = 20
+
+def normalize_encoding_name(name):
+    """Ujednolica nazwę kodowania (np. 'windows-1250' -> 'cp1250', 'ascii' -> 'utf-8')."""
+    if not name:
+        return "brak"
+    try:
+        normalized = codecs.lookup(name).name
+    except LookupError:
+        return name.lower()
+    aliases = {"ascii": "utf-8", "iso8859-2": "iso-8859-2", "iso8859-1": "latin1", "latin-1": "latin1"}
+    return aliases.get(normalized, normalized)
+
+def collect_samples(root_dir):
+    """Zbiera próbki (odwołanie, bajty) ze wszystkich plików CSV/TXT korpusu."""
+    samples = []
+    for file_ref, raw_bytes in iter_data_file_contents(root_dir, lambda name: name.lower().endswith((".csv", ".txt"))):
+        samples.append((file_ref, raw_bytes[:BENCHMARK_SAMPLE_BYTES]))
+    return samples
+
+def time_detector(detector, samples):
+    """Zwraca (wyniki, czas_s) dla detektora wywołanego na każdej próbce."""
+    start = time.perf_counter()
+    results = [detector(raw_bytes) for _, raw_bytes in samples]
+    return results, time.perf_counter() - start
+
+# --- Główna część skryptu ---
+if __name__ == "__main__":
+    if not os.path.isdir(ROOT_DATA_DIR):
+        print(f"Błąd: Główny katalog danych '{ROOT_DATA_DIR}' nie istnieje.")
+    else:
+        print(f"Zbieranie próbek ({BENCHMARK_SAMPLE_BYTES} B) z plików w {ROOT_DATA_DIR}...")
+        samples = collect_samples(ROOT_DATA_DIR)
+        print(f"Zebrano {len(samples)} próbek.")
+
+        own_results, own_time = time_detector(
+            lambda raw_bytes: detect_encoding_bytes(raw_bytes, is_truncated=True), samples)
+        print(f"\nimgw_rozpoznawanie: {own_time:.3f} s ({len(samples) / max(own_time, 1e-9):.0f} plików/s)")
+        for encoding, count in Counter(own_results).most_common():
+            print(f"  {encoding}: {count}")
+
+        if chardet is None:
+            print("\nBiblioteka chardet nie jest zainstalowana - pomijam porównanie.")
+        else:
+            chardet_results, chardet_time = time_detector(
+                lambda raw_bytes: normalize_encoding_name(chardet.detect(raw_bytes)['encoding']), samples)
+            print(f"\nchardet: {chardet_time:.3f} s ({len(samples) / max(chardet_time, 1e-9):.0f} plików/s)")
+            for encoding, count in Counter(chardet_results).most_common():
+                print(f"  {encoding}: {count}")
+            print(f"\nPrzyspieszenie: {chardet_time / max(own_time, 1e-9):.1f}x")
+
+            disagreements = [(file_ref, own, other) for (file_ref, _), own, other
+                             in zip(samples, own_results, chardet_results) if own != other]
+            print(f"Zgodność: {len(samples) - len(disagreements)}/{len(samples)} plików")
+            for file_ref, own, other in disagreements[:MAX_ROZBIEZNOSCI_DO_WYPISANIA]:
+                print(f"  {file_ref}: imgw_rozpoznawanie={own}, chardet={other}")
\ No newline at end of file
@@ -0,0 +1,61 @@
+import os
+import time
+import shutil
+import tempfile
+import pandas as pd
+import imgw_partycje
+from imgw_partycje import save_processed, read_processed, partition_dir
+from imgw_przetwarzanie import process_product
+
+# --- Konfiguracja ---
+# Wynik tego produktu (05-10) jest powielany do LICZBA_WIERSZY i zapisywany oboma sposobami;
+# powielone wiersze kompresują się lepiej niż prawdziwe dane, więc rozmiar Parquet jest tu zaniżony
+PRODUKT = "s_d"
+LICZBA_WIERSZY = 1_000_000
+
+def directory_size(path):
+    """Łączny rozmiar plików (bajty) - pliku albo katalogu partycji."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+def measure(label, write, read, path):
+    """Czas zapisu (gdy write nie jest None) i odczytu oraz rozmiar na dysku."""
+    write_info = "zapis -"
+    if write is not None:
+        start = time.perf_counter()
+        write()
+        write_info = f"zapis {time.perf_counter() - start:.2f} s"
+    start = time.perf_counter()
+    df = read()
+    read_time = time.perf_counter() - start
+    print(f"  {label}: {write_info}, odczyt {read_time:.2f} s, {directory_size(path) / 2**20:.1f} MB")
+    return df
+
+# --- Główna część skryptu ---
+if __name__ == "__main__":
+    df = process_product(PRODUKT, max_workers=1)
+    if df is None:
+        print(f"Błąd: Brak danych produktu {PRODUKT}.")
+    else:
+        df = pd.concat([df] * -(-LICZBA_WIERSZY // len(df)), ignore_index=True).iloc[:LICZBA_WIERSZY]
+        work_dir = tempfile.mkdtemp()
+        output_file = os.path.join(work_dir, "przetworzone_dane_test.csv")
+        try:
+            print(f"\n{len(df)} wierszy, {len(df.columns)} kolumn ({PRODUKT}):")
+            measure("CSV (to_csv utf-8-sig / read_csv parse_dates)",
+                    lambda: df.to_csv(output_file, index=False, encoding='utf-8-sig'),
+                    lambda: pd.read_csv(output_file, encoding='utf-8-sig', parse_dates=['Data'],
+                                        dtype={'KodStacji': str}, low_memory=False),
+                    output_file)
+            os.remove(output_file)
+            measure(f"Parquet ({imgw_partycje.KOMPRESJA_PARQUET}, partycje lat)",
+                    lambda: save_processed(df, output_file, export=False),
+                    lambda: read_processed(output_file),
+                    partition_dir(output_file))
+            measure("Parquet, tylko 3 kolumny",
+                    None,
+                    lambda: read_processed(output_file, columns=["Data", "KodStacji", "TMAX_C"]),
+                    partition_dir(output_file))
+        finally:
+            shutil.rmtree(work_dir)
\ No newline at end of file
@@ -0,0 +1,75 @@
+import os
+import re
+import time
+import importlib
+from imgw_archiwa import iter_file_contents, data_file_name
+from imgw_katalog import catalog_files
+
+# Moduł etapu 04 (nazwa zaczyna się od cyfry, więc import przez importlib)
+ostrzezenia = importlib.import_module("04_przetwarzanie_ostrzezen_hydro")
+
+# --- Konfiguracja ---
+ROOT_OST_HYDRO_DIR = os.path.join("pobrane_dane_imgw", "ost_hydro")
+
+def extract_hydro_data_legacy(file_path, raw_content):
+    """Poprzednia wersja ekstrakcji (9 osobnych re.search na wzorcach ze stringów) - punkt odniesienia."""
+    content = raw_content.decode('utf-8', errors='ignore')
+    data_match = re.search(r'Data i godzina wydania:\s*(\d{2}\.\d{2}\.\d{4})\s*-\s*godz\.\s*(\d{2}:\d{2})', content)
+    biuro_match = re.search(r'Nazwa biura prognoz hydrologicznych:\s*(.+?)(?:\n|$)', content)
+    numer_match = re.search(r'INFORMACJA O NIEBEZPIECZNYM ZJAWISKU Nr\s*([^:\n]+)', content)
+    zjawisko_match = re.search(r'Zjawisko:\s*(.+?)(?:\n|$)', content)
+    stopien_match = re.search(r'Stopień zagrożenia:\s*(\d+)', content)
+    waznosc_match = re.search(r'Ważność:\s*od godz\.\s*(\d{2}:\d{2})\s*dnia\s*(\d{2}\.\d{2}\.\d{4})\s*do godz\.\s*(\d{2}:\d{2})\s*dnia\s*(\d{2}\.\d{2}\.\d{4})', content)
+    obszar_match = re.search(r'Obszar:\s*(.+?)(?:\n|Przebieg:)', content, re.DOTALL)
+    prawdopodobienstwo_match = re.search(r'Prawdopodobieństwo wystąpienia zjawiska:\s*(\d+)%', content)
+    hydrolog_match = re.search(r'Dyżurny synoptyk hydrolog:\s*(.+?)(?:\n|$)', content)
+    return {
+        'nazwa_pliku': data_file_name(file_path),
+        'data_wydania': data_match.group(1) if data_match else '',
+        'godzina_wydania': data_match.group(2) if data_match else '',
+        'biuro': biuro_match.group(1).strip() if biuro_match else '',
+        'numer_informacji': numer_match.group(1).strip() if numer_match else '',
+        'zjawisko': zjawisko_match.group(1).strip() if zjawisko_match else '',
+        'stopien_zagrozenia': int(stopien_match.group(1)) if stopien_match else '',
+        'waznosc_od_godzina': waznosc_match.group(1) if waznosc_match else '',
+        'waznosc_od_data': waznosc_match.group(2) if waznosc_match else '',
+        'waznosc_do_godzina': waznosc_match.group(3) if waznosc_match else '',
+        'waznosc_do_data': waznosc_match.group(4) if waznosc_match else '',
+        'obszar': obszar_match.group(1).strip().replace('\n', ' ') if obszar_match else '',
+        'prawdopodobienstwo': int(prawdopodobienstwo_match.group(1)) if prawdopodobienstwo_match else '',
+        'hydrolog': hydrolog_match.group(1).strip() if hydrolog_match else ''
+    }
+
+def report(label, seconds, file_count, reference_seconds=None):
+    speedup = f", {reference_seconds / max(seconds, 1e-9):.1f}x" if reference_seconds else ""
+    print(f"  {label}: {seconds:.3f} s ({file_count / max(seconds, 1e-9):.0f} plików/s{speedup})")
+
+# --- Główna część skryptu ---
+if __name__ == "__main__":
+    if not os.path.isdir(ROOT_OST_HYDRO_DIR):
+        print(f"Błąd: Katalog '{ROOT_OST_HYDRO_DIR}' nie istnieje.")
+    else:
+        print("Wczytywanie plików ostrzeżeń do pamięci...")
+        contents = list(iter_file_contents(catalog_files(ROOT_OST_HYDRO_DIR, "ost_hydro")))
+        print(f"Wczytano {len(contents)} plików. Samo parsowanie (bez odczytu z dysku):")
+
+        start = time.perf_counter()
+        legacy_results = [extract_hydro_data_legacy(file_ref, raw) for file_ref, raw in contents]
+        legacy_time = time.perf_counter() - start
+        report("9 x re.search (poprzednio)", legacy_time, len(contents))
+
+        start = time.perf_counter()
+        current_results = [ostrzezenia.extract_hydro_data(file_ref, raw) for file_ref, raw in contents]
+        report("jeden skan wzorcem łączonym (obecnie)", time.perf_counter() - start, len(contents), legacy_time)
+        # Porównanie na polach poprzedniej wersji (obecna dodaje kolumny waznosc_od/waznosc_do)
+        current_common = [{name: result[name] for name in legacy} for result, legacy in zip(current_results, legacy_results)]
+        print(f"  Wyniki identyczne z poprzednią wersją: {current_common == legacy_results}")
+
+        print("\nCały etap 04 (odczyt archiwów + parsowanie):")
+        start = time.perf_counter()
+        serial_results, _ = ostrzezenia.process_hydro_directory(ROOT_OST_HYDRO_DIR, max_workers=1)
+        serial_time = time.perf_counter() - start
+        report("1 proces", serial_time, len(serial_results))
+        start = time.perf_counter()
+        pool_results, _ = ostrzezenia.process_hydro_directory(ROOT_OST_HYDRO_DIR)
+        report(f"pula {ostrzezenia.LICZBA_PROCESOW_PARSOWANIA} procesów", time.perf_counter() - start, len(pool_results), serial_time)
\ No newline at end of file
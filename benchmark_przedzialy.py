@@ -0,0 +1,57 @@
+import os
+import random
+import time
+import importlib
+from datetime import datetime
+from imgw_przedzialy import load_interval_index, interval_index_path, active_warnings
+
+# Moduł etapu 04 (nazwa zaczyna się od cyfry, więc import przez importlib)
+ostrzezenia = importlib.import_module("04_przetwarzanie_ostrzezen_hydro")
+
+# --- Konfiguracja ---
+WARNINGS_CSV = "dane_hydrologiczne.csv" # Tabela ostrzeżeń z etapu 04 (obok niej indeks _przedzialy.npz)
+LICZBA_ZAPYTAN = 100 # Przegląd tabeli parsuje daty przy każdym zapytaniu, więc jest wolny
+ZIARNO_LOSOWANIA = 0
+
+def active_warnings_scan(records, moment, biuro=None):
+    """Dotychczasowy sposób: przegląd całej tabeli z parsowaniem dat i godzin z tekstu.
+
+    Początek i koniec liczone tak jak w etapie 04 (warning_datetime, 24:00 -> północ dnia następnego),
+    żeby oba sposoby odpowiadały na to samo pytanie.
+    """
+    found = []
+    for row, record in enumerate(records):
+        if biuro is not None and record['biuro'] != biuro:
+            continue
+        start = ostrzezenia.warning_datetime(record['waznosc_od_data'], record['waznosc_od_godzina'])
+        end = ostrzezenia.warning_datetime(record['waznosc_do_data'], record['waznosc_do_godzina'])
+        if not (start and end):
+            continue # Brak okresu ważności
+        if datetime.strptime(start, '%Y-%m-%d %H:%M') <= moment <= datetime.strptime(end, '%Y-%m-%d %H:%M'):
+            found.append(row)
+    return found
+
+# --- Główna część skryptu ---
+if __name__ == "__main__":
+    index_path = interval_index_path(WARNINGS_CSV)
+    if not (os.path.exists(WARNINGS_CSV) and os.path.exists(index_path)):
+        print(f"Błąd: Brak '{WARNINGS_CSV}' lub '{index_path}'. Uruchom najpierw 04_przetwarzanie_ostrzezen_hydro.py.")
+    else:
+        records = ostrzezenia.load_existing_records(WARNINGS_CSV)
+        index = load_interval_index(index_path)
+        random.seed(ZIARNO_LOSOWANIA)
+        queries = [(datetime.strptime(record['waznosc_od'], '%Y-%m-%d %H:%M'), random.choice([None, record['biuro']]))
+                   for record in random.choices(records, k=LICZBA_ZAPYTAN) if record['waznosc_od']]
+        print(f"{len(records)} ostrzeżeń, {len(queries)} zapytań \"które ostrzeżenia były ważne w chwili X (w biurze Y)\":")
+
+        start = time.perf_counter()
+        index_results = [list(active_warnings(index, moment, biuro)) for moment, biuro in queries]
+        index_time = time.perf_counter() - start
+        start = time.perf_counter()
+        scan_results = [active_warnings_scan(records, moment, biuro) for moment, biuro in queries]
+        scan_time = time.perf_counter() - start
+
+        print(f"  przegląd tabeli: {scan_time / max(len(queries), 1) * 1000:.3f} ms/zapytanie")
+        print(f"  indeks przedziałów: {index_time / max(len(queries), 1) * 1000:.3f} ms/zapytanie "
+              f"({scan_time / max(index_time, 1e-9):.0f}x)")
+        print(f"  Wyniki zgodne: {index_results == scan_results}")
\ No newline at end of file
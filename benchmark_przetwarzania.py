@@ -0,0 +1,49 @@
+import sys
+import time
+import pickle
+import pyarrow as pa
+import imgw_przetwarzanie
+from imgw_przetwarzanie import process_product, process_product_file, product_files, projected_columns, LICZBA_PROCESOW_PRZETWARZANIA
+
+# --- Konfiguracja ---
+PRODUKT = sys.argv[1] if len(sys.argv) > 1 else "s_d" # Produkt z imgw_schematy.PRODUCT_SCHEMAS
+LICZBY_PROCESOW = sorted({1, 2, LICZBA_PROCESOW_PRZETWARZANIA}) # 1 - przetwarzanie sekwencyjne
+
+def transport_sizes(product, file_paths):
+    """Łączny rozmiar wyników przesyłanych z procesów: pikle ramek pandas vs pikle tabel Arrow (bajty).
+
+    Tabela Arrow liczona zawsze (także gdy _to_transport zostawiłby ramkę, bo nie ma kolumn object).
+    """
+    pandas_bytes = arrow_bytes = 0
+    columns = projected_columns(product)
+    for f_path in file_paths:
+        df = process_product_file(product, f_path, columns)
+        if df is not None:
+            pandas_bytes += len(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+            arrow_bytes += len(pickle.dumps(pa.Table.from_pandas(df, preserve_index=False), protocol=pickle.HIGHEST_PROTOCOL))
+    return pandas_bytes, arrow_bytes
+
+# --- Główna część skryptu ---
+if __name__ == "__main__":
+    files = sorted(product_files(PRODUKT))
+    if not files:
+        print(f"Błąd: Brak plików produktu {PRODUKT} w katalogu.")
+    else:
+        imgw_przetwarzanie.MIN_PLIKOW_DLA_PULI = 2 # Pula także dla małego korpusu testowego
+        timings, identical = {}, {}
+        reference_csv = None
+        for workers in LICZBY_PROCESOW:
+            start = time.perf_counter()
+            final_df = process_product(PRODUKT, max_workers=workers)
+            timings[workers] = time.perf_counter() - start
+            result_csv = final_df.to_csv(index=False)
+            reference_csv = reference_csv or result_csv
+            identical[workers] = result_csv == reference_csv
+
+        pandas_bytes, arrow_bytes = transport_sizes(PRODUKT, files)
+        print(f"\n{len(files)} plików {PRODUKT}, rdzeni: {LICZBA_PROCESOW_PRZETWARZANIA}")
+        for workers, elapsed in timings.items():
+            print(f"  {workers} proc.: {elapsed:.2f} s ({timings[1] / max(elapsed, 1e-9):.2f}x), "
+                  f"wynik identyczny z sekwencyjnym: {identical[workers]}")
+        print(f"  Wyniki do przesłania: ramki pandas {pandas_bytes / 2**20:.1f} MB, "
+              f"tabele Arrow {arrow_bytes / 2**20:.1f} MB ({pandas_bytes / max(arrow_bytes, 1):.1f}x)")
\ No newline at end of file
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from imgw_archiwa import read_data_bytes
+from imgw_katalog import catalog_files
+from imgw_rozpoznawanie import read_csv_sniffed, read_csv_typed
+
+from imgw_schematy import PRODUCT_SCHEMAS, status_columns
+
+try:
+    import resource # Tylko Unix; bez niego (Windows) benchmark mierzy sam czas
+except ImportError:
+    resource = None
+
+# Schemat produktu s_d (etap 09)
+SYNOP_SD = PRODUCT_SCHEMAS["s_d"]
+SYNOP_SD_COLUMN_NAMES = SYNOP_SD["kolumny"]
+SYNOP_SD_TEXT_COLUMNS = SYNOP_SD["kolumny_tekstowe"]
+SYNOP_SD_STATUS_COLUMNS = status_columns(SYNOP_SD)
+
+# --- Konfiguracja ---
+ROOT_METEO_SYNOP_DIR = os.path.join("pobrane_dane_imgw", "meteo", "dobowe", "synop")
+LICZBA_WIERSZY = 500_000 # Do tylu wierszy powielany jest pierwszy plik s_d (65 kolumn)
+
+def read_legacy(file_path):
+    """Poprzednia wersja: wszystko jako str, potem strip, zamiana przecinków i pd.to_numeric kolumna po kolumnie."""
+    df, _ = read_csv_sniffed(file_path, expected_fields=len(SYNOP_SD_COLUMN_NAMES),
+                             names=SYNOP_SD_COLUMN_NAMES, dtype=str)
+    for col in SYNOP_SD_TEXT_COLUMNS:
+        df[col] = df[col].astype(str).str.strip()
+    for col in SYNOP_SD_COLUMN_NAMES:
+        if col not in SYNOP_SD_TEXT_COLUMNS and col not in SYNOP_SD_STATUS_COLUMNS:
+            df[col] = pd.to_numeric(df[col].str.replace(',', '.', regex=False), errors='coerce')
+    return df
+
+def read_typed(file_path):
+    """Obecna wersja: typy kolumn ustalone przy odczycie (read_csv_typed)."""
+    df, _ = read_csv_typed(file_path, SYNOP_SD_COLUMN_NAMES,
+                           text_columns=SYNOP_SD_TEXT_COLUMNS,
+                           status_columns=SYNOP_SD_STATUS_COLUMNS)
+    for col in SYNOP_SD_TEXT_COLUMNS:
+        df[col] = df[col].astype(str).str.strip()
+    return df
+
+def peak_rss_mb():
+    """Szczytowy RSS procesu w MB albo None, gdy moduł resource niedostępny."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: macOS podaje bajty, Linux i pozostałe systemy Unix - KB
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+def measure(reader_name, file_path):
+    """Uruchamiane w osobnym procesie: (wynik jako CSV, czas_s, przyrost szczytowego RSS w MB albo None)."""
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    df = globals()[reader_name](file_path)
+    elapsed = time.perf_counter() - start
+    rss_peak = peak_rss_mb()
+    return df.to_csv(index=False), elapsed, None if rss_peak is None else rss_peak - rss_before
+
+def measure_in_fresh_process(reader_name, file_path):
+    """Każdy pomiar w nowym procesie, żeby szczyt pamięci nie obejmował poprzedniego."""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(measure, reader_name, file_path).result()
+
+# --- Główna część skryptu ---
+if __name__ == "__main__":
+    synop_files = catalog_files(ROOT_METEO_SYNOP_DIR, "s_d") if os.path.isdir(ROOT_METEO_SYNOP_DIR) else []
+    if not synop_files:
+        print(f"Błąd: Brak plików s_d w '{ROOT_METEO_SYNOP_DIR}'.")
+    else:
+        lines = read_data_bytes(synop_files[0]).splitlines(keepends=True)
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+            for i in range(LICZBA_WIERSZY):
+                tmp.write(lines[i % len(lines)])
+        try:
+            print(f"{LICZBA_WIERSZY} wierszy ({synop_files[0]} powielony), {len(SYNOP_SD_COLUMN_NAMES)} kolumn:")
+            legacy_csv, legacy_time, legacy_peak = measure_in_fresh_process("read_legacy", tmp.name)
+            memory_info = "" if legacy_peak is None else f", szczyt pamięci +{legacy_peak:.0f} MB"
+            print(f"  str + strip/replace/to_numeric: {legacy_time:.2f} s{memory_info}")
+            typed_csv, typed_time, typed_peak = measure_in_fresh_process("read_typed", tmp.name)
+            memory_info = "" if typed_peak is None else \
+                f", szczyt pamięci +{typed_peak:.0f} MB ({legacy_peak / max(typed_peak, 1e-9):.1f}x mniej)"
+            print(f"  read_csv_typed: {typed_time:.2f} s ({legacy_time / max(typed_time, 1e-9):.1f}x){memory_info}")
+            if typed_peak is None:
+                print("  (Pomiar pamięci pominięty - moduł resource niedostępny w tym systemie.)")
+            print(f"  Wyniki identyczne (po zapisie do CSV): {legacy_csv == typed_csv}")
+        finally:
+            os.remove(tmp.name)
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""Odczyt plików danych IMGW bezpośrednio z archiwów ZIP (bez rozpakowywania na dysk).
+
+Plik w archiwum jest identyfikowany ścieżką "archiwum.zip::nazwa_pliku.csv", zwykły plik
+na dysku - zwykłą ścieżką. Funkcje open_data_file/read_first_line działają dla obu przypadków,
+więc skrypty 04-10 nie muszą wiedzieć, skąd pochodzą dane.
+"""
+import os
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Separator między ścieżką archiwum a nazwą pliku w środku
+ZIP_MEMBER_SEPARATOR = "::"
+
+# True - czytaj z katalogów zips/ (extracted_files/ tylko dla lat bez archiwów)
+# False - czytaj wyłącznie z rozpakowanych plików w extracted_files/
+CZYTAJ_Z_ARCHIWOW = True
+
+SKANOWANIE_LICZBA_WATKOW = 8 # Wątki czytające katalogi i spisy archiwów
+SKANOWANIE_POMIJANE_KATALOGI = {"cas"} # Magazyn treści (imgw_magazyn) - nie zawiera plików danych
+
+_classified_cache = {}
+
+# Rodzaje produktów IMGW rozpoznawane po przedrostku nazwy pliku
+# (dłuższe przedrostki najpierw, bo "k_d_t_" zaczyna się tak samo jak "k_d_")
+DATASET_PREFIXES = [
+    ("k_d_t_", "k_d_t"),
+    ("k_d_", "k_d"),
+    ("o_d_", "o_d"),
+    ("s_d_t_", "s_d_t"),
+    ("s_d_", "s_d"),
+    ("codz_", "codz"),
+]
+
+
+def is_zip_member(file_ref):
+    """Czy odwołanie wskazuje plik wewnątrz archiwum ZIP?"""
+    return ZIP_MEMBER_SEPARATOR in file_ref
+
+def split_zip_member(file_ref):
+    """Rozdziela "archiwum.zip::plik" na (ścieżka_archiwum, nazwa_pliku)."""
+    zip_path, member_name = file_ref.split(ZIP_MEMBER_SEPARATOR, 1)
+    return zip_path, member_name
+
+def data_file_name(file_ref):
+    """Sama nazwa pliku (bez katalogów i archiwum) - do filtrowania po wzorcu nazwy."""
+    if is_zip_member(file_ref):
+        file_ref = split_zip_member(file_ref)[1]
+    return os.path.basename(file_ref.replace("\\", "/"))
+
+def dataset_type(file_ref):
+    """Rodzaj produktu (k_d, k_d_t, o_d, s_d, s_d_t, codz, ost_hydro) albo None."""
+    file_name = data_file_name(file_ref).lower()
+    if file_name.endswith(".txt"):
+        return "ost_hydro" if "ost_hydro" in file_ref.replace("\\", "/").split("/") else None
+    if not file_name.endswith(".csv"):
+        return None
+    for prefix, name in DATASET_PREFIXES:
+        if file_name.startswith(prefix):
+            return name
+    return None
+
+def open_data_file(file_ref):
+    """Otwiera plik (z dysku lub z archiwum) jako strumień binarny."""
+    if not is_zip_member(file_ref):
+        return open(file_ref, 'rb')
+    zip_path, member_name = split_zip_member(file_ref)
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        # Strumień pozostaje ważny po zamknięciu ZipFile (współdzielony uchwyt pliku)
+        return zip_ref.open(member_name, 'r')
+
+def read_data_bytes(file_ref):
+    """Wczytuje całą zawartość pliku (z dysku lub z archiwum)."""
+    with open_data_file(file_ref) as f:
+        return f.read()
+
+def data_file_size(file_ref):
+    """Rozmiar pliku w bajtach (dla pliku w archiwum - po rozpakowaniu)."""
+    if not is_zip_member(file_ref):
+        return os.path.getsize(file_ref)
+    zip_path, member_name = split_zip_member(file_ref)
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        return zip_ref.getinfo(member_name).file_size
+
+def read_first_line(file_ref, encoding):
+    """Zwraca pierwszą linię pliku zdekodowaną podanym kodowaniem (rzuca UnicodeDecodeError)."""
+    with open_data_file(file_ref) as f:
+        with io.TextIOWrapper(f, encoding=encoding) as text:
+            return text.readline()
+
+def scan_tree(root_dir):
+    """Jedno przejście po drzewie katalogów (os.scandir, katalogi jednego poziomu równolegle).
+
+    Zwraca słownik {katalog: [nazwy plików]}. Katalogi z SKANOWANIE_POMIJANE_KATALOGI
+    (np. magazyn treści cas/) są pomijane.
+    """
+    def scan_one(directory):
+        files, subdirs = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKANOWANIE_POMIJANE_KATALOGI:
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry.name)
+        except OSError as e:
+            print(f"  Nie udało się odczytać katalogu {directory}: {e}")
+        return directory, files, subdirs
+
+    tree = {}
+    level = [root_dir] if os.path.isdir(root_dir) else []
+    with ThreadPoolExecutor(max_workers=SKANOWANIE_LICZBA_WATKOW) as executor:
+        while level:
+            next_level = []
+            for directory, files, subdirs in executor.map(scan_one, level):
+                tree[directory] = files
+                next_level.extend(subdirs)
+            level = next_level
+    return tree
+
+def _zip_member_names(zip_path):
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            return zip_path, [i.filename for i in zip_ref.infolist() if not i.is_dir()]
+    except zipfile.BadZipFile:
+        print(f"  Pominięto uszkodzone archiwum: {zip_path}")
+        return zip_path, []
+
+def scan_data_files(root_dir):
+    """Wszystkie odwołania do plików danych w root_dir (jedno przejście po drzewie).
+
+    Przy CZYTAJ_Z_ARCHIWOW pliki z archiwów w zips/ mają pierwszeństwo; extracted_files/
+    jest używany tylko tam, gdzie archiwów brak (np. dane rozpakowane ręcznie).
+    """
+    tree = scan_tree(root_dir)
+    zip_paths = []
+    covered_extracted_dirs = set()
+    if CZYTAJ_Z_ARCHIWOW:
+        for directory, files in tree.items():
+            archives = [f for f in files if f.lower().endswith(".zip")]
+            if os.path.basename(directory) == "zips" and archives:
+                covered_extracted_dirs.add(os.path.join(os.path.dirname(directory), "extracted_files"))
+                zip_paths.extend(os.path.join(directory, f) for f in archives)
+
+    def is_covered(directory):
+        # Także podkatalogi extracted_files/ (pliki z archiwów zapisane w podfolderach)
+        return any(directory == d or directory.startswith(d + os.sep) for d in covered_extracted_dirs)
+
+    file_refs = []
+    for directory, files in tree.items():
+        if os.path.basename(directory) == "zips" or is_covered(directory):
+            continue
+        file_refs.extend(os.path.join(directory, f) for f in files if not f.lower().endswith(".zip"))
+    # Spisy zawartości archiwów czytane równolegle (operacje wejścia/wyjścia)
+    with ThreadPoolExecutor(max_workers=SKANOWANIE_LICZBA_WATKOW) as executor:
+        for zip_path, member_names in executor.map(_zip_member_names, zip_paths):
+            file_refs.extend(zip_path + ZIP_MEMBER_SEPARATOR + name for name in member_names)
+    return sorted(file_refs)
+
+def classify_data_files(root_dir):
+    """Pliki danych z root_dir pogrupowane wg rodzaju produktu: {produkt: [odwołania]}.
+
+    Wynik jest zapamiętywany na czas działania procesu, więc kolejne zapytania
+    o inne produkty z tego samego drzewa nie przechodzą go ponownie.
+    """
+    key = os.path.abspath(root_dir)
+    if key not in _classified_cache:
+        by_product = {}
+        for file_ref in scan_data_files(root_dir):
+            by_product.setdefault(dataset_type(file_ref), []).append(file_ref)
+        _classified_cache[key] = by_product
+    return _classified_cache[key]
+
+def list_data_files(root_dir, name_filter):
+    """Zwraca posortowaną listę odwołań do plików danych spełniających name_filter(nazwa)."""
+    return [ref for ref in scan_data_files(root_dir) if name_filter(data_file_name(ref))]
+
+def iter_file_contents(file_refs):
+    """Generuje (odwołanie, bajty) dla podanych plików, otwierając każde archiwum tylko raz."""
+    by_archive = {}
+    for file_ref in file_refs:
+        if is_zip_member(file_ref):
+            zip_path, member_name = split_zip_member(file_ref)
+            by_archive.setdefault(zip_path, []).append(member_name)
+        else:
+            yield file_ref, read_data_bytes(file_ref)
+    for zip_path, member_names in by_archive.items():
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for member_name in member_names:
+                yield zip_path + ZIP_MEMBER_SEPARATOR + member_name, zip_ref.read(member_name)
+
+def iter_data_file_contents(root_dir, name_filter):
+    """Generuje (odwołanie, bajty) dla pasujących plików, otwierając każde archiwum tylko raz.
+
+    Przeznaczone dla tysięcy małych plików (np. ostrzeżenia .TXT), gdzie ponowne czytanie
+    katalogu archiwum dla każdego pliku byłoby kosztowne.
+    """
+    return iter_file_contents(list_data_files(root_dir, name_filter))
\ No newline at end of file
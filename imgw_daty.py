@@ -0,0 +1,50 @@
+"""Wektorowe składanie dat kalendarzowych z kolumn rok/miesiąc/dzień (etapy 05-10).
+
+Zamiast sklejania napisów "rrrr-m-d" i parsowania ich przez pd.to_datetime (oraz df.apply
+wiersz po wierszu dla roku hydrologicznego w 05) daty liczone są arytmetyką całkowitą na
+tablicach numpy: miesiąc od 1970 -> datetime64[M] -> dzień. Nieprawidłowe składowe
+(brak, tekst, 30 lutego, rok spoza zakresu datetime64[ns]) dają NaT.
+"""
+import numpy as np
+import pandas as pd
+
+# Zakres lat, który mieści się w datetime64[ns] w całości
+MIN_ROK = 1678
+MAX_ROK = 2261
+# Miesiące kalendarzowe należące już do następnego roku hydrologicznego (rok hydrologiczny: XI-X)
+MIESIACE_POPRZEDNIEGO_ROKU_KALENDARZOWEGO = (11, 12)
+
+
+def _as_integers(values):
+    """Kolumna (napisy lub liczby) jako tablica float64; wartości niecałkowite i nieliczbowe -> NaN.
+
+    Lata, miesiące i dni mają niewiele różnych wartości, więc zamiast parsować miliony napisów
+    parsujemy tylko unikalne (pd.factorize) i rozkładamy wynik po kodach.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, copy=False))
+    parsed = pd.to_numeric(pd.Series(uniques), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    parsed = np.append(np.where(parsed == np.floor(parsed), parsed, np.nan), np.nan) # Kod -1 (brak) -> NaN
+    return parsed[codes]
+
+def calendar_dates(years, months, days, hydrological_year=False):
+    """Daty (Series datetime64[ns], indeks jak years) z kolumn roku, miesiąca i dnia.
+
+    hydrological_year=True - years to rok hydrologiczny, a months miesiąc kalendarzowy:
+    dla listopada i grudnia rok kalendarzowy jest o jeden mniejszy.
+    """
+    index = years.index if isinstance(years, pd.Series) else None
+    year = _as_integers(years)
+    month = _as_integers(months)
+    day = _as_integers(days)
+    if hydrological_year:
+        year = year - np.isin(month, MIESIACE_POPRZEDNIEGO_ROKU_KALENDARZOWEGO)
+
+    valid = ((year >= MIN_ROK) & (year <= MAX_ROK) & (month >= 1) & (month <= 12) & (day >= 1))
+    month_index = np.where(valid, (year - 1970) * 12 + (month - 1), 0).astype(np.int64)
+    month_start = month_index.astype('datetime64[M]').astype('datetime64[D]')
+    days_in_month = ((month_index + 1).astype('datetime64[M]').astype('datetime64[D]') - month_start).astype(np.int64)
+    valid &= day <= days_in_month
+
+    dates = (month_start + np.where(valid, day - 1, 0).astype(np.int64)).astype('datetime64[ns]')
+    dates[~valid] = np.datetime64('NaT')
+    return pd.Series(dates, index=index)
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""Katalog plików danych IMGW w bazie SQLite (pobrane_dane_imgw/katalog.sqlite).
+
+Budowany przez 03_lista_wszystkich_plikow.py: dla każdego pliku (na dysku lub w archiwum ZIP)
+zapisuje rodzaj produktu, rok, miesiąc, rozmiar, czas modyfikacji i sha256. Etapy 04-10 pobierają
+z niego listy plików zamiast przeszukiwać katalogi, a tabela "przetworzone" pozwala pominąć
+pliki, których treść nie zmieniła się od ostatniego przetworzenia.
+"""
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import zipfile
+
+import imgw_magazyn
+from imgw_archiwa import (classify_data_files, dataset_type, data_file_name, is_zip_member,
+                          split_zip_member, ZIP_MEMBER_SEPARATOR)
+
+CATALOG_PATH = os.path.join("pobrane_dane_imgw", "katalog.sqlite")
+HASH_BLOCK_SIZE = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pliki (
+    sciezka TEXT PRIMARY KEY,
+    archiwum TEXT,
+    produkt TEXT,
+    rok INTEGER,
+    miesiac INTEGER,
+    rozmiar INTEGER,
+    mtime REAL,
+    crc INTEGER,
+    sha256 TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pliki_produkt_rok ON pliki (produkt, rok, miesiac);
+CREATE INDEX IF NOT EXISTS idx_pliki_sha256 ON pliki (sha256);
+CREATE TABLE IF NOT EXISTS przetworzone (
+    etap TEXT,
+    sciezka TEXT,
+    sha256 TEXT,
+    PRIMARY KEY (etap, sciezka)
+);
+"""
+
+
+def connect(catalog_path=CATALOG_PATH):
+    """Otwiera (i w razie potrzeby zakłada) bazę katalogu."""
+    os.makedirs(os.path.dirname(catalog_path) or ".", exist_ok=True)
+    connection = sqlite3.connect(catalog_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+def parse_year_month(file_ref):
+    """Rok i miesiąc z nazwy pliku (np. k_d_01_2018.csv, codz_2022_01.csv) lub z katalogu roku.
+
+    Trzycyfrowe liczby w nazwach synop (s_d_100_2020.csv) to kody stacji, nie miesiące.
+    """
+    numbers = re.findall(r'\d+', os.path.splitext(data_file_name(file_ref))[0])
+    year = next((int(n) for n in numbers if len(n) == 4), None)
+    month = next((int(n) for n in numbers if len(n) == 2 and 1 <= int(n) <= 12), None)
+    if year is None:
+        path = split_zip_member(file_ref)[0] if is_zip_member(file_ref) else file_ref
+        year = next((int(part) for part in reversed(path.replace("\\", "/").split("/"))
+                     if len(part) == 4 and part.isdigit()), None)
+    return year, month
+
+def _hash_stream(stream):
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(HASH_BLOCK_SIZE), b''):
+        digest.update(block)
+    return digest.hexdigest()
+
+def build_catalog(root_dir, catalog_path=CATALOG_PATH):
+    """Aktualizuje katalog dla wszystkich plików danych w root_dir.
+
+    sha256 jest liczony tylko dla plików nowych lub zmienionych (inny rozmiar, mtime lub CRC).
+    Zwraca słownik z liczbą plików: wszystkich, przeliczonych i usuniętych z katalogu.
+    """
+    # Tylko pliki danych znanych produktów (bez katalogu cas/, cache i samej bazy katalogu)
+    file_refs = sorted(imgw_magazyn.normalize_ref(ref)
+                       for product, refs in classify_data_files(root_dir).items() if product is not None
+                       for ref in refs)
+    connection = connect(catalog_path)
+    known = {row[0]: row[1:] for row in connection.execute(
+        "SELECT sciezka, rozmiar, mtime, crc, sha256 FROM pliki")}
+
+    rows = []
+    rehashed = 0
+    by_archive = {}
+    for file_ref in file_refs:
+        if is_zip_member(file_ref):
+            zip_path, member_name = split_zip_member(file_ref)
+            by_archive.setdefault(zip_path, []).append(member_name)
+            continue
+        stat = os.stat(file_ref)
+        size, mtime, crc = stat.st_size, stat.st_mtime, None
+        previous = known.get(file_ref)
+        if previous and previous[:3] == (size, mtime, crc) and previous[3]:
+            sha256 = previous[3]
+        else:
+            with open(file_ref, 'rb') as f:
+                sha256 = _hash_stream(f)
+            rehashed += 1
+        rows.append((file_ref, None, size, mtime, crc, sha256))
+
+    for zip_path, member_names in by_archive.items():
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for member_name in member_names:
+                info = zip_ref.getinfo(member_name)
+                file_ref = zip_path + ZIP_MEMBER_SEPARATOR + member_name
+                size, crc = info.file_size, info.CRC
+                mtime = time.mktime(info.date_time + (0, 0, -1))
+                previous = known.get(file_ref)
+                if previous and previous[:3] == (size, mtime, crc) and previous[3]:
+                    sha256 = previous[3]
+                else:
+                    with zip_ref.open(member_name, 'r') as f:
+                        sha256 = _hash_stream(f)
+                    rehashed += 1
+                rows.append((file_ref, zip_path, size, mtime, crc, sha256))
+
+    current_refs = {row[0] for row in rows}
+    removed = [(ref,) for ref in known if ref not in current_refs]
+    with connection:
+        connection.executemany("DELETE FROM pliki WHERE sciezka = ?", removed)
+        connection.executemany(
+            "INSERT OR REPLACE INTO pliki (sciezka, archiwum, produkt, rok, miesiac, rozmiar, mtime, crc, sha256) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(ref, archive, dataset_type(ref), *parse_year_month(ref), size, mtime, crc, sha256)
+             for ref, archive, size, mtime, crc, sha256 in rows])
+    connection.close()
+
+    # Skróty trafiają też do indeksu magazynu treści (deduplikacja i cache formatów w 05-10)
+    for ref, _, _, _, _, sha256 in rows:
+        imgw_magazyn.record(ref, sha256)
+    imgw_magazyn.save_index()
+    return {"pliki": len(rows), "przeliczone": rehashed, "usuniete": len(removed)}
+
+def _under_root(file_ref, root_prefix):
+    path = split_zip_member(file_ref)[0] if is_zip_member(file_ref) else file_ref
+    return os.path.abspath(path).startswith(root_prefix)
+
+def catalog_files(root_dir, product, catalog_path=CATALOG_PATH):
+    """Posortowana lista plików danego produktu w root_dir.
+
+    Korzysta z katalogu SQLite; gdy go nie ma (nie uruchomiono 03) albo root_dir leży poza
+    drzewem opisanym przez katalog, przeszukuje katalogi.
+    """
+    root_prefix = os.path.join(os.path.abspath(root_dir), "")
+    if not os.path.exists(catalog_path):
+        print(f"Brak katalogu {catalog_path} (uruchom 03_lista_wszystkich_plikow.py) - przeszukiwanie katalogów.")
+        return classify_data_files(root_dir).get(product, [])
+    if not root_prefix.startswith(os.path.join(os.path.abspath(os.path.dirname(catalog_path)), "")):
+        # Katalog opisuje tylko drzewo, w którym leży; inne drzewa przeszukujemy
+        return classify_data_files(root_dir).get(product, [])
+    connection = connect(catalog_path)
+    refs = [row[0] for row in connection.execute(
+        "SELECT sciezka FROM pliki WHERE produkt = ? ORDER BY sciezka", (product,))]
+    connection.close()
+    return [ref for ref in refs if _under_root(ref, root_prefix)]
+
+def processed_unchanged(stage, file_refs, catalog_path=CATALOG_PATH):
+    """Zbiór plików, które etap już przetworzył i których treść (sha256) od tego czasu się nie zmieniła."""
+    if not os.path.exists(catalog_path):
+        return set()
+    connection = connect(catalog_path)
+    unchanged = {row[0] for row in connection.execute(
+        "SELECT p.sciezka FROM przetworzone p JOIN pliki f ON f.sciezka = p.sciezka "
+        "WHERE p.etap = ? AND p.sha256 = f.sha256", (stage,))}
+    connection.close()
+    return {ref for ref in file_refs if imgw_magazyn.normalize_ref(ref) in unchanged}
+
+def mark_processed(stage, file_refs, catalog_path=CATALOG_PATH):
+    """Zapamiętuje, że etap przetworzył pliki w ich obecnej wersji (wg sha256 z katalogu)."""
+    connection = connect(catalog_path)
+    with connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO przetworzone (etap, sciezka, sha256) "
+            "SELECT ?, sciezka, sha256 FROM pliki WHERE sciezka = ?",
+            [(stage, imgw_magazyn.normalize_ref(ref)) for ref in file_refs])
+    connection.close()
\ No newline at end of file
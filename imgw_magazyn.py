@@ -0,0 +1,148 @@
+"""Magazyn treści adresowanej skrótem (content-addressed store) dla rozpakowanych plików IMGW.
+
+Każda unikalna treść jest zapisana raz w cas/<2 znaki>/<sha256>, a pliki w extracted_files/
+są do niej twardymi dowiązaniami (lub kopiami, gdy system plików ich nie obsługuje).
+Indeks (ścieżka lub "archiwum.zip::plik" -> [sha256, rozmiar, mtime_ns]) daje dalszym etapom stabilny klucz
+treści; rozmiar i mtime (dla pliku w archiwum - samego archiwum) wykrywają pliki zmienione poza 01/03.
+"""
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+
+from imgw_archiwa import open_data_file, is_zip_member, split_zip_member, ZIP_MEMBER_SEPARATOR
+
+ROOT_DATA_DIR = "pobrane_dane_imgw"
+CAS_DIR = os.path.join(ROOT_DATA_DIR, "cas")
+CAS_INDEX_PATH = os.path.join(CAS_DIR, "indeks.json")
+CAS_BLOCK_SIZE = 1024 * 1024
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def normalize_ref(file_ref):
+    """Ujednolica ścieżkę (separatory, ./), aby ten sam plik miał jeden klucz w indeksie."""
+    if is_zip_member(file_ref):
+        zip_path, member_name = split_zip_member(file_ref)
+        return os.path.normpath(zip_path).replace("\\", "/") + ZIP_MEMBER_SEPARATOR + member_name
+    return os.path.normpath(file_ref).replace("\\", "/")
+
+def load_index():
+    """Wczytuje indeks magazynu (leniwie, raz na proces)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = {}
+            if os.path.exists(CAS_INDEX_PATH):
+                try:
+                    with open(CAS_INDEX_PATH, 'r', encoding='utf-8') as f:
+                        _index = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Nie udało się wczytać indeksu magazynu {CAS_INDEX_PATH}: {e}")
+    return _index
+
+def save_index():
+    """Zapisuje indeks magazynu atomowo."""
+    index = load_index()
+    with _index_lock:
+        snapshot = dict(index)
+    os.makedirs(CAS_DIR, exist_ok=True)
+    tmp_path = CAS_INDEX_PATH + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=0, sort_keys=True)
+    os.replace(tmp_path, CAS_INDEX_PATH)
+
+def file_stamp(file_ref):
+    """(rozmiar, mtime_ns) pliku na dysku - dla pliku w archiwum: archiwum; None, gdy pliku nie ma."""
+    path = split_zip_member(file_ref)[0] if is_zip_member(file_ref) else file_ref
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+def record(file_ref, sha256, stamp=None):
+    """Zapamiętuje w indeksie klucz treści dla ścieżki lub pliku w archiwum.
+
+    stamp - (rozmiar, mtime_ns) z chwili liczenia skrótu; domyślnie bieżący stan pliku.
+    """
+    entry = [sha256] + list(stamp if stamp is not None else file_stamp(file_ref) or [None, None])
+    index = load_index()
+    with _index_lock:
+        index[normalize_ref(file_ref)] = entry
+
+def lookup(file_ref):
+    """Klucz treści z indeksu albo None (bez czytania pliku).
+
+    None także wtedy, gdy rozmiar lub mtime pliku są inne niż przy zapisie wpisu (plik zmieniony na miejscu)
+    oraz dla wpisów bez rozmiaru i mtime (starszy format indeksu) - klucz zostanie policzony na nowo.
+    """
+    entry = load_index().get(normalize_ref(file_ref))
+    if not isinstance(entry, list) or entry[1:] != file_stamp(file_ref):
+        return None
+    return entry[0]
+
+def cas_path(sha256):
+    """Ścieżka obiektu o danym skrócie w magazynie."""
+    return os.path.join(CAS_DIR, sha256[:2], sha256)
+
+def store_stream(stream):
+    """Zapisuje strumień binarny do magazynu. Zwraca (sha256, rozmiar, czy_nowy_obiekt)."""
+    os.makedirs(CAS_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=CAS_DIR, prefix=".tmp_", delete=False) as tmp:
+        for block in iter(lambda: stream.read(CAS_BLOCK_SIZE), b''):
+            digest.update(block)
+            tmp.write(block)
+            size += len(block)
+    sha256 = digest.hexdigest()
+    target = cas_path(sha256)
+    if os.path.exists(target):
+        os.remove(tmp.name) # Ta sama treść już jest w magazynie
+        return sha256, size, False
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(tmp.name, target)
+    return sha256, size, True
+
+def link_view(sha256, view_path):
+    """Tworzy plik view_path wskazujący na obiekt z magazynu (twarde dowiązanie lub kopia)."""
+    os.makedirs(os.path.dirname(view_path) or ".", exist_ok=True)
+    if os.path.lexists(view_path):
+        os.remove(view_path)
+    try:
+        os.link(cas_path(sha256), view_path)
+    except OSError:
+        shutil.copyfile(cas_path(sha256), view_path)
+
+def content_key(file_ref):
+    """Stabilny klucz treści pliku: z indeksu, a gdy go brak - liczony (i zapamiętywany)."""
+    sha256 = lookup(file_ref)
+    if sha256 is None:
+        stamp = file_stamp(file_ref) # Sprzed czytania - zmiana w trakcie liczenia wymusi kolejne przeliczenie
+        digest = hashlib.sha256()
+        with open_data_file(file_ref) as f:
+            for block in iter(lambda: f.read(CAS_BLOCK_SIZE), b''):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+        record(file_ref, sha256, stamp)
+    return sha256
+
+def deduplicate_by_content(file_refs):
+    """Usuwa z listy pliki o treści identycznej z wcześniejszym (wg indeksu, bez czytania plików).
+
+    Pliki nieobecne w indeksie zostają na liście. Zwraca (lista_unikalnych, liczba_pominiętych).
+    """
+    seen_keys = set()
+    unique_refs = []
+    for file_ref in file_refs:
+        sha256 = lookup(file_ref)
+        if sha256 is not None:
+            if sha256 in seen_keys:
+                continue
+            seen_keys.add(sha256)
+        unique_refs.append(file_ref)
+    return unique_refs, len(file_refs) - len(unique_refs)
@@ -0,0 +1,125 @@
+"""Przypisanie ostrzeżeń hydrologicznych do powiatów i rzek na podstawie tekstu pola "obszar".
+
+Z rejestru stacji hydrologicznych (wynik 13_czyszczenie_stacji_hydro.py) budowany jest raz
+automat Aho-Corasick ze wszystkich nazw: powiatów, rzek (kolumna Rzeka, także w dopełniaczu -
+"zlewnia Wisły") i stacji (nazwa stacji -> powiat stacji). Każdy tekst jest potem przeglądany
+jednym liniowym przebiegiem, niezależnie od liczby wzorców. Dopasowania muszą być całymi
+słowami; wielkość liter nie ma znaczenia.
+"""
+import os
+import csv
+from collections import deque
+
+# Wartości kolumny Powiat, które nie są nazwami powiatów (wyniki geokodowania w 15)
+POMIJANE_POWIATY = {'', 'nieznany', 'błąd', 'brak współrzędnych', 'nan'}
+# Końcówki mianownika -> dopełniacza dla jednowyrazowych nazw rzek (Wisła -> Wisły, Dunajec -> Dunajca)
+KONCOWKI_DOPELNIACZA = [('ka', 'ki'), ('ga', 'gi'), ('ca', 'cy'), ('ja', 'ji'), ('la', 'li'), ('a', 'y'), ('ec', 'ca')]
+MINIMALNA_DLUGOSC_NAZWY = 3 # Krótsze nazwy dawałyby przypadkowe trafienia
+
+
+def river_name_variants(name):
+    """Mianownik i przybliżony dopełniacz jednowyrazowej nazwy rzeki (dla wieloczłonowych - tylko nazwa)."""
+    variants = {name}
+    if ' ' in name or '-' in name:
+        return variants
+    for ending, genitive in KONCOWKI_DOPELNIACZA:
+        if name.endswith(ending):
+            variants.add(name[:-len(ending)] + genitive)
+            break
+    else:
+        if name[-1:].isalpha() and name[-1] not in 'aeiouyąęó':
+            variants.update({name + 'u', name + 'a'}) # Bug -> Bugu, Wieprz -> Wieprza
+    return variants
+
+def build_matcher(patterns):
+    """Automat Aho-Corasick dla {wzorzec: zbiór etykiet}; zwraca (przejścia, powroty, wyjścia).
+
+    wyjścia[stan] to lista (długość_wzorca, etykiety) wzorców kończących się w tym stanie.
+    """
+    transitions, outputs = [{}], [[]]
+    for pattern, tags in patterns.items():
+        state = 0
+        for char in pattern:
+            next_state = transitions[state].get(char)
+            if next_state is None:
+                next_state = len(transitions)
+                transitions[state][char] = next_state
+                transitions.append({})
+                outputs.append([])
+            state = next_state
+        outputs[state].append((len(pattern), frozenset(tags)))
+
+    # Powroty (najdłuższy właściwy sufiks będący prefiksem wzorca) - przejście wszerz po drzewie
+    fallbacks = [0] * len(transitions)
+    queue = deque(transitions[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, next_state in transitions[state].items():
+            queue.append(next_state)
+            fallback = fallbacks[state]
+            while fallback and char not in transitions[fallback]:
+                fallback = fallbacks[fallback]
+            target = transitions[fallback].get(char, 0)
+            fallbacks[next_state] = target if target != next_state else 0
+            outputs[next_state] = outputs[next_state] + outputs[fallbacks[next_state]]
+    return transitions, fallbacks, outputs
+
+def find_tags(matcher, text):
+    """Zbiór etykiet wszystkich wzorców występujących w tekście jako całe słowa - jeden przebieg."""
+    transitions, fallbacks, outputs = matcher
+    text = ' '.join(text.lower().split())
+    tags = set()
+    state = 0
+    for end, char in enumerate(text, 1):
+        while state and char not in transitions[state]:
+            state = fallbacks[state]
+        state = transitions[state].get(char, 0)
+        for length, pattern_tags in outputs[state]:
+            start = end - length
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                tags |= pattern_tags
+    return tags
+
+def load_station_registry(registry_path):
+    """Wiersze rejestru stacji (CSV ze średnikiem z 13_czyszczenie_stacji_hydro.py)."""
+    with open(registry_path, 'r', newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f, delimiter=';'))
+
+def build_area_matcher(stations):
+    """Automat dla nazw powiatów, rzek i stacji z wierszy rejestru (kolumny Nazwa, Rzeka, Powiat)."""
+    patterns = {}
+    def add(pattern, tag):
+        pattern = ' '.join(pattern.lower().split())
+        if len(pattern) >= MINIMALNA_DLUGOSC_NAZWY:
+            patterns.setdefault(pattern, set()).add(tag)
+
+    for station in stations:
+        powiat = (station.get('Powiat') or '').strip().lower()
+        river = (station.get('Rzeka') or '').split('(')[0].strip()
+        if powiat not in POMIJANE_POWIATY:
+            add(powiat, ('powiat', powiat))
+            add(station.get('Nazwa') or '', ('powiat', powiat))
+        if river:
+            for variant in river_name_variants(river.lower()):
+                add(variant, ('rzeka', river.lower()))
+    return build_matcher(patterns)
+
+def tag_warning_areas(records, matcher):
+    """Lista (powiaty, rzeki) - posortowane nazwy dla pola "obszar" każdego rekordu."""
+    tagged = []
+    for record in records:
+        tags = find_tags(matcher, record.get('obszar') or '')
+        tagged.append((sorted(name for kind, name in tags if kind == 'powiat'),
+                       sorted(name for kind, name in tags if kind == 'rzeka')))
+    return tagged
+
+def save_warning_areas(records, tagged, output_file):
+    """Zapisuje przypisania (jeden wiersz na ostrzeżenie; nazwy rozdzielone "|") - zapis atomowy."""
+    tmp_file = output_file + ".tmp"
+    with open(tmp_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['rok', 'nazwa_pliku', 'waznosc_od', 'waznosc_do', 'powiaty', 'rzeki'])
+        for record, (powiaty, rivers) in zip(records, tagged):
+            writer.writerow([record['rok'], record['nazwa_pliku'], record.get('waznosc_od', ''),
+                             record.get('waznosc_do', ''), '|'.join(powiaty), '|'.join(rivers)])
+    os.replace(tmp_file, output_file)
\ No newline at end of file
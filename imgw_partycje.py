@@ -0,0 +1,180 @@
+"""Magazyn danych pośrednich (przetworzone_dane_*, dane_*) podzielony na partycje wg roku.
+
+Wynik etapu jest zapisywany w katalogu o nazwie pliku bez .csv, jedna partycja na rok kolumny Data
+(wiersze bez daty - partycja brak_daty). Format partycji (FORMAT_POSREDNI):
+  parquet - <katalog>/rok=<rok>/part-NNNNN.parquet: typy kolumn zapisane w pliku (bez ponownego parsowania
+            dat i zgadywania typów), kompresja KOMPRESJA_PARQUET, kolumny stacji i powiatów słownikowo;
+  csv     - <katalog>/<rok>.csv z nagłówkiem, utf-8-sig (gdy pyarrow niedostępny).
+Każdy zapis (np. wynik jednego pliku wejściowego w trybie strumieniowym 05-10) dopisuje nową część partycji.
+Jednolity CSV (jak dawniej) powstaje tylko jako opcjonalny eksport (EKSPORT_CSV, export_csv, 22_eksport_csv.py).
+read_processed czyta magazyn partycji, a gdy go brak - jednolity CSV.
+"""
+import os
+import shutil
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+FORMAT_POSREDNI = "parquet" if pq is not None else "csv"
+KOMPRESJA_PARQUET = "zstd"
+# Kolumny o kilkuset wartościach na miliony wierszy - w Parquet zapisywane jako słownik (kod + lista wartości)
+KOLUMNY_SLOWNIKOWE = ["KodStacji", "NazwaStacji", "NazwaStacji_Skonsolidowana", "NazwaRzekiJeziora", "Rzeka", "Powiat"]
+EKSPORT_CSV = False # Czy obok magazynu zapisywać też jednolity CSV (dla narzędzi spoza potoku)
+
+PARTYCJA_BEZ_DATY = "brak_daty"
+PARTYCJA_ROZSZERZENIE = ".csv"
+PARQUET_PREFIKS_PARTYCJI = "rok="
+
+
+def partition_dir(output_file):
+    """Katalog partycji dla pliku wynikowego: przetworzone_dane_x.csv -> przetworzone_dane_x/."""
+    return os.path.splitext(output_file)[0]
+
+def partition_path(directory, partition):
+    """Ścieżka partycji CSV (rok albo PARTYCJA_BEZ_DATY)."""
+    return os.path.join(directory, f"{partition}{PARTYCJA_ROZSZERZENIE}")
+
+def parquet_partition_dir(directory, partition):
+    """Katalog partycji Parquet (układ rok=<rok>, czytelny także dla pyarrow.dataset i Sparka)."""
+    return os.path.join(directory, f"{PARQUET_PREFIKS_PARTYCJI}{partition}")
+
+def processed_exists(output_file):
+    """Czy istnieje wynik etapu: magazyn partycji albo jednolity CSV."""
+    return os.path.isdir(partition_dir(output_file)) or os.path.exists(output_file)
+
+def reset_partitions(directory):
+    """Usuwa poprzednią zawartość magazynu (pełne przetwarzanie zapisuje go od nowa)."""
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory, exist_ok=True)
+
+def append_partitions(df, directory, date_column="Data", file_format=None):
+    """Dopisuje wiersze ramki do partycji ich roku; zwraca {partycja: liczba_dopisanych_wierszy}.
+
+    CSV: nagłówek tylko przy zakładaniu partycji, dalej wiersze dopisywane na końcu pliku;
+    Parquet: każde wywołanie to nowa część partycji (part-NNNNN.parquet).
+    """
+    append = _append_parquet if (file_format or FORMAT_POSREDNI) == "parquet" else _append_csv
+    years = df[date_column].dt.year
+    counts = {}
+    for year in sorted(years.dropna().unique()):
+        counts[int(year)] = append(df[years == year], directory, int(year))
+    if years.isna().any():
+        counts[PARTYCJA_BEZ_DATY] = append(df[years.isna()], directory, PARTYCJA_BEZ_DATY)
+    return counts
+
+def _append_csv(df, directory, partition):
+    """Dopisuje ramkę do pliku CSV partycji (z nagłówkiem, gdy plik dopiero powstaje)."""
+    path = partition_path(directory, partition)
+    is_new = not os.path.exists(path)
+    # utf-8-sig zapisuje BOM tylko na początku pliku - przy dopisywaniu strumień nie zaczyna się od zera
+    df.to_csv(path, mode='w' if is_new else 'a', header=is_new, index=False, encoding='utf-8-sig')
+    return len(df)
+
+def _append_parquet(df, directory, partition):
+    """Zapisuje ramkę jako kolejną część partycji Parquet (kolumny KOLUMNY_SLOWNIKOWE jako słownik)."""
+    part_dir = parquet_partition_dir(directory, partition)
+    os.makedirs(part_dir, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for name in KOLUMNY_SLOWNIKOWE:
+        index = table.schema.get_field_index(name)
+        if index >= 0 and (pa.types.is_string(table.schema.field(index).type) or
+                           pa.types.is_large_string(table.schema.field(index).type)):
+            table = table.set_column(index, name, table.column(index).dictionary_encode())
+    part_number = len([name for name in os.listdir(part_dir) if name.endswith(".parquet")])
+    pq.write_table(table, os.path.join(part_dir, f"part-{part_number:05d}.parquet"), compression=KOMPRESJA_PARQUET)
+    return len(df)
+
+def _partition_sort_key(partition):
+    """Lata rosnąco, partycja bez daty na końcu."""
+    return (partition == PARTYCJA_BEZ_DATY, partition if partition == PARTYCJA_BEZ_DATY else int(partition))
+
+def list_partitions(directory):
+    """Partycje magazynu (Parquet i CSV): lata rosnąco, na końcu partycja bez daty (jeśli jest)."""
+    partitions = set()
+    for name in os.listdir(directory):
+        if name.startswith(PARQUET_PREFIKS_PARTYCJI) and os.path.isdir(os.path.join(directory, name)):
+            partitions.add(name[len(PARQUET_PREFIKS_PARTYCJI):])
+        elif name.endswith(PARTYCJA_ROZSZERZENIE):
+            partitions.add(os.path.splitext(name)[0])
+    partitions = [p for p in partitions if p.isdigit() or p == PARTYCJA_BEZ_DATY]
+    return [p if p == PARTYCJA_BEZ_DATY else int(p) for p in sorted(partitions, key=_partition_sort_key)]
+
+def _read_parquet_partition(part_dir, columns=None):
+    """Części partycji Parquet -> ramka; kolumny słownikowe wracają jako zwykłe str (jak z CSV)."""
+    frames = []
+    for name in sorted(name for name in os.listdir(part_dir) if name.endswith(".parquet")):
+        table = pq.read_table(os.path.join(part_dir, name), columns=columns)
+        arrays = []
+        for field, column in zip(table.schema, table.columns):
+            if pa.types.is_dictionary(field.type):
+                value_type = field.type.value_type
+                # Słownik bez wartości (kolumna samych braków) -> float64 z NaN, jak po read_csv
+                column = column.cast(pa.float64() if pa.types.is_null(value_type) else value_type)
+            arrays.append(column)
+        table = pa.Table.from_arrays(arrays, names=table.column_names, metadata=table.schema.metadata)
+        frames.append(table.to_pandas())
+    # Części różnych plików wejściowych mogą mieć różne typy (np. int64 i float64) - łączy je pd.concat
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+def read_partition(directory, partition, columns=None, **read_csv_kwargs):
+    """Jedna partycja magazynu (Parquet albo CSV) jako ramka."""
+    part_dir = parquet_partition_dir(directory, partition)
+    if os.path.isdir(part_dir):
+        return _read_parquet_partition(part_dir, columns)
+    if columns is not None:
+        read_csv_kwargs["usecols"] = columns
+    return pd.read_csv(partition_path(directory, partition), encoding='utf-8-sig', **read_csv_kwargs)
+
+def read_partitions(directory, years=None, columns=None, **read_csv_kwargs):
+    """Wczytuje partycje (wszystkie albo tylko podane lata) do jednej ramki.
+
+    Opcje read_csv (parse_dates, dtype, ...) dotyczą tylko partycji CSV - Parquet ma typy zapisane w pliku.
+    """
+    partitions = [p for p in list_partitions(directory) if years is None or p in years]
+    frames = [read_partition(directory, p, columns, **read_csv_kwargs) for p in partitions]
+    if not frames:
+        raise FileNotFoundError(f"Brak partycji w katalogu {directory}")
+    return pd.concat(frames, ignore_index=True)
+
+def read_processed(output_file, columns=None, **read_csv_kwargs):
+    """Wynik etapu: magazyn partycji o nazwie pliku bez .csv, a gdy go brak - jednolity CSV."""
+    directory = partition_dir(output_file)
+    if os.path.isdir(directory):
+        return read_partitions(directory, columns=columns, **read_csv_kwargs)
+    if columns is not None:
+        read_csv_kwargs["usecols"] = columns
+    return pd.read_csv(output_file, encoding='utf-8-sig', **read_csv_kwargs)
+
+def export_csv(output_file):
+    """Eksport magazynu partycji do jednolitego CSV (utf-8-sig), partycja po partycji; zwraca liczbę wierszy."""
+    directory = partition_dir(output_file)
+    total_rows = 0
+    with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+        for partition in list_partitions(directory):
+            df = read_partition(directory, partition)
+            df.to_csv(f, header=total_rows == 0, index=False)
+            total_rows += len(df)
+    return total_rows
+
+def save_processed(df, output_file, export=None):
+    """Zapisuje wynik etapu do magazynu partycji (FORMAT_POSREDNI), opcjonalnie także jako jednolity CSV.
+
+    Poprzednia zawartość magazynu jest usuwana; nieaktualny jednolity CSV też (gdy eksport wyłączony),
+    żeby nikt nie czytał starych danych.
+    """
+    directory = partition_dir(output_file)
+    reset_partitions(directory)
+    if "Data" in df.columns:
+        append_partitions(df, directory)
+    else:
+        (_append_parquet if FORMAT_POSREDNI == "parquet" else _append_csv)(df, directory, PARTYCJA_BEZ_DATY)
+    if EKSPORT_CSV if export is None else export:
+        df.to_csv(output_file, index=False, encoding='utf-8-sig')
+    elif os.path.exists(output_file):
+        os.remove(output_file)
+    return directory
\ No newline at end of file
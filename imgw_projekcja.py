@@ -0,0 +1,74 @@
+"""Projekcja kolumn: które pola plików produktów meteo (06-10) są potrzebne dalszym etapom.
+
+Zbiór kolumn wynika z konfiguracji 12_czyszczenie_meteo.py (PARAMETRY_PRIORYTETY, SYNOP_SD_SPECIFIC_PARAMS,
+SYNOP_SDT_SPECIFIC_PARAMS, NAZWA_STACJI_ZRODLA) po zdjęciu sufiksów nadawanych przy łączeniu w
+11_konsolidacja_meteo.py (meteo_files_to_merge). Kolumna o danej nazwie jest wczytywana ze wszystkich
+produktów, które ją mają - dzięki temu kolizje nazw w łączeniu 11, a więc i sufiksy, są takie same jak
+przy pełnym odczycie. Do tego klucze łączenia, składowe daty i statusy potrzebnych pomiarów (po zastosowaniu
+reguł 8/9 statusy są usuwane). Produkty, których 11 nie łączy (codz), są wczytywane w całości.
+"""
+import csv
+import importlib
+from functools import lru_cache
+
+from imgw_archiwa import open_data_file, data_file_size
+from imgw_rozpoznawanie import SNIFF_SAMPLE_BYTES
+from imgw_schematy import PRODUCT_SCHEMAS
+
+ETAP_KONSOLIDACJI = "11_konsolidacja_meteo"
+ETAP_CZYSZCZENIA = "12_czyszczenie_meteo"
+KOLUMNY_ZAWSZE_WCZYTYWANE = ["KodStacji", "NazwaStacji"] # Klucz łączenia w 11 (z Data) i nazwa stacji
+
+
+@lru_cache(maxsize=None)
+def _downstream_config():
+    """(pliki łączone w 11, sufiksy 11, kolumny używane w 12) - moduły etapów ładowane raz na proces."""
+    stage11 = importlib.import_module(ETAP_KONSOLIDACJI)
+    stage12 = importlib.import_module(ETAP_CZYSZCZENIA)
+    merged_files = frozenset(path for path, _ in stage11.meteo_files_to_merge)
+    suffixes = tuple(sorted((label for _, label in stage11.meteo_files_to_merge), key=len, reverse=True))
+    referenced = [col for sources in stage12.PARAMETRY_PRIORYTETY.values() for col in sources]
+    referenced += stage12.SYNOP_SD_SPECIFIC_PARAMS + stage12.SYNOP_SDT_SPECIFIC_PARAMS + stage12.NAZWA_STACJI_ZRODLA
+    return merged_files, suffixes, frozenset(referenced)
+
+def consumed_columns():
+    """Nazwy kolumn produktów (bez sufiksów 11), z których korzysta 12."""
+    _, suffixes, referenced = _downstream_config()
+    names = set()
+    for name in referenced:
+        for suffix in suffixes:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        names.add(name)
+    return names
+
+@lru_cache(maxsize=None)
+def required_columns(product):
+    """Kolumny pliku produktu potrzebne dalszym etapom (w kolejności pliku); None - wszystkie."""
+    schema = PRODUCT_SCHEMAS[product]
+    merged_files, _, _ = _downstream_config()
+    if schema["plik_wynikowy"] not in merged_files:
+        return None
+    needed = consumed_columns() | set(KOLUMNY_ZAWSZE_WCZYTYWANE) | set(schema["data"][:3])
+    needed |= {status_col for meas_col, (status_col, _) in schema["reguly_statusow"].items() if meas_col in needed}
+    needed |= {status_col for code_col, status_col in schema["kody_statusow"].items() if code_col in needed}
+    return tuple(name for name in schema["kolumny"] if name in needed)
+
+def skipped_bytes(file_ref, file_format, column_names, used_columns):
+    """Szacunek (pominięte, wszystkie) bajtów pól pliku: udział pól spoza used_columns w próbce z początku
+    pliku przeliczony na cały rozmiar pliku."""
+    with open_data_file(file_ref) as f:
+        sample = f.read(SNIFF_SAMPLE_BYTES)
+    lines = sample.decode(file_format["encoding"], errors='replace').splitlines()
+    if len(sample) == SNIFF_SAMPLE_BYTES:
+        lines = lines[:-1] # Ostatnia linia próbki może być ucięta
+    used = {i for i, name in enumerate(column_names) if name in used_columns}
+    sample_total = sample_skipped = 0
+    for fields in csv.reader(lines, delimiter=file_format["separator"]):
+        for i, field in enumerate(fields):
+            sample_total += len(field) + 1
+            if i not in used:
+                sample_skipped += len(field) + 1
+    total = data_file_size(file_ref)
+    return (round(total * sample_skipped / sample_total) if sample_total else 0), total
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""Indeks przedziałów ważności ostrzeżeń hydrologicznych (tabela z etapu 04).
+
+Ostrzeżenia są pogrupowane wg (biuro, zjawisko), a w grupie posortowane wg początku ważności,
+z narastającym maksimum końców. Zapytanie o chwilę lub okres to dwa wyszukiwania binarne
+w każdej pasującej grupie i filtr krótkiego wycinka - bez przeglądania i parsowania całego CSV.
+Czasy są w minutach od 1970-01-01 (datetime64[m]); przedziały traktujemy jako domknięte.
+Indeks zapisywany jest obok tabeli jako <nazwa>_przedzialy.npz.
+"""
+import os
+import numpy as np
+
+INTERVAL_INDEX_SUFFIX = "_przedzialy.npz"
+
+
+def interval_index_path(output_file):
+    """Ścieżka indeksu dla tabeli ostrzeżeń (dane_hydrologiczne.csv -> dane_hydrologiczne_przedzialy.npz)."""
+    return os.path.splitext(output_file)[0] + INTERVAL_INDEX_SUFFIX
+
+def to_minutes(value):
+    """Chwila ('rrrr-mm-dd gg:mm', datetime lub datetime64) jako liczba minut od 1970-01-01."""
+    return int(np.datetime64(value, 'm').astype(np.int64))
+
+def build_interval_index(records):
+    """Buduje indeks z rekordów tabeli (kolumny biuro, zjawisko, waznosc_od, waznosc_do).
+
+    Numery w tablicy "wiersze" to pozycje rekordów na liście (= wiersze danych w CSV).
+    Rekordy bez pełnego okresu ważności są pomijane.
+    """
+    starts = np.array([record.get('waznosc_od') or 'NaT' for record in records], dtype='datetime64[m]')
+    ends = np.array([record.get('waznosc_do') or 'NaT' for record in records], dtype='datetime64[m]')
+    valid = ~(np.isnat(starts) | np.isnat(ends))
+    rows = np.flatnonzero(valid)
+    offices = np.array([records[row].get('biuro', '') for row in rows], dtype=str)
+    phenomena = np.array([records[row].get('zjawisko', '') for row in rows], dtype=str)
+    starts = starts[valid].astype(np.int64)
+    ends = ends[valid].astype(np.int64)
+
+    order = np.lexsort((starts, phenomena, offices))
+    rows, offices, phenomena, starts, ends = rows[order], offices[order], phenomena[order], starts[order], ends[order]
+    group_starts = np.flatnonzero((offices[1:] != offices[:-1]) | (phenomena[1:] != phenomena[:-1])) + 1
+    bounds = np.concatenate(([0], group_starts, [len(rows)])) if len(rows) else np.array([0])
+
+    # Narastające maksimum końców w grupie - pozwala wyszukiwaniem binarnym odciąć
+    # wszystkie wcześniejsze ostrzeżenia, które na pewno wygasły przed początkiem zapytania
+    max_ends = ends.copy()
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        max_ends[lo:hi] = np.maximum.accumulate(ends[lo:hi])
+
+    return {
+        'biura': offices[bounds[:-1]],
+        'zjawiska': phenomena[bounds[:-1]],
+        'granice': bounds.astype(np.int64),
+        'poczatki': starts,
+        'konce': ends,
+        'maks_konce': max_ends,
+        'wiersze': rows.astype(np.int64),
+    }
+
+def save_interval_index(index, index_path):
+    """Zapisuje indeks do .npz (zapis atomowy)."""
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **index)
+    os.replace(tmp_path, index_path)
+
+def load_interval_index(index_path):
+    """Wczytuje indeks zapisany przez save_interval_index."""
+    with np.load(index_path) as data:
+        return {name: data[name] for name in data.files}
+
+def overlapping_warnings(index, start, end, biuro=None, zjawisko=None):
+    """Posortowane numery wierszy ostrzeżeń ważnych choćby przez chwilę w okresie [start, end].
+
+    biuro i zjawisko (dokładne nazwy z tabeli) zawężają wynik; None - wszystkie.
+    """
+    start, end = to_minutes(start), to_minutes(end)
+    groups = np.ones(len(index['biura']), dtype=bool)
+    if biuro is not None:
+        groups &= index['biura'] == biuro
+    if zjawisko is not None:
+        groups &= index['zjawiska'] == zjawisko
+
+    bounds, starts, ends, max_ends, rows = (index['granice'], index['poczatki'], index['konce'],
+                                            index['maks_konce'], index['wiersze'])
+    found = []
+    for group in np.flatnonzero(groups):
+        lo, hi = bounds[group], bounds[group + 1]
+        # Ostrzeżenia, które zaczęły się najpóźniej na końcu okresu...
+        hi = lo + np.searchsorted(starts[lo:hi], end, side='right')
+        # ...bez początkowych, po których (łącznie z wcześniejszymi) wszystko wygasło przed jego początkiem
+        lo = lo + np.searchsorted(max_ends[lo:hi], start, side='left')
+        if lo < hi:
+            found.append(rows[lo:hi][ends[lo:hi] >= start])
+    return np.sort(np.concatenate(found)) if found else np.array([], dtype=np.int64)
+
+def active_warnings(index, moment, biuro=None, zjawisko=None):
+    """Posortowane numery wierszy ostrzeżeń ważnych w danej chwili."""
+    return overlapping_warnings(index, moment, moment, biuro, zjawisko)
\ No newline at end of file
@@ -0,0 +1,300 @@
+"""Wspólny silnik przetwarzania produktów dobowych IMGW (etapy 05-10).
+
+Każdy produkt opisuje schemat z imgw_schematy.PRODUCT_SCHEMAS; silnik wykonuje dla niego te same kroki:
+lista plików z katalogu SQLite (03) -> odczyt z typami kolumn -> statusy 8/9 -> data -> sklejenie i zapis
+do magazynu partycji lat (imgw_partycje: Parquet, opcjonalnie także jednolity CSV).
+run_products przetwarza kilka produktów w jednym przebiegu (jeden zapis cache formatów na końcu).
+Przy wielu plikach są one rozdzielane na pulę procesów; wyniki wracają jako bufory kolumn (Arrow zamiast
+pikli ramek z obiektami str) i są sklejane w kolejności plików, więc wynik jest ten sam co sekwencyjnie.
+W trybie strumieniowym wynik każdego pliku trafia od razu do partycji lat (imgw_partycje) zamiast do pd.concat.
+Przy projekcji kolumn (PROJEKCJA_KOLUMN) z plików meteo wczytywane są tylko pola używane przez 11-12 (imgw_projekcja).
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+import pandas as pd
+import imgw_magazyn
+from imgw_katalog import catalog_files
+from imgw_magazyn import deduplicate_by_content
+from imgw_rozpoznawanie import read_csv_typed, save_format_cache, sniff_file, remember_format, choose_separator
+from imgw_daty import calendar_dates
+from imgw_statusy import apply_status_flags, decode_status, STATUS_BRAK_POMIARU, STATUS_BRAK_ZJAWISKA
+from imgw_schematy import PRODUCT_SCHEMAS, status_columns
+from imgw_projekcja import required_columns, skipped_bytes
+import imgw_partycje
+from imgw_partycje import partition_dir, reset_partitions, append_partitions, save_processed, export_csv
+
+try:
+    import pyarrow as pa # Zwarty transport wyników z procesów roboczych; bez niego - zwykłe pikle ramek
+except ImportError:
+    pa = None
+
+LICZBA_PROCESOW_PRZETWARZANIA = os.cpu_count() or 4
+MIN_PLIKOW_DLA_PULI = 16 # Przy mniejszej liczbie plików uruchamianie procesów kosztowałoby więcej niż zysk
+PLIKI_W_KOLEJCE_NA_PROCES = 2 # Ile plików naraz zleconych na jeden proces roboczy
+# Zapis strumieniowy: partycje lat w <plik_wynikowy bez .csv>/ dopisywane plik po pliku, bez sklejania
+# całego produktu w pamięci
+ZAPIS_STRUMIENIOWY = False
+# Projekcja kolumn: parser tworzy tylko kolumny potrzebne dalszym etapom, statusy są usuwane po regułach 8/9;
+# False - pełne wyniki 06-10 ze wszystkimi kolumnami plików (np. do eksportu CSV)
+PROJEKCJA_KOLUMN = True
+
+def projected_columns(product):
+    """Kolumny plików produktu wczytywane przy projekcji (PROJEKCJA_KOLUMN); None - wszystkie.
+
+    Liczone w procesie głównym i przekazywane procesom roboczym - przy uruchamianiu procesów metodą
+    spawn (Windows) nie widzą one zmian zmiennych modułu dokonanych w procesie głównym.
+    """
+    return required_columns(product) if PROJEKCJA_KOLUMN else None
+
+def process_product_file(product, file_path, columns=None):
+    """Wczytuje i przetwarza pojedynczy plik produktu według jego schematu; None przy błędzie.
+
+    columns - podzbiór kolumn pliku (projected_columns); None - wszystkie kolumny.
+    """
+    schema = PRODUCT_SCHEMAS[product]
+    print(f"Przetwarzanie pliku: {file_path}")
+    df = None
+    used_encoding = None
+    used_separator = None
+
+    try:
+        # Format (kodowanie, separator, liczba pól) rozpoznany raz i zapamiętany w cache;
+        # liczby i wartości brakujące parsowane od razu przy odczycie
+        df, file_format = read_csv_typed(
+            file_path,
+            schema["kolumny"],
+            text_columns=schema["kolumny_tekstowe"],
+            status_columns=status_columns(schema),
+            separators=schema["separatory"],
+            na_values=schema["wartosci_brakujace"],
+            usecols=columns
+        )
+        if df is not None:
+            used_encoding = file_format["encoding"]
+            used_separator = file_format["separator"]
+            print(f"  Pomyślnie wczytano z kodowaniem: {used_encoding}, separatorem: '{used_separator}'")
+    except FileNotFoundError:
+        print(f"  BŁĄD: Plik {file_path} nie został znaleziony.")
+        return None
+    except pd.errors.EmptyDataError:
+        print(f"  BŁĄD: Plik {file_path} jest pusty.")
+        return None
+    except Exception:
+        df = None
+
+    if df is None:
+        print(f"  NIEPOWODZENIE: Nie udało się wczytać pliku {file_path} (nie rozpoznano formatu o oczekiwanej liczbie kolumn).")
+        return None
+
+    try:
+        for col in schema["kolumny_tekstowe"]:
+            if col in df.columns:
+                df[col] = df[col].astype(str).str.strip()
+
+        # Statusy 8/9 dla wszystkich kolumn pomiarowych naraz (reguły ze schematu)
+        apply_status_flags(df, schema["reguly_statusow"])
+
+        for code_col, status_col in schema["kody_statusow"].items():
+            if code_col in df.columns and status_col in df.columns:
+                # Jeśli status to 8 (brak pomiaru) lub 9 (brak zjawiska), kod nie ma znaczenia
+                df.loc[np.isin(decode_status(df[status_col]), [STATUS_BRAK_POMIARU, STATUS_BRAK_ZJAWISKA]), code_col] = ""
+
+        # Składowe daty -> datetime64 arytmetyką na tablicach (nieprawidłowe -> NaT)
+        year_col, month_col, day_col, hydrological_year = schema["data"]
+        df["Data"] = calendar_dates(df[year_col], df[month_col], df[day_col], hydrological_year=hydrological_year)
+
+        dropped_columns = schema["usuwane_kolumny"] + (status_columns(schema) if columns is not None else [])
+        df = df.drop(columns=[col for col in dropped_columns if col in df.columns], errors='ignore')
+
+        data_col = df.pop('Data')
+        df.insert(0, 'Data', data_col)
+        if schema["sortowanie"]:
+            df = df.sort_values(by=schema["sortowanie"]).reset_index(drop=True)
+
+        return df
+
+    except Exception as e_processing:
+        print(f"  Błąd podczas przetwarzania danych po wczytaniu pliku {file_path} (kod: {used_encoding}, sep: '{used_separator}'): {e_processing}")
+        return None
+
+def _to_transport(df):
+    """Ramka -> tabela Arrow (kolumny jako ciągłe bufory) do przesłania z procesu roboczego.
+
+    Tylko gdy ramka ma kolumny object (napisy jako obiekty Pythona); kolumny str w pandas >= 3
+    są już buforami Arrow i pikle ramki są równie zwarte, a konwersja tylko by kosztowała.
+    """
+    if pa is None or df is None or not (df.dtypes == object).any():
+        return df
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def _from_transport(payload):
+    """Tabela Arrow -> ramka z tymi samymi typami kolumn (metadane pandas zapisane w tabeli)."""
+    return payload.to_pandas() if pa is not None and isinstance(payload, pa.Table) else payload
+
+def process_product_file_worker(product, file_path, columns=None):
+    """Wersja process_product_file dla procesu roboczego: (wynik do przesłania, klucz treści, format).
+
+    Klucz treści i format wracają do procesu głównego, który dopisuje je do wspólnego cache.
+    """
+    df = process_product_file(product, file_path, columns)
+    if df is None:
+        return None, None, None
+    return _to_transport(df), imgw_magazyn.content_key(file_path), sniff_file(file_path)
+
+def product_files(product):
+    """Pliki produktu z katalogu SQLite (03), bez duplikatów treści; archiwa ZIP mają pierwszeństwo."""
+    schema = PRODUCT_SCHEMAS[product]
+    files = catalog_files(schema["katalog"], product)
+    # Pliki o identycznej treści (wg indeksu magazynu treści) wczytujemy tylko raz
+    files, skipped_duplicates = deduplicate_by_content(files)
+    if skipped_duplicates:
+        print(f"Pominięto {skipped_duplicates} plików o treści identycznej z innymi plikami.")
+    return files
+
+def iter_files_in_pool(product, file_paths, max_workers, columns=None):
+    """Przetwarza pliki w puli procesów; zwraca ramki w kolejności file_paths (None dla nieudanych)."""
+    # Klucze treści i formaty znane procesowi głównemu trafiają na dysk, żeby procesy robocze ich nie liczyły
+    save_format_cache()
+    worker = partial(process_product_file_worker, product, columns=columns)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # Wyniki odbierane w kolejności plików (niezależnie od tego, który proces skończy pierwszy);
+        # naraz zleconych jest najwyżej PLIKI_W_KOLEJCE_NA_PROCES * max_workers plików, więc gotowe
+        # wyniki nie gromadzą się w pamięci, gdy odbiorca (np. zapis partycji) jest wolniejszy
+        pending = deque()
+        for f_path in file_paths:
+            pending.append((f_path, executor.submit(worker, f_path)))
+            if len(pending) >= PLIKI_W_KOLEJCE_NA_PROCES * max_workers:
+                yield _collect_pool_result(*pending.popleft())
+        while pending:
+            yield _collect_pool_result(*pending.popleft())
+
+def _collect_pool_result(f_path, future):
+    """Wynik procesu roboczego -> ramka; klucz treści i format trafiają do cache procesu głównego."""
+    payload, sha256, file_format = future.result()
+    if sha256 is not None:
+        imgw_magazyn.record(f_path, sha256)
+        remember_format(sha256, file_format)
+    return _from_transport(payload)
+
+def iter_processed_files(product, max_workers=LICZBA_PROCESOW_PRZETWARZANIA):
+    """Niepuste ramki kolejnych plików produktu (w kolejności nazw); nic, gdy plików brak."""
+    schema = PRODUCT_SCHEMAS[product]
+    files = product_files(product)
+    if not files:
+        print(f"Nie znaleziono żadnych plików '{schema['opis_plikow']}' w katalogu: {schema['katalog']}")
+        return
+    print(f"Znaleziono {len(files)} plików danych {schema['nazwa']} do przetworzenia.")
+
+    files = sorted(files)
+    columns = projected_columns(product)
+    if max_workers > 1 and len(files) >= MIN_PLIKOW_DLA_PULI:
+        print(f"Przetwarzanie w puli {max_workers} procesów...")
+        processed = iter_files_in_pool(product, files, max_workers, columns)
+    else:
+        processed = (process_product_file(product, f_path, columns) for f_path in files)
+    for df_single in processed:
+        if df_single is not None and not df_single.empty:
+            yield df_single
+    report_skipped_bytes(product, files, columns)
+
+def report_skipped_bytes(product, file_paths, columns):
+    """Wypisuje, ile bajtów pól plików produktu pominęła projekcja kolumn (szacunek z próbek plików)."""
+    schema = PRODUCT_SCHEMAS[product]
+    if columns is None:
+        return
+    skipped = total = 0
+    for f_path in file_paths:
+        try:
+            file_format = sniff_file(f_path) # Z cache - format rozpoznany już przy odczycie
+            separator = choose_separator(file_format, schema["separatory"], len(schema["kolumny"]))
+            if separator is None:
+                continue
+            file_skipped, file_total = skipped_bytes(f_path, dict(file_format, separator=separator),
+                                                     schema["kolumny"], columns)
+        except (OSError, UnicodeDecodeError):
+            continue
+        skipped += file_skipped
+        total += file_total
+    print(f"Projekcja kolumn {schema['nazwa']}: wczytano {len(columns)} z {len(schema['kolumny'])} kolumn, "
+          f"pominięto ok. {skipped:,} z {total:,} bajtów pól ({skipped / max(total, 1):.0%}).")
+
+def process_product(product, max_workers=LICZBA_PROCESOW_PRZETWARZANIA):
+    """Przetwarza wszystkie pliki produktu; zwraca sklejoną ramkę albo None."""
+    schema = PRODUCT_SCHEMAS[product]
+    list_of_dataframes = list(iter_processed_files(product, max_workers))
+    if not list_of_dataframes:
+        print(f"Nie udało się przetworzyć żadnych plików {schema['nazwa']}.")
+        return None
+
+    print(f"\nŁączenie wszystkich przetworzonych danych {schema['nazwa']}...")
+    return pd.concat(list_of_dataframes, ignore_index=True)
+
+def save_product(product, final_df):
+    """Podgląd wynikowej ramki i zapis do magazynu partycji produktu (i CSV, gdy włączony eksport)."""
+    schema = PRODUCT_SCHEMAS[product]
+    print(f"\n--- Wynikowa ramka danych {schema['nazwa']} ---")
+    final_df.info(verbose=True, show_counts=True)
+    # Przy projekcji kolumn część kolumn podglądu mogła nie zostać wczytana
+    preview = final_df[[col for col in schema["kolumny_podgladu"] if col in final_df.columns]] if schema["kolumny_podgladu"] else final_df
+    print(f"\nPierwsze 5 wierszy wynikowych danych {schema['nazwa']}:")
+    print(preview.head().to_string())
+    print(f"\nOstatnie 5 wierszy wynikowych danych {schema['nazwa']}:")
+    print(preview.tail().to_string())
+
+    output_file = schema["plik_wynikowy"]
+    try:
+        directory = save_processed(final_df, output_file)
+        print(f"\nPrzetworzone dane {schema['nazwa']} zapisano do: {directory} ({imgw_partycje.FORMAT_POSREDNI})")
+        if imgw_partycje.EKSPORT_CSV:
+            print(f"Eksport CSV: {output_file}")
+    except Exception as e:
+        print(f"Błąd podczas zapisywania pliku {output_file}: {e}")
+
+def stream_product(product, max_workers=LICZBA_PROCESOW_PRZETWARZANIA):
+    """Zapis strumieniowy: wynik każdego pliku dopisywany od razu do partycji lat; zwraca liczbę wierszy."""
+    schema = PRODUCT_SCHEMAS[product]
+    output_file = schema["plik_wynikowy"]
+    directory = partition_dir(output_file)
+    reset_partitions(directory)
+    if os.path.exists(output_file):
+        os.remove(output_file) # Nieaktualny jednolity CSV; przy włączonym eksporcie powstanie na nowo z partycji
+        print(f"Usunięto poprzedni plik {output_file} (wynik trafia do partycji w {directory}).")
+
+    rows_by_partition = {}
+    for df_single in iter_processed_files(product, max_workers):
+        for partition, rows in append_partitions(df_single, directory).items():
+            rows_by_partition[partition] = rows_by_partition.get(partition, 0) + rows
+    if not rows_by_partition:
+        print(f"Nie udało się przetworzyć żadnych plików {schema['nazwa']}.")
+        return 0
+
+    total_rows = sum(rows_by_partition.values())
+    print(f"\nPrzetworzone dane {schema['nazwa']} ({total_rows} wierszy) zapisano do {len(rows_by_partition)} partycji w: {directory}")
+    for partition, rows in rows_by_partition.items():
+        print(f"  {partition}: {rows} wierszy")
+    if imgw_partycje.EKSPORT_CSV:
+        export_csv(output_file)
+        print(f"Eksport CSV: {output_file}")
+    return total_rows
+
+def run_products(products, max_workers=LICZBA_PROCESOW_PRZETWARZANIA, streaming=ZAPIS_STRUMIENIOWY):
+    """Jeden przebieg po katalogu dla podanych produktów (kolejno), z jednym zapisem cache formatów.
+
+    max_workers=1 wyłącza pulę procesów (przetwarzanie sekwencyjne w procesie głównym);
+    streaming=True dopisuje partycje lat plik po pliku zamiast sklejać cały produkt (stream_product).
+    """
+    try:
+        for product in products:
+            print(f"\n=== Produkt {product} ===")
+            if streaming:
+                stream_product(product, max_workers)
+                continue
+            final_df = process_product(product, max_workers)
+            if final_df is not None:
+                save_product(product, final_df)
+            del final_df # Ramka produktu nie jest potrzebna przy kolejnym
+    finally:
+        save_format_cache() # Rozpoznane formaty przydadzą się kolejnym uruchomieniom i etapom
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""Rozpoznawanie formatu plików CSV IMGW (kodowanie, separator, liczba pól) jednym odczytem.
+
+Wynik jest zapamiętywany w pobrane_dane_imgw/cache_formatow.json pod kluczem treści pliku
+(sha256 z imgw_magazyn), więc każdy etap (02, 05-10) korzysta z tego samego rozpoznania,
+a plik jest parsowany przez pandas tylko raz, od razu z właściwymi ustawieniami.
+"""
+import os
+import json
+import threading
+
+import pandas as pd
+
+import imgw_magazyn
+from imgw_archiwa import open_data_file
+
+FORMAT_CACHE_PATH = os.path.join("pobrane_dane_imgw", "cache_formatow.json")
+SNIFF_SAMPLE_BYTES = 64 * 1024 # Ile bajtów z początku pliku analizujemy
+SNIFF_SAMPLE_LINES = 20 # Ile pierwszych linii bierzemy pod uwagę przy liczeniu pól
+CANDIDATE_SEPARATORS = [',', ';', '\t']
+# Bajty polskich liter, którymi cp1250 i ISO-8859-2 się różnią (ą ś ź Ą Ś Ź);
+# pozostałe polskie litery (ę ć ł ń ó ż ...) mają w obu kodowaniach te same bajty
+CP1250_POLISH_BYTES = [bytes([b]) for b in (0xB9, 0x9C, 0x9F, 0xA5, 0x8C, 0x8F)]
+ISO_8859_2_POLISH_BYTES = [bytes([b]) for b in (0xB1, 0xB6, 0xBC, 0xA1, 0xA6, 0xAC)]
+# Wersja reguł rozpoznawania - wpisy cache z inną wersją są rozpoznawane ponownie
+SNIFFER_VERSION = 2
+
+_format_cache = None
+_format_cache_lock = threading.Lock()
+
+
+def load_format_cache():
+    """Wczytuje cache formatów (leniwie, raz na proces)."""
+    global _format_cache
+    with _format_cache_lock:
+        if _format_cache is None:
+            _format_cache = {}
+            if os.path.exists(FORMAT_CACHE_PATH):
+                try:
+                    with open(FORMAT_CACHE_PATH, 'r', encoding='utf-8') as f:
+                        _format_cache = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Nie udało się wczytać cache formatów {FORMAT_CACHE_PATH}: {e}")
+    return _format_cache
+
+def save_format_cache():
+    """Zapisuje cache formatów (i indeks kluczy treści, który mógł się przy tym powiększyć)."""
+    cache = load_format_cache()
+    with _format_cache_lock:
+        snapshot = dict(cache)
+    os.makedirs(os.path.dirname(FORMAT_CACHE_PATH) or ".", exist_ok=True)
+    tmp_path = FORMAT_CACHE_PATH + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=0, sort_keys=True)
+    os.replace(tmp_path, FORMAT_CACHE_PATH)
+    imgw_magazyn.save_index()
+
+def detect_encoding_bytes(raw_bytes, is_truncated=False):
+    """Rozpoznaje kodowanie próbki: 'utf-8', 'cp1250' albo 'iso-8859-2' (wyjątkowo 'latin1').
+
+    Najpierw test poprawności UTF-8 (czyste ASCII też jest UTF-8), potem porównanie, ile bajtów
+    polskich liter charakterystycznych dla cp1250, a ile dla ISO-8859-2 występuje w próbce.
+    """
+    if raw_bytes.isascii():
+        return 'utf-8'
+    try:
+        raw_bytes.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # Próbka mogła uciąć wielobajtowy znak UTF-8 na samym końcu
+        if is_truncated and e.start >= len(raw_bytes) - 3 and e.reason == 'unexpected end of data':
+            return 'utf-8'
+
+    cp1250_score = sum(raw_bytes.count(byte) for byte in CP1250_POLISH_BYTES)
+    iso_score = sum(raw_bytes.count(byte) for byte in ISO_8859_2_POLISH_BYTES)
+    candidates = ['iso-8859-2', 'cp1250'] if iso_score > cp1250_score else ['cp1250', 'iso-8859-2']
+    for encoding in candidates + ['latin1']:
+        try:
+            raw_bytes.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return 'latin1'
+
+def sniff_bytes(raw_bytes, is_truncated=False):
+    """Rozpoznaje format na podstawie bajtów z początku pliku.
+
+    Zwraca słownik: encoding, fields_by_separator (liczba pól w 1. linii dla każdego
+    separatora) i separator (ten, który daje stałą liczbę pól > 1 w kolejnych liniach).
+    """
+    encoding = detect_encoding_bytes(raw_bytes, is_truncated)
+    text = raw_bytes.decode(encoding, errors='replace')
+    lines = [line.strip() for line in text.splitlines()[:SNIFF_SAMPLE_LINES]]
+    if is_truncated and len(lines) > 1:
+        lines = lines[:-1] # Ostatnia linia próbki może być ucięta
+    lines = [line for line in lines if line]
+    first_line = lines[0] if lines else ''
+
+    fields_by_separator = {sep: len(first_line.split(sep)) for sep in CANDIDATE_SEPARATORS}
+    best_separator = None
+    for sep in CANDIDATE_SEPARATORS:
+        counts = {len(line.split(sep)) for line in lines}
+        if len(counts) == 1 and fields_by_separator[sep] > 1:
+            if best_separator is None or fields_by_separator[sep] > fields_by_separator[best_separator]:
+                best_separator = sep
+    return {"encoding": encoding, "separator": best_separator, "fields_by_separator": fields_by_separator}
+
+def sniff_content(raw_bytes, full_file=False):
+    """Rozpoznaje format z bajtów pliku (lub jego początku) i oznacza wynik wersją reguł."""
+    is_truncated = not full_file and len(raw_bytes) > SNIFF_SAMPLE_BYTES
+    file_format = sniff_bytes(raw_bytes[:SNIFF_SAMPLE_BYTES] if is_truncated else raw_bytes, is_truncated)
+    file_format["full_file"] = not is_truncated
+    file_format["version"] = SNIFFER_VERSION
+    return file_format
+
+def remember_format(sha256, file_format):
+    """Zapisuje w cache format rozpoznany gdzie indziej (np. w procesie roboczym profilera)."""
+    cache = load_format_cache()
+    with _format_cache_lock:
+        cache[sha256] = file_format
+
+def sniff_file(file_ref, full_file=False):
+    """Rozpoznaje format pliku (z dysku lub z archiwum), korzystając z cache po kluczu treści.
+
+    full_file=True analizuje cały plik zamiast próbki (gdy próbka okazała się myląca).
+    """
+    cache = load_format_cache()
+    key = imgw_magazyn.content_key(file_ref)
+    cached = cache.get(key)
+    if cached is not None and cached.get("version") == SNIFFER_VERSION and (not full_file or cached.get("full_file")):
+        return cached
+
+    with open_data_file(file_ref) as f:
+        raw_bytes = f.read() if full_file else f.read(SNIFF_SAMPLE_BYTES + 1)
+    file_format = sniff_content(raw_bytes, full_file)
+    remember_format(key, file_format)
+    return file_format
+
+def choose_separator(file_format, separators, expected_fields):
+    """Pierwszy z dopuszczalnych separatorów, przy którym 1. linia ma expected_fields pól."""
+    for sep in separators:
+        if file_format["fields_by_separator"].get(sep) == expected_fields:
+            return sep
+    return None
+
+def read_csv_sniffed(file_ref, expected_fields, separators=(',',), **read_csv_kwargs):
+    """Wczytuje plik CSV bez nagłówka jednym przebiegiem pandas, z rozpoznanym formatem.
+
+    Zwraca (DataFrame, format) albo (None, format), gdy liczba pól się nie zgadza.
+    Wyjątki pandas (np. EmptyDataError) są przekazywane wyżej.
+    """
+    file_format = sniff_file(file_ref)
+    for attempt in range(2):
+        separator = choose_separator(file_format, separators, expected_fields)
+        if separator is None:
+            return None, file_format
+        try:
+            with open_data_file(file_ref) as data_stream:
+                df = pd.read_csv(data_stream, encoding=file_format["encoding"], sep=separator,
+                                 header=None, **read_csv_kwargs)
+            return df, dict(file_format, separator=separator)
+        except UnicodeDecodeError:
+            if attempt == 1 or file_format.get("full_file"):
+                raise
+            # Początek pliku był poprawny w tym kodowaniu, dalsza część nie - analizujemy cały plik
+            file_format = sniff_file(file_ref, full_file=True)
+    return None, file_format
+
+def read_csv_typed(file_ref, column_names, text_columns=(), status_columns=(), separators=(',',), **read_csv_kwargs):
+    """Wczytuje plik jednym przebiegiem parsera C z typami kolumn ustalonymi już przy odczycie.
+
+    Kolumny tekstowe -> str, statusy -> category, pozostałe -> liczby rozpoznane przez parser
+    (int64/float64; wartości z na_values, np. 9999, od razu jako NaN). Tylko kolumna liczbowa,
+    której parser nie odczytał jako liczb (przecinek dziesiętny, śmieci), jest konwertowana jak
+    dawniej: przecinek -> kropka i pd.to_numeric(errors='coerce').
+    column_names opisuje wszystkie pola pliku (sprawdzana jest ich liczba); usecols (podzbiór nazw)
+    ogranicza kolumny tworzone w ramce.
+    Zwraca (DataFrame, format) albo (None, format) - jak read_csv_sniffed.
+    """
+    dtypes = {name: str for name in text_columns}
+    dtypes.update({name: 'category' for name in status_columns})
+    df, file_format = read_csv_sniffed(file_ref, len(column_names), separators,
+                                       names=column_names, dtype=dtypes, **read_csv_kwargs)
+    if df is not None:
+        for name in df.columns:
+            if name not in dtypes and not pd.api.types.is_numeric_dtype(df[name]):
+                df[name] = pd.to_numeric(df[name].str.replace(',', '.', regex=False), errors='coerce')
+    return df, file_format
\ No newline at end of file
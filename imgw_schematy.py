@@ -0,0 +1,285 @@
+"""Rejestr schematów produktów IMGW przetwarzanych w etapach 05-10.
+
+Dla każdego produktu (klucz jak w imgw_archiwa.dataset_type: codz, k_d, k_d_t, o_d, s_d, s_d_t)
+rejestr opisuje katalog danych, plik wynikowy, nazwy i typy kolumn, pary pomiar-status
+z regułami statusów 8/9, wartości oznaczające brak danych, składowe daty i porządek wierszy.
+Silnik w imgw_przetwarzanie przetwarza każdy produkt wyłącznie na podstawie tego opisu.
+"""
+import os
+
+ROOT_DATA_DIR = "pobrane_dane_imgw"
+
+# --- codz: dane hydrologiczne dobowe (05) ---
+# Nazwy kolumn na podstawie Twojego opisu "codz_info"
+HYDRO_COLUMN_NAMES = [
+    "KodStacji",
+    "NazwaStacji",
+    "NazwaRzekiJeziora",
+    "RokHydrologiczny",
+    "WskaznikMiesiacaRokHydrologiczny",
+    "Dzien",
+    "StanWody_cm",
+    "Przeplyw_m3s",
+    "TemperaturaWody_C",
+    "MiesiacKalendarzowy"
+]
+# Wartości oznaczające brak pomiaru - zamieniane na NaN już przy odczycie
+HYDRO_NA_VALUES = {
+    "StanWody_cm": [9999, "9999"], # Dodajemy stringi na wszelki wypadek
+    "Przeplyw_m3s": [99999.999, "99999.999"],
+    "TemperaturaWody_C": [99.9, "99.9"]
+}
+
+# --- k_d: klimat dobowy (06) ---
+# Nazwy kolumn na podstawie Twojego opisu "k d format"
+KLIMAT_KD_COLUMN_NAMES = [
+    "KodStacji", "NazwaStacji", "Rok", "Miesiac", "Dzien",
+    "TMAX_C", "Status_TMAX",
+    "TMIN_C", "Status_TMIN",
+    "STD_C", "Status_STD", # Średnia temperatura dobowa
+    "TMNG_C", "Status_TMNG", # Temperatura minimalna przy gruncie
+    "SMDB_mm", "Status_SMDB", # Suma dobowa opadów
+    "RodzajOpadu", # S/W/spacja
+    "PKSN_cm", "Status_PKSN" # Wysokość pokrywy śnieżnej
+]
+# Statusy: kolumna pomiaru -> (kolumna statusu, czy status 9 "brak zjawiska" oznacza 0); status 8 zawsze -> NaN
+# Dla temperatur status 9 jest mniej jasny - zostaje wartość z pliku; dla opadu i pokrywy śnieżnej to 0
+KLIMAT_KD_STATUS_RULES = {
+    "TMAX_C": ("Status_TMAX", False), "TMIN_C": ("Status_TMIN", False), "STD_C": ("Status_STD", False),
+    "TMNG_C": ("Status_TMNG", False), "SMDB_mm": ("Status_SMDB", True), "PKSN_cm": ("Status_PKSN", True)
+}
+
+# --- k_d_t: klimat dobowy, parametry uśrednione (07) ---
+# Nazwy kolumn na podstawie Twojego opisu "k d t format"
+KLIMAT_KDT_COLUMN_NAMES = [
+    "KodStacji", "NazwaStacji", "Rok", "Miesiac", "Dzien",
+    "TEMP_Srednia_C", "Status_TEMP",         # Średnia dobowa temperatura
+    "WLGS_Srednia_proc", "Status_WLGS",      # Średnia dobowa wilgotność względna
+    "FWS_Srednia_ms", "Status_FWS",          # Średnia dobowa prędkość wiatru
+    "NOS_Srednie_okt", "Status_NOS"          # Średnie dobowe zachmurzenie ogólne
+]
+# Dla tych parametrów status 9 jest nietypowy, więc obsługiwany jest tylko status 8
+KLIMAT_KDT_STATUS_RULES = {
+    "TEMP_Srednia_C": ("Status_TEMP", False),
+    "WLGS_Srednia_proc": ("Status_WLGS", False),
+    "FWS_Srednia_ms": ("Status_FWS", False),
+    "NOS_Srednie_okt": ("Status_NOS", False)
+}
+
+# --- o_d: opady dobowe (08) ---
+# Nazwy kolumn na podstawie Twojego opisu "o d format"
+OPAD_OD_COLUMN_NAMES = [
+    "KodStacji", "NazwaStacji", "Rok", "Miesiac", "Dzien",
+    "SMDB_mm", "Status_SMDB",           # Suma dobowa opadów
+    "RodzajOpadu",                     # S/W/spacja
+    "PKSN_cm", "Status_PKSN",           # Wysokość pokrywy śnieżnej
+    "HSS_cm", "Status_HSS",             # Wysokość świeżospałego śniegu
+    "GatunekSniegu_kod", "Status_GATS",  # Gatunek śniegu
+    "RodzajPokrywy_kod", "Status_RPSN"   # Rodzaj pokrywy śnieżnej
+]
+# Dla opadów i śniegu status 9 (brak zjawiska) oznacza 0
+OPAD_OD_STATUS_RULES = {
+    "SMDB_mm": ("Status_SMDB", True),
+    "PKSN_cm": ("Status_PKSN", True),
+    "HSS_cm": ("Status_HSS", True)
+}
+# Kolumny kodowe (nie wartości do uśredniania) - przy statusie 8 lub 9 kod jest czyszczony
+OPAD_OD_CODE_STATUS_COLUMNS = {"GatunekSniegu_kod": "Status_GATS", "RodzajPokrywy_kod": "Status_RPSN"}
+
+# --- s_d: synop dobowy (09) ---
+# Nazwy kolumn na podstawie Twojego opisu "s d format" (pierwsze 5 + reszta)
+# Musimy mieć dokładnie 65 nazw
+SYNOP_SD_COLUMN_NAMES = [
+    "KodStacji", "NazwaStacji", "Rok", "Miesiac", "Dzien",
+    "TMAX_C", "Status_TMAX",
+    "TMIN_C", "Status_TMIN",
+    "STD_C", "Status_STD",                       # Średnia temperatura dobowa
+    "TMNG_C", "Status_TMNG",                     # Temperatura minimalna przy gruncie
+    "SMDB_mm", "Status_SMDB",                   # Suma dobowa opadów
+    "RodzajOpadu",                             # S/W/spacja
+    "PKSN_cm", "Status_PKSN",                   # Wysokość pokrywy śnieżnej
+    "RWSN_mm_cm", "Status_RWSN",               # Równoważnik wodny śniegu
+    "USL_godz", "Status_USL",                   # Usłonecznienie
+    "CzasOpaduDeszcz_godz", "Status_DESZ",
+    "CzasOpaduSnieg_godz", "Status_SNEG",
+    "CzasOpaduDeszczSnieg_godz", "Status_DISN",
+    "CzasGradu_godz", "Status_GRAD",
+    "CzasMgly_godz", "Status_MGLA",
+    "CzasZamglenia_godz", "Status_ZMGL",
+    "CzasSadzi_godz", "Status_SADZ",
+    "CzasGololedzi_godz", "Status_GOLO",
+    "CzasZamieciNiskiej_godz", "Status_ZMNI",
+    "CzasZamieciWysokiej_godz", "Status_ZMWS",
+    "CzasZmetnienia_godz", "Status_ZMET",
+    "CzasWiatru_ge10ms_godz", "Status_FF10",    # Wiatr >=10m/s
+    "CzasWiatru_gt15ms_godz", "Status_FF15",    # Wiatr >15m/s (UWAGA: w opisie >15, w logu FF15)
+    "CzasBurzy_godz", "Status_BRZA",
+    "CzasRosy_godz", "Status_ROSA",
+    "CzasSzronu_godz", "Status_SZRO",
+    "WystPokrywySnieznej_01", "Status_DZPS",     # 0/1
+    "WystBlyskawicy_01", "Status_DZBL",          # 0/1
+    "StanGruntu_ZR",                             # Z/R (Status nie był jawnie podany obok, zakładamy brak)
+    "IzotermaDolna_cm", "Status_IZD",
+    "IzotermaGorna_cm", "Status_IZG",
+    "Aktynometria_Jcm2", "Status_AKTN"
+]
+# Kolumny kodowe (RodzajOpadu, StanGruntu_ZR) nie mają reguł; dla temperatur i pomiarów specjalnych
+# status 9 nie oznacza 0, dla pozostałych (opady, czasy zjawisk, 0/1) oznacza
+SYNOP_SD_STATUS_RULES = {
+    "TMAX_C": ("Status_TMAX", False), "TMIN_C": ("Status_TMIN", False), "STD_C": ("Status_STD", False),
+    "TMNG_C": ("Status_TMNG", False), "SMDB_mm": ("Status_SMDB", True), "PKSN_cm": ("Status_PKSN", True),
+    "RWSN_mm_cm": ("Status_RWSN", True), "USL_godz": ("Status_USL", True),
+    "CzasOpaduDeszcz_godz": ("Status_DESZ", True), "CzasOpaduSnieg_godz": ("Status_SNEG", True),
+    "CzasOpaduDeszczSnieg_godz": ("Status_DISN", True), "CzasGradu_godz": ("Status_GRAD", True),
+    "CzasMgly_godz": ("Status_MGLA", True), "CzasZamglenia_godz": ("Status_ZMGL", True),
+    "CzasSadzi_godz": ("Status_SADZ", True), "CzasGololedzi_godz": ("Status_GOLO", True),
+    "CzasZamieciNiskiej_godz": ("Status_ZMNI", True), "CzasZamieciWysokiej_godz": ("Status_ZMWS", True),
+    "CzasZmetnienia_godz": ("Status_ZMET", True), "CzasWiatru_ge10ms_godz": ("Status_FF10", True),
+    "CzasWiatru_gt15ms_godz": ("Status_FF15", True), "CzasBurzy_godz": ("Status_BRZA", True),
+    "CzasRosy_godz": ("Status_ROSA", True), "CzasSzronu_godz": ("Status_SZRO", True),
+    "IzotermaDolna_cm": ("Status_IZD", False), "IzotermaGorna_cm": ("Status_IZG", False),
+    "Aktynometria_Jcm2": ("Status_AKTN", False),
+    "WystPokrywySnieznej_01": ("Status_DZPS", True), "WystBlyskawicy_01": ("Status_DZBL", True)
+}
+
+# --- s_d_t: synop dobowy, parametry uśrednione (10) ---
+# Nazwy kolumn na podstawie Twojego opisu "s d t format"
+SYNOP_SDT_COLUMN_NAMES = [
+    "KodStacji", "NazwaStacji", "Rok", "Miesiac", "Dzien",
+    "NOS_Srednie_okt", "Status_NOS",         # Średnie dobowe zachmurzenie ogólne
+    "FWS_Srednia_ms", "Status_FWS",          # Średnia dobowa prędkość wiatru
+    "TEMP_Srednia_C", "Status_TEMP",         # Średnia dobowa temperatura
+    "CPW_Srednie_hPa", "Status_CPW",         # Średnie dobowe ciśnienie pary wodnej
+    "WLGS_Srednia_proc", "Status_WLGS",      # Średnia dobowa wilgotność względna
+    "PPPS_Srednie_hPa", "Status_PPPS",       # Średnie dobowe ciśnienie na poziomie stacji
+    "PPPM_Srednie_hPa", "Status_PPPM",       # Średnie dobowe ciśnienie na poziomie morza
+    "WODZ_SumaOpaduDzien_mm", "Status_WODZ", # Suma opadu dzień
+    "WONO_SumaOpaduNoc_mm", "Status_WONO"    # Suma opadu noc
+]
+# Status 9 oznacza 0 dla opadu, prędkości wiatru i zachmurzenia (0-8); dla temperatury,
+# ciśnienia i wilgotności jest mniej jasny - zostaje wartość z pliku
+SYNOP_SDT_STATUS_RULES = {
+    "NOS_Srednie_okt": ("Status_NOS", True),
+    "FWS_Srednia_ms": ("Status_FWS", True),
+    "TEMP_Srednia_C": ("Status_TEMP", False),
+    "CPW_Srednie_hPa": ("Status_CPW", False),
+    "WLGS_Srednia_proc": ("Status_WLGS", False),
+    "PPPS_Srednie_hPa": ("Status_PPPS", False),
+    "PPPM_Srednie_hPa": ("Status_PPPM", False),
+    "WODZ_SumaOpaduDzien_mm": ("Status_WODZ", True),
+    "WONO_SumaOpaduNoc_mm": ("Status_WONO", True)
+}
+
+METEO_DATE_COLUMNS = ("Rok", "Miesiac", "Dzien")
+METEO_SORT_COLUMNS = ["Data", "KodStacji"]
+
+# Rejestr: produkt -> schemat. Pola:
+#   katalog, plik_wynikowy, opis_plikow - skąd brać pliki (katalog SQLite z 03) i dokąd zapisać wynik
+#   kolumny - nazwy kolumn w kolejności pliku; kolumny_tekstowe - str (po strip), statusy (Status_*) - category,
+#   pozostałe - liczby; separatory - dopuszczalne separatory pól; wartosci_brakujace - na_values dla read_csv
+#   reguly_statusow, kody_statusow - jak w imgw_statusy.apply_status_flags i kolumny kodowe czyszczone przy 8/9
+#   data - (rok, miesiąc, dzień, czy_rok_hydrologiczny); usuwane_kolumny - kolumny usuwane po zbudowaniu daty
+#   sortowanie - kolumny sortowania wierszy każdego pliku (None - kolejność z pliku)
+#   nazwa, kolumny_podgladu - do komunikatów: nazwa danych i kolumny podglądu head/tail (None - wszystkie)
+PRODUCT_SCHEMAS = {
+    "codz": {
+        "katalog": os.path.join(ROOT_DATA_DIR, "hydro", "dobowe_pomiarowe"),
+        "plik_wynikowy": "przetworzone_dane_hydrologiczne.csv",
+        "opis_plikow": "codz_*.csv",
+        "nazwa": "hydrologicznych",
+        "kolumny": HYDRO_COLUMN_NAMES,
+        "kolumny_tekstowe": ["KodStacji", "NazwaStacji", "NazwaRzekiJeziora"],
+        "separatory": [';', ','],
+        "wartosci_brakujace": HYDRO_NA_VALUES,
+        "reguly_statusow": {},
+        "kody_statusow": {},
+        "data": ("RokHydrologiczny", "MiesiacKalendarzowy", "Dzien", True),
+        "usuwane_kolumny": ["RokHydrologiczny", "WskaznikMiesiacaRokHydrologiczny", "Dzien", "MiesiacKalendarzowy"],
+        "sortowanie": None,
+        "kolumny_podgladu": None,
+    },
+    "k_d": {
+        "katalog": os.path.join(ROOT_DATA_DIR, "meteo", "dobowe", "klimat"),
+        "plik_wynikowy": "przetworzone_dane_klimat_kd.csv",
+        "opis_plikow": "k_d_MM_RRRR.csv",
+        "nazwa": "klimat_kd",
+        "kolumny": KLIMAT_KD_COLUMN_NAMES,
+        "kolumny_tekstowe": ["KodStacji", "NazwaStacji", "RodzajOpadu"],
+        "separatory": [','],
+        "wartosci_brakujace": None,
+        "reguly_statusow": KLIMAT_KD_STATUS_RULES,
+        "kody_statusow": {},
+        "data": METEO_DATE_COLUMNS + (False,),
+        "usuwane_kolumny": list(METEO_DATE_COLUMNS),
+        "sortowanie": METEO_SORT_COLUMNS,
+        "kolumny_podgladu": None,
+    },
+    "k_d_t": {
+        "katalog": os.path.join(ROOT_DATA_DIR, "meteo", "dobowe", "klimat"),
+        "plik_wynikowy": "przetworzone_dane_klimat_kdt.csv",
+        "opis_plikow": "k_d_t_MM_RRRR.csv",
+        "nazwa": "klimat_kdt",
+        "kolumny": KLIMAT_KDT_COLUMN_NAMES,
+        "kolumny_tekstowe": ["KodStacji", "NazwaStacji"],
+        "separatory": [','],
+        "wartosci_brakujace": None,
+        "reguly_statusow": KLIMAT_KDT_STATUS_RULES,
+        "kody_statusow": {},
+        "data": METEO_DATE_COLUMNS + (False,),
+        "usuwane_kolumny": list(METEO_DATE_COLUMNS),
+        "sortowanie": METEO_SORT_COLUMNS,
+        "kolumny_podgladu": None,
+    },
+    "o_d": {
+        "katalog": os.path.join(ROOT_DATA_DIR, "meteo", "dobowe", "opad"),
+        "plik_wynikowy": "przetworzone_dane_opad_od.csv",
+        "opis_plikow": "o_d_MM_RRRR.csv",
+        "nazwa": "opad_od",
+        "kolumny": OPAD_OD_COLUMN_NAMES,
+        "kolumny_tekstowe": ["KodStacji", "NazwaStacji", "RodzajOpadu", "GatunekSniegu_kod", "RodzajPokrywy_kod"],
+        "separatory": [','],
+        "wartosci_brakujace": None,
+        "reguly_statusow": OPAD_OD_STATUS_RULES,
+        "kody_statusow": OPAD_OD_CODE_STATUS_COLUMNS,
+        "data": METEO_DATE_COLUMNS + (False,),
+        "usuwane_kolumny": list(METEO_DATE_COLUMNS),
+        "sortowanie": METEO_SORT_COLUMNS,
+        "kolumny_podgladu": ["Data", "KodStacji", "SMDB_mm", "PKSN_cm", "HSS_cm"],
+    },
+    "s_d": {
+        "katalog": os.path.join(ROOT_DATA_DIR, "meteo", "dobowe", "synop"),
+        "plik_wynikowy": "przetworzone_dane_synop_sd.csv",
+        "opis_plikow": "s_d_RRRR.csv",
+        "nazwa": "synop_sd",
+        "kolumny": SYNOP_SD_COLUMN_NAMES,
+        "kolumny_tekstowe": ["KodStacji", "NazwaStacji", "RodzajOpadu", "StanGruntu_ZR"],
+        "separatory": [','],
+        "wartosci_brakujace": None,
+        "reguly_statusow": SYNOP_SD_STATUS_RULES,
+        "kody_statusow": {},
+        "data": METEO_DATE_COLUMNS + (False,),
+        "usuwane_kolumny": list(METEO_DATE_COLUMNS),
+        "sortowanie": METEO_SORT_COLUMNS,
+        "kolumny_podgladu": None,
+    },
+    "s_d_t": {
+        "katalog": os.path.join(ROOT_DATA_DIR, "meteo", "dobowe", "synop"),
+        "plik_wynikowy": "przetworzone_dane_synop_sdt.csv",
+        "opis_plikow": "s_d_t_RRRR.csv",
+        "nazwa": "synop_sdt",
+        "kolumny": SYNOP_SDT_COLUMN_NAMES,
+        "kolumny_tekstowe": ["KodStacji", "NazwaStacji"],
+        "separatory": [','],
+        "wartosci_brakujace": None,
+        "reguly_statusow": SYNOP_SDT_STATUS_RULES,
+        "kody_statusow": {},
+        "data": METEO_DATE_COLUMNS + (False,),
+        "usuwane_kolumny": list(METEO_DATE_COLUMNS),
+        "sortowanie": METEO_SORT_COLUMNS,
+        "kolumny_podgladu": None,
+    },
+}
+
+def status_columns(schema):
+    """Kolumny statusów produktu (Status_*) - wczytywane jako category."""
+    return [name for name in schema["kolumny"] if name.startswith("Status_")]
\ No newline at end of file
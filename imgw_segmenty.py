@@ -0,0 +1,102 @@
+"""Segmenty ostrzeżeń: wszystkie pliki .TXT jednego roku spakowane w jeden plik z indeksem przesunięć.
+
+ost_hydro/<rok>/segmenty/ostrzezenia.seg to sklejona treść plików, a ostrzezenia.idx.json
+zawiera dla każdego pliku (odwołanie, przesunięcie, długość, sha256). Etap 04 czyta rekordy
+przez mmap, bez otwierania tysięcy małych plików ani archiwów.
+"""
+import os
+import json
+import mmap
+
+import imgw_magazyn
+from imgw_archiwa import iter_file_contents, is_zip_member, split_zip_member
+from imgw_katalog import catalog_files
+
+SEGMENT_DIR_NAME = "segmenty"
+SEGMENT_FILE_NAME = "ostrzezenia.seg"
+SEGMENT_INDEX_NAME = "ostrzezenia.idx.json"
+SEGMENT_VERSION = 1
+
+
+def segment_paths(year_dir):
+    """Ścieżki (segment, indeks) dla katalogu roku."""
+    segment_dir = os.path.join(year_dir, SEGMENT_DIR_NAME)
+    return os.path.join(segment_dir, SEGMENT_FILE_NAME), os.path.join(segment_dir, SEGMENT_INDEX_NAME)
+
+def year_dir_of(file_ref):
+    """Katalog roku pliku (rodzic katalogu zips/ lub extracted_files/)."""
+    path = split_zip_member(file_ref)[0] if is_zip_member(file_ref) else file_ref
+    return os.path.dirname(os.path.dirname(path))
+
+def pack_segment(year_dir, file_refs):
+    """Pakuje pliki w segment roku (zapis atomowy). Zwraca liczbę rekordów."""
+    segment_path, index_path = segment_paths(year_dir)
+    os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+    records = []
+    offset = 0
+    with open(segment_path + ".tmp", 'wb') as segment:
+        for file_ref, raw_content in iter_file_contents(file_refs):
+            segment.write(raw_content)
+            records.append([imgw_magazyn.normalize_ref(file_ref), offset, len(raw_content),
+                            imgw_magazyn.lookup(file_ref)])
+            offset += len(raw_content)
+    with open(index_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({"wersja": SEGMENT_VERSION, "rekordy": records}, f, ensure_ascii=False)
+    os.replace(segment_path + ".tmp", segment_path)
+    os.replace(index_path + ".tmp", index_path)
+    return len(records)
+
+def load_segment_index(year_dir):
+    """Lista rekordów [odwołanie, przesunięcie, długość, sha256] albo None, gdy segmentu brak."""
+    segment_path, index_path = segment_paths(year_dir)
+    if not (os.path.exists(segment_path) and os.path.exists(index_path)):
+        return None
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index["rekordy"] if index.get("wersja") == SEGMENT_VERSION else None
+
+def fresh_segment_index(year_dir, file_refs):
+    """Indeks segmentu, jeśli zawiera dokładnie te pliki w obecnej wersji (sha256 z indeksu magazynu)."""
+    records = load_segment_index(year_dir)
+    if records is None or len(records) != len(file_refs):
+        return None
+    expected = sorted((imgw_magazyn.normalize_ref(ref), imgw_magazyn.lookup(ref)) for ref in file_refs)
+    if any(sha256 is None for _, sha256 in expected):
+        return None
+    if sorted((ref, sha256) for ref, _, _, sha256 in records) != expected:
+        return None
+    return records
+
+def pack_warning_segments(root_dir):
+    """Pakuje ostrzeżenia z katalogu (wg katalogu SQLite) w segmenty lat, które są nieaktualne.
+
+    Zwraca (liczba_spakowanych_lat, liczba_aktualnych_lat).
+    """
+    refs_by_year_dir = {}
+    for file_ref in catalog_files(root_dir, "ost_hydro"):
+        refs_by_year_dir.setdefault(year_dir_of(file_ref), []).append(file_ref)
+    packed = up_to_date = 0
+    for year_dir, file_refs in sorted(refs_by_year_dir.items()):
+        if fresh_segment_index(year_dir, file_refs) is not None:
+            up_to_date += 1
+            continue
+        count = pack_segment(year_dir, file_refs)
+        print(f"  Spakowano {count} ostrzeżeń: {segment_paths(year_dir)[0]}")
+        packed += 1
+    return packed, up_to_date
+
+def iter_segment_records(segment_path, records):
+    """Generuje (odwołanie, bajty) dla podanych rekordów indeksu, czytając segment przez mmap."""
+    if not records:
+        return
+    if os.path.getsize(segment_path) == 0: # mmap nie obsługuje pustych plików
+        for file_ref, _, _, _ in records:
+            yield file_ref, b''
+        return
+    with open(segment_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for file_ref, offset, length, _ in records:
+                yield file_ref, data[offset:offset + length]
\ No newline at end of file
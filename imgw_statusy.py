@@ -0,0 +1,47 @@
+"""Statusy pomiarów IMGW (etapy 06-10): 8 - brak pomiaru, 9 - brak zjawiska.
+
+Kolumny statusów są dekodowane raz do macierzy int8 (kod 8, 9 albo 0 dla pozostałych wartości),
+a reguły dla wszystkich kolumn pomiarowych stosowane jednym np.where na bloku 2-D:
+status 8 -> NaN, status 9 -> 0 tam, gdzie tabela reguł produktu tak mówi.
+"""
+import numpy as np
+import pandas as pd
+
+STATUS_BRAK_POMIARU = 8
+STATUS_BRAK_ZJAWISKA = 9
+
+
+def decode_status(values):
+    """Kolumna statusów jako tablica int8 (8, 9 albo 0); napisy są porównywane po strip().
+
+    Dekodowane są tylko unikalne wartości (kategorie lub wynik pd.factorize), nie każdy wiersz.
+    """
+    values = pd.Series(values, copy=False)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    stripped = [str(value).strip() for value in uniques]
+    lookup = np.array([STATUS_BRAK_POMIARU if value == '8' else STATUS_BRAK_ZJAWISKA if value == '9' else 0
+                       for value in stripped] + [0], dtype=np.int8) # Kod -1 (brak) -> 0
+    return lookup[codes]
+
+def apply_status_flags(df, status_rules):
+    """Stosuje statusy do kolumn pomiarowych (w miejscu, kolumny wynikowe jako float64).
+
+    status_rules: {kolumna_pomiaru: (kolumna_statusu, czy_status_9_oznacza_zero)}.
+    Reguły dla kolumn, których nie ma w df, są pomijane.
+    """
+    rules = [(meas_col, status_col, zero_on_9) for meas_col, (status_col, zero_on_9) in status_rules.items()
+             if meas_col in df.columns and status_col in df.columns]
+    if not rules:
+        return df
+    measurement_cols = [meas_col for meas_col, _, _ in rules]
+    statuses = np.column_stack([decode_status(df[status_col]) for _, status_col, _ in rules])
+    zero_on_9 = np.array([zero for _, _, zero in rules], dtype=bool)
+
+    block = df[measurement_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    block = np.where(statuses == STATUS_BRAK_POMIARU, np.nan, block)
+    block = np.where((statuses == STATUS_BRAK_ZJAWISKA) & zero_on_9, 0.0, block)
+    df[measurement_cols] = block
+    return df
\ No newline at end of file